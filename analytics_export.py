@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+歷史資料欄式匯出 - 將 signals / events / event_articles 串流寫成依日期分區的 Parquet
+
+輸出目錄結構（Hive 分區，pyarrow / DuckDB / pandas 都能直接讀）：
+    <out_dir>/signals/day=2026-10-19/part-0.parquet
+    <out_dir>/events/day=2026-10-19/part-0.parquet
+    <out_dir>/event_articles/day=2026-10-19/part-0.parquet
+
+- 以唯讀 URI（mode=ro）開啟資料庫，不寫入也不持有寫入鎖，不影響正在跑的監控
+- 每個分區整檔重寫（先寫暫存檔再 rename），重複匯出同一天是冪等的
+- 資料保留政策歸檔的 signals-YYYY-MM-DD.jsonl.gz 也可一併匯出
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import glob
+import gzip
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+BATCH_ROWS = 50_000
+
+# table -> (SELECT yielding `day` first, ordered by day; column types)
+EXPORTS: Dict[str, Tuple[str, List[Tuple[str, str]]]] = {
+    "signals": (
+        """
+        SELECT substr(crawled_at, 1, 10) AS day, run_id, article_id, source_id, source_name, section_id,
+               title, url, normalized_title, weight, crawled_at
+        FROM signals
+        WHERE crawled_at >= ?
+        ORDER BY crawled_at
+        """,
+        [
+            ("run_id", "string"), ("article_id", "int64"), ("source_id", "string"), ("source_name", "string"),
+            ("section_id", "string"), ("title", "string"), ("url", "string"), ("normalized_title", "string"),
+            ("weight", "int32"), ("crawled_at", "timestamp"),
+        ],
+    ),
+    "events": (
+        """
+        SELECT substr(first_seen, 1, 10) AS day, event_key, canonical_title, score, source_count,
+               signal_count, first_seen, last_seen, status
+        FROM events
+        WHERE first_seen >= ?
+        ORDER BY first_seen
+        """,
+        [
+            ("event_key", "string"), ("canonical_title", "string"), ("score", "float64"),
+            ("source_count", "int32"), ("signal_count", "int32"), ("first_seen", "timestamp"),
+            ("last_seen", "timestamp"), ("status", "string"),
+        ],
+    ),
+    # 事件與文章的對應，附上文章來源與首次出現時間，方便分析「誰先報」
+    "event_articles": (
+        """
+        SELECT substr(e.first_seen, 1, 10) AS day, ea.event_key, ea.article_id, a.source_id, a.url,
+               a.first_seen AS article_first_seen
+        FROM event_articles ea
+        JOIN events e ON e.event_key = ea.event_key
+        JOIN articles a ON a.article_id = ea.article_id
+        WHERE e.first_seen >= ?
+        ORDER BY e.first_seen, ea.event_key
+        """,
+        [
+            ("event_key", "string"), ("article_id", "int64"), ("source_id", "string"), ("url", "string"),
+            ("article_first_seen", "timestamp"),
+        ],
+    ),
+}
+
+
+def connect_readonly(db_path: str) -> sqlite3.Connection:
+    """以唯讀模式開啟 SQLite（對線上資料庫零寫入）"""
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def iter_day_batches(rows: Iterable[tuple], batch_rows: int = BATCH_ROWS) -> Iterator[Tuple[str, List[tuple], bool]]:
+    """
+    將依日期排序的列（第一欄為 day）切成批次
+
+    Yields:
+        (day, 該批資料列（不含 day 欄）, 是否為該日最後一批)
+    """
+    day: Optional[str] = None
+    batch: List[tuple] = []
+    for row in rows:
+        if row[0] != day:
+            if day is not None:
+                yield day, batch, True
+            day, batch = row[0], []
+        batch.append(tuple(row[1:]))
+        if len(batch) >= batch_rows:
+            yield day, batch, False
+            batch = []
+    if day is not None:
+        yield day, batch, True
+
+
+def _arrow_schema(columns: List[Tuple[str, str]]):
+    types = {
+        "string": pa.string(),
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+def _record_batch(schema, columns: List[Tuple[str, str]], rows: List[tuple]):
+    arrays = []
+    for i, (name, kind) in enumerate(columns):
+        values = [row[i] for row in rows]
+        if kind == "timestamp":
+            values = [dt.datetime.fromisoformat(v) if v else None for v in values]
+        arrays.append(pa.array(values, type=schema.field(name).type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _PartitionWriter:
+    """逐日寫入分區檔；完成後才以 rename 取代舊檔"""
+
+    def __init__(self, table_dir: str, schema):
+        self.table_dir = table_dir
+        self.schema = schema
+        self.writer = None
+        self.tmp_path = ""
+        self.final_path = ""
+
+    def write(self, day: str, batch):
+        if self.writer is None:
+            part_dir = os.path.join(self.table_dir, f"day={day}")
+            os.makedirs(part_dir, exist_ok=True)
+            self.final_path = os.path.join(part_dir, "part-0.parquet")
+            self.tmp_path = self.final_path + ".tmp"
+            self.writer = pq.ParquetWriter(self.tmp_path, self.schema, compression="zstd")
+        if batch.num_rows:
+            self.writer.write_batch(batch)
+
+    def finish_day(self):
+        if self.writer is not None:
+            self.writer.close()
+            os.replace(self.tmp_path, self.final_path)
+            self.writer = None
+
+    def abort(self):
+        if self.writer is not None:
+            self.writer.close()
+            os.remove(self.tmp_path)
+            self.writer = None
+
+
+def _export_rows(rows: Iterable[tuple], table_dir: str, columns: List[Tuple[str, str]]) -> Dict[str, int]:
+    schema = _arrow_schema(columns)
+    out = _PartitionWriter(table_dir, schema)
+    counts: Dict[str, int] = {}
+    try:
+        for day, batch, last in iter_day_batches(rows):
+            out.write(day, _record_batch(schema, columns, batch))
+            counts[day] = counts.get(day, 0) + len(batch)
+            if last:
+                out.finish_day()
+    except BaseException:
+        out.abort()
+        raise
+    return counts
+
+
+def _archived_signal_rows(path: str) -> Iterator[tuple]:
+    names = [name for name, _ in EXPORTS["signals"][1]]
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            item = json.loads(line)
+            yield (item["crawled_at"][:10],) + tuple(item.get(name) for name in names)
+
+
+def export(
+    db_path: str,
+    out_dir: str,
+    tables: Iterable[str] = tuple(EXPORTS),
+    since: str = "",
+    archive_dir: str = "",
+) -> Dict[str, Dict[str, int]]:
+    """
+    匯出資料表為依日期分區的 Parquet
+
+    Args:
+        db_path: SQLite 資料庫路徑（唯讀開啟）
+        out_dir: 輸出根目錄
+        tables: 要匯出的表（signals / events / event_articles）
+        since: 只匯出此日期（YYYY-MM-DD）之後的分區；空字串表示全部
+        archive_dir: 資料保留政策的歸檔目錄；尚未匯出過的歸檔日也會寫入 signals
+
+    Returns:
+        {table: {day: 列數}}
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("analytics export requires pyarrow: pip install pyarrow")
+    tables = list(tables)
+    unknown = set(tables) - set(EXPORTS)
+    if unknown:
+        raise ValueError(f"unknown export tables: {sorted(unknown)}")
+
+    result: Dict[str, Dict[str, int]] = {}
+    conn = connect_readonly(db_path)
+    try:
+        for table in tables:
+            sql, columns = EXPORTS[table]
+            table_dir = os.path.join(out_dir, table)
+            result[table] = _export_rows(conn.execute(sql, (since,)), table_dir, columns)
+    finally:
+        conn.close()
+
+    if archive_dir and "signals" in tables:
+        # 歸檔日的資料已不在資料庫中且不再變動，已有分區就跳過
+        table_dir = os.path.join(out_dir, "signals")
+        for path in sorted(glob.glob(os.path.join(archive_dir, "signals-*.jsonl.gz"))):
+            day = os.path.basename(path)[len("signals-"):-len(".jsonl.gz")]
+            if day < since or os.path.exists(os.path.join(table_dir, f"day={day}", "part-0.parquet")):
+                continue
+            result["signals"].update(_export_rows(_archived_signal_rows(path), table_dir, EXPORTS["signals"][1]))
+    return result
+
+
+def query(out_dir: str, table: str, since: str = "", until: str = "", columns: Optional[List[str]] = None,
+          filter=None):
+    """
+    讀取匯出的分區資料（僅掃描日期範圍內的分區）
+
+    Args:
+        out_dir: export() 的輸出根目錄
+        table: signals / events / event_articles
+        since, until: 日期範圍（YYYY-MM-DD，含頭含尾）
+        columns: 要讀取的欄位；None 表示全部
+        filter: 額外的 pyarrow.dataset 運算式，例如 ds.field("source_id") == "udn"
+
+    Returns:
+        pyarrow.Table（可再 .to_pandas()）
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("analytics query requires pyarrow: pip install pyarrow")
+    dataset = ds.dataset(
+        os.path.join(out_dir, table),
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("day", pa.string())]), flavor="hive"),
+    )
+    conditions = [] if filter is None else [filter]
+    if since:
+        conditions.append(ds.field("day") >= since)
+    if until:
+        conditions.append(ds.field("day") <= until)
+    expr = None
+    for cond in conditions:
+        expr = cond if expr is None else expr & cond
+    return dataset.to_table(columns=columns, filter=expr)
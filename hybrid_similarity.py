@@ -17,7 +17,8 @@ except ImportError:
     print("⚠️  未安裝 python-dotenv，請執行: pip install python-dotenv")
 
 from openai import OpenAI
-from main import title_similarity, TitleFeatures
+from main import title_features_available, title_similarity, title_similarity_at_least, title_similarity_bounds, TitleFeatures
+import similarity_matrix
 
 
 class HybridSimilarityChecker:
@@ -74,15 +75,15 @@ class HybridSimilarityChecker:
         支援字串或 TitleFeatures
         """
         # 階段 1：演算法快速過濾
-        # title_similarity 已經支援 TitleFeatures，直接傳遞即可
-        algo_similarity = title_similarity(title1, title2)
+        # 分數區間只計算一次：三個門檻都已落在區間外時不必計算 LCS
+        low, _ = title_similarity_bounds(title1, title2, (0.6, 0.3, 0.5))
 
         # 高相似度：直接判定為相同
-        if algo_similarity >= 0.6:
+        if low >= 0.6:
             return True
 
         # 低相似度：直接判定為不同
-        if algo_similarity < 0.3:
+        if low < 0.3:
             return False
 
         # 中間地帶（0.3-0.6）：使用 LLM 確認
@@ -96,7 +97,7 @@ class HybridSimilarityChecker:
             # 如果 LLM 未啟用或超過調用上限，使用保守策略（0.5 閾值）
             if self.enable_llm and self.llm_call_count >= 200:
                 print(f"⚠️  已達 LLM 調用上限（200 次），後續使用演算法判斷")
-            return algo_similarity >= 0.5
+            return low >= 0.5
 
     def _llm_check_similarity(self, title1: str, title2: str) -> bool:
         """
@@ -134,8 +135,8 @@ class HybridSimilarityChecker:
                 print(f"⏱️  LLM 調用超時，回退到演算法判斷")
             else:
                 print(f"❌ LLM 調用失敗: {type(e).__name__}: {e}")
-            # 失敗時回退到演算法（0.5 閾值）
-            return title_similarity(title1, title2) >= 0.5
+            # 失敗時回退到演算法（0.5 閾值）；與 API 逾時相比重新計算的成本可忽略
+            return title_similarity_at_least(title1, title2, 0.5)
 
     def batch_check(self, candidate_title: Union[str, TitleFeatures], reference_titles: List[Union[str, TitleFeatures]]) -> bool:
         """
@@ -147,6 +148,24 @@ class HybridSimilarityChecker:
                 return True
         return False
 
+    def batch_check_many(self, candidate_titles: List[TitleFeatures], reference_titles: List[TitleFeatures]) -> List[bool]:
+        """
+        對多個候選標題做 batch_check，結果與逐一呼叫相同（含 LLM 的呼叫順序）
+
+        先以 similarity_matrix 一次算出所有配對的相似度上界，
+        上界低於 0.3 的配對 is_same_news 必定回傳 False，直接略過；
+        其餘配對才依原順序呼叫 is_same_news。
+        """
+        if not (similarity_matrix.SIMILARITY_MATRIX_AVAILABLE and title_features_available()):
+            return [self.batch_check(candidate, reference_titles) for candidate in candidate_titles]
+
+        results = []
+        for candidate, ref_indexes in zip(
+            candidate_titles, similarity_matrix.pairs_above(candidate_titles, reference_titles, 0.3)
+        ):
+            results.append(any(self.is_same_news(candidate, reference_titles[j]) for j in ref_indexes))
+        return results
+
     def get_statistics(self) -> Dict:
         """取得統計資訊"""
         return {
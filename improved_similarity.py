@@ -18,6 +18,8 @@ from collections import Counter
 import math
 import jieba
 
+from sequence_ratio import longest_common_substring
+
 # 中文停用詞（常見的無意義詞彙）
 CHINESE_STOPWORDS = {
     '的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一', '一個',
@@ -121,15 +123,7 @@ def longest_common_substring_ratio(s1: str, s2: str) -> float:
     if m == 0 or n == 0:
         return 0.0
 
-    # 動態規劃找最長公共子字串
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
-    max_len = 0
-
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if s1_clean[i - 1] == s2_clean[j - 1]:
-                dp[i][j] = dp[i - 1][j - 1] + 1
-                max_len = max(max_len, dp[i][j])
+    max_len = longest_common_substring(s1_clean, s2_clean)
 
     # 回傳最長公共子字串佔較短字串的比例
     return max_len / min(m, n)
@@ -5,26 +5,39 @@ and hand off to an ETtoday publishing adapter.
 
 Notes:
 - OpenClaw crawler backend is intentionally left as a stub for now.
-- Mobile push monitoring is intentionally left as a stub for now.
+- Mobile push alerts are ingested through a local HTTP endpoint (mobile_push).
 """
 
 from __future__ import annotations
 
 import argparse
+import base64
+import codecs
+import contextlib
 import dataclasses
 import datetime as dt
+import gzip
 import hashlib
+import hmac
+import itertools
 import json
 import logging
 import os
+import queue
+import re
+import shutil
 import sqlite3
 import subprocess
+import sys
+import threading
 import time
-from dataclasses import dataclass
-from difflib import SequenceMatcher
-from typing import Dict, Iterable, List, Optional, Set
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 from urllib.parse import urljoin, urlparse
-from collections import Counter
+from collections import Counter, OrderedDict
 import math
 
 import requests
@@ -42,6 +55,9 @@ except Exception:
     JIEBA_AVAILABLE = False
 
 from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import sequence_ratio
 
 
 LOGGER = logging.getLogger("newsfollow")
@@ -53,6 +69,26 @@ DEFAULT_CONFIG = {
     "cluster_similarity": 0.74,
     "crawler_backend": "requests",  # requests | openclaw
     "database_path": "./newsfollow.db",
+    "database_writer": {
+        "background": False,  # persist on a writer thread while detection/drafting continue
+        "queue_size": 256,
+    },
+    "similarity": {
+        "sequence_ratio": "compat",  # compat (same scores as difflib) | lcs (bit-parallel, scores >= compat)
+        "feature_cache_mb": 32,  # LRU budget for tokenized titles
+        "feature_cache_path": "./cache/title_features.jsonl.gz",  # empty string: memory only
+    },
+    "tokenizer": {
+        "mode": "jieba",  # jieba (dictionary words) | ngram (CJK bigrams/trigrams, no dictionary to load)
+        "dictionary_cache_dir": "./cache",  # where jieba.cache is built once and reloaded at startup
+    },
+    "retention": {
+        "enabled": False,
+        "keep_days": 14,
+        "archive_dir": "./archive",  # empty string: roll up and delete without archiving
+        "interval_hours": 24,
+        "vacuum_pages": 5000,
+    },
     "llm": {
         "enabled": True,
         "provider": "openai",
@@ -70,6 +106,13 @@ DEFAULT_CONFIG = {
     },
     "mobile_push": {
         "enabled": False,
+        "host": "127.0.0.1",
+        "port": 8765,
+        "token": "",
+        "queue_size": 500,
+        "weight": 7,
+        "retain_seconds": 900,
+        "immediate_run": True,
     },
     "sources": [
         {
@@ -156,7 +199,7 @@ DEFAULT_CONFIG = {
 }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Signal:
     source_id: str
     source_name: str
@@ -165,10 +208,14 @@ class Signal:
     url: str
     weight: int
     crawled_at: str
+    # Derived once at construction; Signal is immutable so they never go stale.
+    normalized_title: str = field(init=False, repr=False, compare=False)
+    signature: str = field(init=False, repr=False, compare=False)
 
-    @property
-    def normalized_title(self) -> str:
-        return normalize_title(self.title)
+    def __post_init__(self) -> None:
+        normalized = normalize_title(self.title)
+        object.__setattr__(self, "normalized_title", normalized)
+        object.__setattr__(self, "signature", f"{self.source_id}|{self.section_id}|{normalized}|{self.url}")
 
 
 @dataclass
@@ -182,12 +229,364 @@ class Event:
     signals: List[Signal]
 
 
+class DatabaseWriter:
+    """
+    Background thread that owns its own SQLite connection and applies queued
+    write operations in order, so persistence runs alongside detection and
+    draft generation.
+
+    Each queued operation is `fn(conn, *args)`. BEGIN / COMMIT / ROLLBACK markers
+    group operations into one transaction; operations outside a group commit on
+    their own. The queue is bounded, so a slow disk blocks the producer instead
+    of buffering without limit. Errors, including a failed BEGIN or COMMIT, are
+    kept and re-raised by `flush()`; once the thread has stopped, `flush()` and
+    `submit()` raise instead of waiting on a queue nobody drains.
+    """
+
+    BEGIN = "BEGIN"
+    COMMIT = "COMMIT"
+    ROLLBACK = "ROLLBACK"
+    STOP = "STOP"
+
+    def __init__(self, db_path: str, setup: Optional[Callable[[sqlite3.Connection], None]] = None,
+                 queue_size: int = 256):
+        self.queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        if setup is not None:
+            setup(self._conn)
+        self._error: Optional[BaseException] = None
+        self._in_tx = False
+        self._tx_failed = False
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, op, *args) -> None:
+        self._put((op, args))
+
+    def flush(self) -> None:
+        """Barrier: wait until everything queued so far is applied."""
+        done = threading.Event()
+        self._put((done, ()))
+        while not done.wait(0.1):
+            if not self._thread.is_alive():
+                self._raise_stopped()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _put(self, item: tuple) -> None:
+        # Never block on a writer that is gone: its queue would not drain again.
+        while True:
+            if not self._thread.is_alive():
+                self._raise_stopped()
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _raise_stopped(self) -> None:
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+        raise RuntimeError("background database writer is not running")
+
+    def close(self) -> None:
+        """Apply what is still queued, then stop. An unfinished transaction is rolled back."""
+        if not self._thread.is_alive():
+            return
+        self.queue.put((self.STOP, ()))
+        self._thread.join()
+
+    def _run(self) -> None:
+        conn = self._conn
+        try:
+            while True:
+                op, args = self.queue.get()
+                if isinstance(op, threading.Event):
+                    op.set()
+                elif op == self.STOP:
+                    break
+                elif op == self.BEGIN:
+                    self._in_tx, self._tx_failed = True, False
+                    self._apply(conn.execute, "BEGIN")
+                elif op in (self.COMMIT, self.ROLLBACK):
+                    failed = self._tx_failed
+                    self._in_tx, self._tx_failed = False, False
+                    self._apply(conn.commit if op == self.COMMIT and not failed else conn.rollback)
+                elif not self._tx_failed:
+                    self._apply(self._apply_op, conn, op, args)
+        except BaseException as exc:
+            # Not expected; recorded so flush()/submit() raise it instead of waiting.
+            LOGGER.exception("background writer stopped")
+            if self._error is None:
+                self._error = exc
+        finally:
+            with contextlib.suppress(sqlite3.Error):
+                conn.rollback()
+            conn.close()
+
+    def _apply_op(self, conn: sqlite3.Connection, op, args: tuple) -> None:
+        op(conn, *args)
+        if not self._in_tx:
+            conn.commit()
+
+    def _apply(self, fn, *args) -> None:
+        """Run one step; a failure (including BEGIN / COMMIT) is kept for flush()."""
+        try:
+            fn(*args)
+        except Exception as exc:
+            LOGGER.exception("background write failed")
+            with contextlib.suppress(sqlite3.Error):
+                self._conn.rollback()
+            # Skip the rest of the transaction; it is already rolled back.
+            self._tx_failed = self._in_tx
+            if self._error is None:
+                self._error = exc
+
+
+class ConnectionPool:
+    """
+    SQLite connections for multi-threaded use (Flask workers, push ingestion,
+    background jobs): each thread reads through its own read-only connection,
+    created on first use, and all writes share one connection serialized by
+    `write_lock`. With WAL, readers never wait for the writer.
+
+    A `:memory:` database only exists inside one connection, so there every
+    thread is handed the write connection. With `read_only` every connection,
+    the "writer" included, is opened with `mode=ro` and cannot write.
+    """
+
+    def __init__(self, db_path: str, setup: Optional[Callable[[sqlite3.Connection], None]] = None, read_only: bool = False):
+        self.db_path = db_path
+        self.setup = setup
+        self.read_only = read_only
+        self.shared = db_path == ":memory:"
+        self.write_lock = threading.RLock()
+        self.writer = self._connect()
+        self._local = threading.local()
+        self._readers: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._readers_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if self.setup is not None:
+            self.setup(conn)
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        if self.shared:
+            return self.writer
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only = ON")
+            self._local.conn = conn
+            with self._readers_lock:
+                # Threads come and go (per-request threads); close what they left behind.
+                for thread in [t for t in self._readers if not t.is_alive()]:
+                    self._readers.pop(thread).close()
+                self._readers[threading.current_thread()] = conn
+        return conn
+
+    def close(self) -> None:
+        with self._readers_lock:
+            for conn in self._readers.values():
+                conn.close()
+            self._readers.clear()
+        with self.write_lock:
+            self.writer.close()
+
+
 class Repository:
-    def __init__(self, db_path: str):
+    # Applied to every connection: WAL lets readers run alongside the writer, and
+    # synchronous=NORMAL means commits append to the WAL without an fsync each.
+    PRAGMAS = (
+        "PRAGMA busy_timeout = 5000",
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA cache_size = -16000",  # 16 MB page cache
+        "PRAGMA temp_store = MEMORY",
+    )
+    LOOKUP_CHUNK = 500
+
+    def __init__(
+        self, db_path: str, background_writer: bool = False, writer_queue_size: int = 256, read_only: bool = False
+    ):
+        """
+        read_only opens an existing database for queries only (dashboards, scripts):
+        no file is created, no schema, migration or FTS backfill runs, and no
+        connection can take the write lock. A missing file raises sqlite3.OperationalError.
+        """
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
-        self._init_schema()
+        if not read_only and db_path != ":memory:" and (not os.path.exists(db_path) or os.path.getsize(db_path) == 0):
+            self._create_database(db_path)
+        setup = self._apply_read_pragmas if read_only else self._apply_pragmas
+        self.pool = ConnectionPool(db_path, setup=setup, read_only=read_only)
+        # The serialized write connection; reads go through self.pool.reader().
+        self.conn = self.pool.writer
+        self._tx_depth = 0
+        self._run_base = ""
+        self._run_suffix = 0
+        if not read_only:
+            self._init_schema()
+            self._setup_fts(self.conn)
+            self._backfill_fts()
+        self.writer: Optional[DatabaseWriter] = None
+        if background_writer:
+            if db_path == ":memory:":
+                LOGGER.warning("background writer needs a database file, writing inline")
+            else:
+                self.writer = DatabaseWriter(db_path, self._configure_writer, writer_queue_size)
+
+    @staticmethod
+    def _create_database(db_path: str) -> None:
+        # auto_vacuum only takes effect before the file header is written (WAL
+        # writes it), so it is set once here; apply_retention converts older files.
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("PRAGMA journal_mode = WAL")
+        finally:
+            conn.close()
+
+    @classmethod
+    def _apply_pragmas(cls, conn: sqlite3.Connection) -> None:
+        for pragma in cls.PRAGMAS:
+            conn.execute(pragma)
+
+    @classmethod
+    def _apply_read_pragmas(cls, conn: sqlite3.Connection) -> None:
+        # The journal mode belongs to the process that writes the file.
+        for pragma in cls.PRAGMAS:
+            if "journal_mode" not in pragma:
+                conn.execute(pragma)
+
+    @classmethod
+    def _configure_writer(cls, conn: sqlite3.Connection) -> None:
+        cls._apply_pragmas(conn)
+        cls._setup_fts(conn)
+
+    @staticmethod
+    def _setup_fts(conn: sqlite3.Connection) -> None:
+        """
+        Keep the title search indexes in step with articles/events. The triggers
+        call a Python tokenizer, so they are TEMP (per connection) and installed
+        on every connection that writes; other tools can still write the tables.
+        """
+        # Not deterministic: the output follows the tokenizer mode, which can change
+        # while the connection is open, so SQLite must not cache or index it.
+        conn.create_function("fts_tokens", 1, fts_tokens)
+        conn.executescript(
+            """
+            CREATE TEMP TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON main.articles BEGIN
+                INSERT INTO articles_fts (rowid, tokens) VALUES (new.article_id, fts_tokens(new.title));
+            END;
+            CREATE TEMP TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON main.articles BEGIN
+                DELETE FROM articles_fts WHERE rowid = old.article_id;
+            END;
+            CREATE TEMP TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON main.events BEGIN
+                INSERT INTO events_fts (rowid, tokens) VALUES (new.rowid, fts_tokens(new.canonical_title));
+            END;
+            CREATE TEMP TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE OF canonical_title ON main.events
+            WHEN old.canonical_title IS NOT new.canonical_title BEGIN
+                UPDATE events_fts SET tokens = fts_tokens(new.canonical_title) WHERE rowid = new.rowid;
+            END;
+            CREATE TEMP TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON main.events BEGIN
+                DELETE FROM events_fts WHERE rowid = old.rowid;
+            END;
+            """
+        )
+
+    def _backfill_fts(self) -> None:
+        # Rows added without the triggers (migration, older versions) sit above the index's max rowid.
+        # The check is a plain read, so opening an up-to-date database takes no write lock.
+        for table, key, title, fts in (
+            ("articles", "article_id", "title", "articles_fts"),
+            ("events", "rowid", "canonical_title", "events_fts"),
+        ):
+            last = self.conn.execute(f"SELECT COALESCE((SELECT rowid FROM {fts} ORDER BY rowid DESC LIMIT 1), 0)").fetchone()[0]
+            if self.conn.execute(f"SELECT 1 FROM {table} WHERE {key} > ? LIMIT 1", (last,)).fetchone():
+                self.conn.execute(
+                    f"INSERT INTO {fts} (rowid, tokens) SELECT {key}, fts_tokens({title}) FROM {table} WHERE {key} > ?",
+                    (last,),
+                )
+        if self.conn.in_transaction:
+            self.conn.commit()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Unit of work: every write inside the block commits once at the end, or
+        rolls back together if the block raises. Nested blocks join the outer one.
+        With the background writer the block is queued as one writer transaction.
+        Other threads' writes wait until the block ends.
+        """
+        with self.pool.write_lock:
+            yield from self._transaction()
+
+    def _transaction(self):
+        if self._tx_depth == 0:
+            if self.writer is not None:
+                self.writer.submit(DatabaseWriter.BEGIN)
+            elif not self.conn.in_transaction:
+                self.conn.execute("BEGIN")
+        self._tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                if self.writer is not None:
+                    self.writer.submit(DatabaseWriter.ROLLBACK)
+                else:
+                    self.conn.rollback()
+            raise
+        self._tx_depth -= 1
+        if self._tx_depth == 0:
+            if self.writer is not None:
+                self.writer.submit(DatabaseWriter.COMMIT)
+            else:
+                self.conn.commit()
+
+    def _commit(self) -> None:
+        if self._tx_depth == 0:
+            self.conn.commit()
+
+    def _write(self, op, *args):
+        """Run `op(conn, *args)` here, or queue it when a background writer is set."""
+        with self.pool.write_lock:
+            if self.writer is not None:
+                self.writer.submit(op, *args)
+                return None
+            result = op(self.conn, *args)
+            self._commit()
+            return result
+
+    @staticmethod
+    def _execute(conn: sqlite3.Connection, sql: str, params: tuple) -> None:
+        conn.execute(sql, params)
+
+    @staticmethod
+    def _executemany(conn: sqlite3.Connection, sql: str, rows: List[tuple]) -> None:
+        conn.executemany(sql, rows)
+
+    def flush(self) -> None:
+        """Wait for queued background writes; no-op when writing inline."""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.pool.close()
 
     def _init_schema(self) -> None:
         cur = self.conn.cursor()
@@ -198,24 +597,46 @@ class Repository:
                 started_at TEXT NOT NULL,
                 finished_at TEXT,
                 status TEXT NOT NULL,
-                note TEXT
+                note TEXT,
+                seq INTEGER
             );
 
-            CREATE TABLE IF NOT EXISTS signals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                run_id TEXT NOT NULL,
+            -- One row per unique article (URL + normalized title).
+            CREATE TABLE IF NOT EXISTS articles (
+                article_id INTEGER PRIMARY KEY,
                 source_id TEXT NOT NULL,
                 source_name TEXT NOT NULL,
-                section_id TEXT NOT NULL,
                 title TEXT NOT NULL,
                 url TEXT NOT NULL,
                 normalized_title TEXT NOT NULL,
-                weight INTEGER NOT NULL,
-                crawled_at TEXT NOT NULL
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                UNIQUE (url, normalized_title)
             );
 
-            CREATE INDEX IF NOT EXISTS idx_signals_run ON signals(run_id);
-            CREATE INDEX IF NOT EXISTS idx_signals_norm ON signals(normalized_title);
+            CREATE INDEX IF NOT EXISTS idx_articles_norm ON articles(normalized_title);
+
+            -- One compact row per article per run per section it appeared in.
+            -- run_seq is runs.seq, a small integer instead of the 20-char run_id.
+            CREATE TABLE IF NOT EXISTS sightings (
+                run_seq INTEGER NOT NULL,
+                article_id INTEGER NOT NULL,
+                section_id TEXT NOT NULL,
+                weight INTEGER NOT NULL,
+                PRIMARY KEY (run_seq, article_id, section_id)
+            ) WITHOUT ROWID;
+
+            -- Per-day, per-source rollup of sightings removed by apply_retention.
+            CREATE TABLE IF NOT EXISTS signal_daily (
+                day TEXT NOT NULL,
+                source_id TEXT NOT NULL,
+                section_id TEXT NOT NULL,
+                sightings INTEGER NOT NULL,
+                articles INTEGER NOT NULL,
+                runs INTEGER NOT NULL,
+                max_weight INTEGER NOT NULL,
+                PRIMARY KEY (day, source_id, section_id)
+            ) WITHOUT ROWID;
 
             CREATE TABLE IF NOT EXISTS events (
                 event_key TEXT PRIMARY KEY,
@@ -228,11 +649,15 @@ class Repository:
                 status TEXT NOT NULL DEFAULT 'new'
             );
 
-            CREATE TABLE IF NOT EXISTS event_signals (
+            -- Title search: space-joined jieba tokens, rowid = articles.article_id / events.rowid.
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(tokens);
+            CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(tokens);
+
+            CREATE TABLE IF NOT EXISTS event_articles (
                 event_key TEXT NOT NULL,
-                signal_id INTEGER NOT NULL,
-                PRIMARY KEY (event_key, signal_id)
-            );
+                article_id INTEGER NOT NULL,
+                PRIMARY KEY (event_key, article_id)
+            ) WITHOUT ROWID;
 
             CREATE TABLE IF NOT EXISTS drafts (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -253,80 +678,223 @@ class Repository:
                 external_id TEXT,
                 message TEXT
             );
+
+            -- Keyset pagination (page_events / page_drafts / page_publish_logs).
+            -- Events and publish logs are covered; drafts only fetch the page's rows.
+            CREATE INDEX IF NOT EXISTS idx_events_last_seen ON events(
+                last_seen, event_key, canonical_title, score, source_count, signal_count, first_seen, status
+            );
+            CREATE INDEX IF NOT EXISTS idx_drafts_generated ON drafts(generated_at, id);
+            CREATE INDEX IF NOT EXISTS idx_drafts_event ON drafts(event_key, generated_at, id);
+            CREATE INDEX IF NOT EXISTS idx_publish_logs_published ON publish_logs(
+                published_at, id, event_key, status, external_id, message
+            );
+            CREATE INDEX IF NOT EXISTS idx_publish_logs_event ON publish_logs(event_key, published_at, id);
             """
         )
         self.conn.commit()
+        self._ensure_run_seq()
+        self._migrate_legacy_signals()
+        self.conn.executescript(
+            """
+            -- Read-only view with the shape of the old per-run `signals` table.
+            CREATE VIEW IF NOT EXISTS signals AS
+            SELECT
+                r.run_id, a.article_id, a.source_id, a.source_name, s.section_id,
+                a.title, a.url, a.normalized_title, s.weight, r.started_at AS crawled_at
+            FROM sightings s
+            JOIN runs r ON r.seq = s.run_seq
+            JOIN articles a ON a.article_id = s.article_id;
+            """
+        )
 
-    def start_run(self) -> str:
-        run_id = dt.datetime.now(dt.timezone.utc).strftime("run_%Y%m%dT%H%M%SZ")
-        started_at = now_iso()
+    def _ensure_run_seq(self) -> None:
+        # Only write when there is something to fix, so opening an up-to-date
+        # database never waits for (or blocks) the monitor's write lock.
+        columns = {r["name"] for r in self.conn.execute("PRAGMA table_info(runs)")}
+        if "seq" not in columns:
+            self.conn.execute("ALTER TABLE runs ADD COLUMN seq INTEGER")
+        if self.conn.execute("SELECT 1 FROM runs WHERE seq IS NULL LIMIT 1").fetchone():
+            self._assign_run_seq()
+        self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_runs_seq ON runs(seq)")
+        if self.conn.in_transaction:
+            self.conn.commit()
+
+    def _assign_run_seq(self) -> None:
+        # Offset by the current max so numbers never collide with assigned ones.
         self.conn.execute(
-            "INSERT INTO runs (run_id, started_at, status) VALUES (?, ?, ?)",
-            (run_id, started_at, "running"),
+            "UPDATE runs SET seq = (SELECT COALESCE(MAX(seq), 0) FROM runs) + rowid WHERE seq IS NULL"
         )
-        self.conn.commit()
-        return run_id
 
-    def finish_run(self, run_id: str, status: str, note: str = "") -> None:
-        self.conn.execute(
-            "UPDATE runs SET finished_at = ?, status = ?, note = ? WHERE run_id = ?",
-            (now_iso(), status, note, run_id),
+    def _migrate_legacy_signals(self) -> None:
+        """
+        Fold the old `signals` / `event_signals` tables (one full row per signal
+        per run) into articles + sightings + event_articles, then drop them.
+        """
+        legacy = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'signals'"
+        ).fetchone()
+        if not legacy:
+            return
+
+        LOGGER.info("migrating legacy signals table to articles/sightings")
+        self.conn.executescript(
+            """
+            BEGIN;
+
+            INSERT OR IGNORE INTO runs (run_id, started_at, status, note)
+            SELECT run_id, MIN(crawled_at), 'ok', 'restored by signals migration'
+            FROM signals
+            GROUP BY run_id;
+
+            UPDATE runs SET seq = (SELECT COALESCE(MAX(seq), 0) FROM runs) + rowid WHERE seq IS NULL;
+
+            INSERT OR IGNORE INTO articles
+                (source_id, source_name, title, url, normalized_title, first_seen, last_seen)
+            SELECT source_id, source_name, title, url, normalized_title, MIN(crawled_at), MAX(crawled_at)
+            FROM signals
+            GROUP BY url, normalized_title;
+
+            INSERT OR IGNORE INTO sightings (run_seq, article_id, section_id, weight)
+            SELECT r.seq, a.article_id, s.section_id, MAX(s.weight)
+            FROM signals s
+            JOIN runs r ON r.run_id = s.run_id
+            JOIN articles a ON a.url = s.url AND a.normalized_title = s.normalized_title
+            GROUP BY r.seq, a.article_id, s.section_id;
+
+            INSERT OR IGNORE INTO event_articles (event_key, article_id)
+            SELECT es.event_key, a.article_id
+            FROM event_signals es
+            JOIN signals s ON s.id = es.signal_id
+            JOIN articles a ON a.url = s.url AND a.normalized_title = s.normalized_title;
+
+            DROP TABLE IF EXISTS event_signals;
+            DROP TABLE signals;
+
+            COMMIT;
+            """
         )
-        self.conn.commit()
 
-    def save_signals(self, run_id: str, signals: List[Signal]) -> List[int]:
-        ids: List[int] = []
-        for s in signals:
-            cur = self.conn.execute(
+    def start_run(self) -> str:
+        # Picking the id and inserting the row is one critical section, so two
+        # threads starting runs in the same second never pick the same id.
+        with self.pool.write_lock:
+            run_id = self._next_run_id()
+            self._write(
+                self._execute,
                 """
-                INSERT INTO signals
-                (run_id, source_id, source_name, section_id, title, url, normalized_title, weight, crawled_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO runs (run_id, started_at, status, seq)
+                VALUES (?, ?, 'running', (SELECT COALESCE(MAX(seq), 0) + 1 FROM runs))
                 """,
-                (
-                    run_id,
-                    s.source_id,
-                    s.source_name,
-                    s.section_id,
-                    s.title,
-                    s.url,
-                    s.normalized_title,
-                    s.weight,
-                    s.crawled_at,
-                ),
+                (run_id, now_iso()),
             )
-            ids.append(cur.lastrowid)
-        self.conn.commit()
+        return run_id
+
+    def _next_run_id(self) -> str:
+        # Push-triggered passes can start within the same second as another run.
+        # Suffixes issued by this process are remembered, because with the
+        # background writer an earlier run may not be committed yet.
+        base_id = dt.datetime.now(dt.timezone.utc).strftime("run_%Y%m%dT%H%M%SZ")
+        suffix = self._run_suffix + 1 if base_id == self._run_base else 1
+        run_id = base_id if suffix == 1 else f"{base_id}_{suffix}"
+        while self.pool.reader().execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone():
+            suffix += 1
+            run_id = f"{base_id}_{suffix}"
+        self._run_base, self._run_suffix = base_id, suffix
+        return run_id
+
+    def finish_run(self, run_id: str, status: str, note: str = "") -> None:
+        # Upsert: when a cycle's transaction rolled back, its run row is gone too
+        # and is re-created here (with the finish time as start time).
+        now = now_iso()
+        self._write(
+            self._execute,
+            """
+            INSERT INTO runs (run_id, started_at, finished_at, status, note, seq)
+            VALUES (?, ?, ?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM runs))
+            ON CONFLICT(run_id) DO UPDATE SET
+                finished_at = excluded.finished_at, status = excluded.status, note = excluded.note
+            """,
+            (run_id, now, now, status, note),
+        )
+
+    def save_signals(self, run_id: str, signals: List[Signal]) -> List[int]:
+        """
+        Record this run's sightings. Returns the article id for each signal;
+        an article row is only inserted the first time its URL + title is seen.
+        With the background writer the write is queued and an empty list is returned.
+        """
+        return self._write(self._save_signals, run_id, list(signals)) or []
+
+    @classmethod
+    def _save_signals(cls, conn: sqlite3.Connection, run_id: str, signals: List[Signal]) -> List[int]:
+        run_seq = cls._run_seq(conn, run_id)
+        conn.executemany(
+            """
+            INSERT INTO articles
+            (source_id, source_name, title, url, normalized_title, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url, normalized_title) DO UPDATE SET last_seen = excluded.last_seen
+            """,
+            [
+                (s.source_id, s.source_name, s.title, s.url, s.normalized_title, s.crawled_at, s.crawled_at)
+                for s in signals
+            ],
+        )
+        id_by_key = cls._article_ids(conn, {(s.url, s.normalized_title) for s in signals})
+        ids = [id_by_key[(s.url, s.normalized_title)] for s in signals]
+        conn.executemany(
+            "INSERT OR IGNORE INTO sightings (run_seq, article_id, section_id, weight) VALUES (?, ?, ?, ?)",
+            [(run_seq, article_id, s.section_id, s.weight) for article_id, s in zip(ids, signals)],
+        )
         return ids
 
+    @classmethod
+    def _article_ids(cls, conn: sqlite3.Connection, keys: Set[tuple]) -> Dict[tuple, int]:
+        """Map (url, normalized_title) keys to article ids, in chunks of URLs."""
+        urls = sorted({url for url, _ in keys})
+        found: Dict[tuple, int] = {}
+        for i in range(0, len(urls), cls.LOOKUP_CHUNK):
+            chunk = urls[i : i + cls.LOOKUP_CHUNK]
+            rows = conn.execute(
+                f"SELECT article_id, url, normalized_title FROM articles WHERE url IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for article_id, url, normalized_title in rows:
+                if (url, normalized_title) in keys:
+                    found[(url, normalized_title)] = article_id
+        return found
+
+    @staticmethod
+    def _run_seq(conn: sqlite3.Connection, run_id: str) -> int:
+        row = conn.execute("SELECT seq FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"unknown run_id: {run_id}")
+        return row[0]
+
     def upsert_event(self, event: Event) -> None:
-        existing = self.conn.execute(
-            "SELECT event_key, first_seen FROM events WHERE event_key = ?", (event.event_key,)
-        ).fetchone()
+        self.upsert_events([event])
+
+    def upsert_events(self, events: List[Event]) -> None:
+        """
+        Insert new events and refresh existing ones in one batch. first_seen and
+        status are only written on insert, so re-detected events keep them.
+        """
         now = now_iso()
-        if existing:
-            self.conn.execute(
-                """
-                UPDATE events
-                SET canonical_title = ?, score = ?, source_count = ?, signal_count = ?, last_seen = ?
-                WHERE event_key = ?
-                """,
-                (
-                    event.canonical_title,
-                    event.score,
-                    event.source_count,
-                    event.signal_count,
-                    now,
-                    event.event_key,
-                ),
-            )
-        else:
-            self.conn.execute(
-                """
-                INSERT INTO events
-                (event_key, canonical_title, score, source_count, signal_count, first_seen, last_seen, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, 'new')
-                """,
+        self._write(
+            self._executemany,
+            """
+            INSERT INTO events
+            (event_key, canonical_title, score, source_count, signal_count, first_seen, last_seen, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 'new')
+            ON CONFLICT(event_key) DO UPDATE SET
+                canonical_title = excluded.canonical_title,
+                score = excluded.score,
+                source_count = excluded.source_count,
+                signal_count = excluded.signal_count,
+                last_seen = excluded.last_seen
+            """,
+            [
                 (
                     event.event_key,
                     event.canonical_title,
@@ -335,20 +903,39 @@ class Repository:
                     event.signal_count,
                     now,
                     now,
-                ),
-            )
-        self.conn.commit()
+                )
+                for event in events
+            ],
+        )
 
-    def bind_event_signals(self, event_key: str, signal_ids: List[int]) -> None:
-        for signal_id in signal_ids:
-            self.conn.execute(
-                "INSERT OR IGNORE INTO event_signals (event_key, signal_id) VALUES (?, ?)",
-                (event_key, signal_id),
-            )
-        self.conn.commit()
+    def bind_event_signals(self, event_key: str, article_ids: List[int]) -> None:
+        self.bind_events_signals({event_key: article_ids})
+
+    def bind_events_signals(self, bindings: Dict[str, List[int]]) -> None:
+        """Link many events to their articles with a single executemany."""
+        self._write(
+            self._executemany,
+            "INSERT OR IGNORE INTO event_articles (event_key, article_id) VALUES (?, ?)",
+            [(event_key, article_id) for event_key, article_ids in bindings.items() for article_id in article_ids],
+        )
+
+    def bind_events(self, events: List[Event]) -> None:
+        """
+        Link each event to the articles of its signals, matched on the article's
+        natural key (url, normalized_title), so no article ids are needed up front.
+        """
+        self._write(
+            self._executemany,
+            """
+            INSERT OR IGNORE INTO event_articles (event_key, article_id)
+            SELECT ?, article_id FROM articles WHERE url = ? AND normalized_title = ?
+            """,
+            [(event.event_key, s.url, s.normalized_title) for event in events for s in event.signals],
+        )
 
     def save_draft(self, event_key: str, draft: Dict) -> None:
-        self.conn.execute(
+        self._write(
+            self._execute,
             """
             INSERT INTO drafts
             (event_key, generated_at, title, body, image_prompt, sources_json, raw_json)
@@ -364,10 +951,10 @@ class Repository:
                 json.dumps(draft, ensure_ascii=False),
             ),
         )
-        self.conn.commit()
 
     def save_publish_log(self, event_key: str, result: Dict) -> None:
-        self.conn.execute(
+        self._write(
+            self._execute,
             """
             INSERT INTO publish_logs
             (event_key, published_at, status, external_id, message)
@@ -381,21 +968,332 @@ class Repository:
                 result.get("message", ""),
             ),
         )
-        self.conn.commit()
+
+    def latest_section_urls(self, source_id: str, section_id: str) -> List[str]:
+        rows = self.pool.reader().execute(
+            """
+            SELECT a.url
+            FROM sightings s
+            JOIN articles a ON a.article_id = s.article_id
+            WHERE s.section_id = ? AND a.source_id = ? AND s.run_seq = (
+                SELECT r.seq FROM runs r
+                WHERE EXISTS (
+                    SELECT 1 FROM sightings s2
+                    JOIN articles a2 ON a2.article_id = s2.article_id
+                    WHERE s2.run_seq = r.seq AND s2.section_id = ? AND a2.source_id = ?
+                )
+                ORDER BY r.seq DESC
+                LIMIT 1
+            )
+            """,
+            (section_id, source_id, section_id, source_id),
+        ).fetchall()
+        return [r["url"] for r in rows]
 
     def list_recent_events(self, limit: int = 20) -> List[sqlite3.Row]:
-        return self.conn.execute(
+        return self.page_events(limit=limit)[0]
+
+    def articles_seen_since(self, since: str) -> List[sqlite3.Row]:
+        """Articles last seen at or after `since` (ISO time), oldest first."""
+        return self.pool.reader().execute(
             """
+            SELECT article_id, source_id, source_name, title, url, first_seen, last_seen
+            FROM articles
+            WHERE last_seen >= ?
+            ORDER BY first_seen, article_id
+            """,
+            (since,),
+        ).fetchall()
+
+    def latest_run_snapshot(self) -> Optional[Dict]:
+        """
+        The most recent successful run: its run row, the signals it saw and the
+        events it detected or refreshed. None when no run has completed yet.
+        """
+        reader = self.pool.reader()
+        run = reader.execute(
+            "SELECT run_id, seq, started_at, finished_at, note FROM runs WHERE status = 'ok' ORDER BY seq DESC LIMIT 1"
+        ).fetchone()
+        if run is None:
+            return None
+        rows = reader.execute(
+            """
+            SELECT a.source_id, a.source_name, s.section_id, a.title, a.url, s.weight
+            FROM sightings s
+            JOIN articles a ON a.article_id = s.article_id
+            WHERE s.run_seq = ?
+            ORDER BY a.source_id, s.weight DESC, s.article_id DESC
+            """,
+            (run["seq"],),
+        ).fetchall()
+        signals = [
+            Signal(r["source_id"], r["source_name"], r["section_id"], r["title"], r["url"], r["weight"], run["started_at"])
+            for r in rows
+        ]
+        events = reader.execute(
+            """
+            SELECT event_key, canonical_title, score, source_count, signal_count, first_seen, last_seen, status
+            FROM events INDEXED BY idx_events_last_seen
+            WHERE last_seen >= ?
+            ORDER BY score DESC
+            """,
+            (run["started_at"],),
+        ).fetchall()
+        return {"run": run, "signals": signals, "events": events}
+
+    def page_events(self, limit: int = 20, cursor: str = "") -> tuple:
+        """
+        Events by last_seen, newest first. Returns (rows, next_cursor); pass the
+        cursor back for the following page, "" means there are no more rows.
+        """
+        where, params = self._keyset("last_seen", "event_key", cursor)
+        rows = self.pool.reader().execute(
+            f"""
             SELECT event_key, canonical_title, score, source_count, signal_count, first_seen, last_seen, status
-            FROM events
-            ORDER BY last_seen DESC
+            FROM events INDEXED BY idx_events_last_seen
+            {where}
+            ORDER BY last_seen DESC, event_key DESC
+            LIMIT ?
+            """,
+            params + [limit],
+        ).fetchall()
+        return rows, self._next_cursor(rows, limit, "last_seen", "event_key")
+
+    def page_drafts(self, limit: int = 20, cursor: str = "", event_key: str = "") -> tuple:
+        """Drafts by generation time, newest first, with their event's score; see page_events."""
+        where, params = self._keyset("d.generated_at", "d.id", cursor)
+        index = "idx_drafts_generated"
+        if event_key:
+            where = f"{where} AND d.event_key = ?" if where else "WHERE d.event_key = ?"
+            params.append(event_key)
+            index = "idx_drafts_event"
+        rows = self.pool.reader().execute(
+            f"""
+            SELECT d.*, e.score, e.source_count, e.signal_count
+            FROM drafts d INDEXED BY {index}
+            LEFT JOIN events e ON e.event_key = d.event_key
+            {where}
+            ORDER BY d.generated_at DESC, d.id DESC
+            LIMIT ?
+            """,
+            params + [limit],
+        ).fetchall()
+        return rows, self._next_cursor(rows, limit, "generated_at", "id")
+
+    def page_publish_logs(self, limit: int = 20, cursor: str = "", event_key: str = "") -> tuple:
+        """Publish attempts, newest first; see page_events."""
+        where, params = self._keyset("published_at", "id", cursor)
+        index = "idx_publish_logs_published"
+        if event_key:
+            where = f"{where} AND event_key = ?" if where else "WHERE event_key = ?"
+            params.append(event_key)
+            index = "idx_publish_logs_event"
+        rows = self.pool.reader().execute(
+            f"""
+            SELECT id, event_key, published_at, status, external_id, message
+            FROM publish_logs INDEXED BY {index}
+            {where}
+            ORDER BY published_at DESC, id DESC
+            LIMIT ?
+            """,
+            params + [limit],
+        ).fetchall()
+        return rows, self._next_cursor(rows, limit, "published_at", "id")
+
+    @staticmethod
+    def _keyset(sort_col: str, tie_col: str, cursor: str) -> tuple:
+        if not cursor:
+            return "", []
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            last_sort, last_tie = json.loads(base64.urlsafe_b64decode(padded))
+        except Exception as exc:
+            raise ValueError(f"invalid cursor: {cursor!r}") from exc
+        return f"WHERE ({sort_col}, {tie_col}) < (?, ?)", [last_sort, last_tie]
+
+    @staticmethod
+    def _next_cursor(rows: List[sqlite3.Row], limit: int, sort_key: str, tie_key: str) -> str:
+        if len(rows) < limit or not rows:
+            return ""
+        last = rows[-1]
+        raw = json.dumps([last[sort_key], last[tie_key]], ensure_ascii=False).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def search_articles(self, text: str, limit: int = 20, since: str = "", any_token: bool = False) -> List[sqlite3.Row]:
+        """
+        Full-text title search, best match first. `since` (ISO date or time) limits
+        to articles seen since then. any_token=True matches titles sharing any
+        token, which makes this usable as a candidate retriever for similarity.
+        """
+        match = fts_query(text, any_token=any_token)
+        if not match:
+            return []
+        return self.pool.reader().execute(
+            """
+            SELECT a.article_id, a.source_id, a.source_name, a.title, a.url, a.first_seen, a.last_seen,
+                   f.rank AS rank
+            FROM articles_fts f
+            JOIN articles a ON a.article_id = f.rowid
+            WHERE articles_fts MATCH ? AND a.last_seen >= ?
+            ORDER BY f.rank
+            LIMIT ?
+            """,
+            (match, since, limit),
+        ).fetchall()
+
+    def search_events(self, text: str, limit: int = 20, since: str = "", any_token: bool = False) -> List[sqlite3.Row]:
+        match = fts_query(text, any_token=any_token)
+        if not match:
+            return []
+        return self.pool.reader().execute(
+            """
+            SELECT e.event_key, e.canonical_title, e.score, e.source_count, e.signal_count,
+                   e.first_seen, e.last_seen, e.status, f.rank AS rank
+            FROM events_fts f
+            JOIN events e ON e.rowid = f.rowid
+            WHERE events_fts MATCH ? AND e.last_seen >= ?
+            ORDER BY f.rank
             LIMIT ?
             """,
-            (limit,),
+            (match, since, limit),
         ).fetchall()
 
+    def apply_retention(self, keep_days: int, archive_dir: str = "", vacuum_pages: int = 0) -> Dict:
+        """
+        Keep only the last `keep_days` whole UTC days in the hot tables.
+
+        Older sightings are appended to gzip JSONL files (one per day) under
+        `archive_dir`, rolled up into signal_daily, and deleted together with
+        their runs and the articles no longer seen. Then up to `vacuum_pages`
+        free pages are returned to the filesystem.
+        """
+        with self.pool.write_lock:
+            self.flush()
+            today = dt.datetime.now(dt.timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+            cutoff = (today - dt.timedelta(days=max(0, int(keep_days)))).isoformat()
+            old_runs = "SELECT seq FROM runs WHERE started_at < ?"
+
+            # Runs on this connection even with the background writer, which is idle
+            # after the flush above; IMMEDIATE takes the write lock up front.
+            # Archive files are written next to their targets and only renamed into
+            # place after the delete commits, so a failed or retried pass never
+            # archives the same sightings twice.
+            pending: List[tuple] = []
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                archived = self._archive_sightings(cutoff, archive_dir, pending) if archive_dir else 0
+                self.conn.execute(
+                    f"""
+                    INSERT INTO signal_daily (day, source_id, section_id, sightings, articles, runs, max_weight)
+                    SELECT substr(r.started_at, 1, 10), a.source_id, s.section_id,
+                           COUNT(*), COUNT(DISTINCT s.article_id), COUNT(DISTINCT s.run_seq), MAX(s.weight)
+                    FROM sightings s
+                    JOIN runs r ON r.seq = s.run_seq
+                    JOIN articles a ON a.article_id = s.article_id
+                    WHERE s.run_seq IN ({old_runs})
+                    GROUP BY 1, 2, 3
+                    ON CONFLICT(day, source_id, section_id) DO UPDATE SET
+                        sightings = sightings + excluded.sightings,
+                        articles = articles + excluded.articles,
+                        runs = runs + excluded.runs,
+                        max_weight = MAX(max_weight, excluded.max_weight)
+                    """,
+                    (cutoff,),
+                )
+                sightings = self.conn.execute(f"DELETE FROM sightings WHERE run_seq IN ({old_runs})", (cutoff,)).rowcount
+                runs = self.conn.execute("DELETE FROM runs WHERE started_at < ?", (cutoff,)).rowcount
+                articles = self.conn.execute(
+                    """
+                    DELETE FROM articles
+                    WHERE last_seen < ? AND article_id NOT IN (SELECT article_id FROM sightings)
+                    """,
+                    (cutoff,),
+                ).rowcount
+                self.conn.execute(
+                    "DELETE FROM event_articles WHERE article_id NOT IN (SELECT article_id FROM articles)"
+                )
+            except BaseException:
+                self.conn.rollback()
+                for tmp_path, _ in pending:
+                    with contextlib.suppress(OSError):
+                        os.remove(tmp_path)
+                raise
+            self.conn.commit()
+            for tmp_path, path in pending:
+                os.replace(tmp_path, path)
+
+            summary = {
+                "cutoff": cutoff,
+                "archived": archived,
+                "sightings": sightings,
+                "runs": runs,
+                "articles": articles,
+                "vacuumed_pages": self.incremental_vacuum(vacuum_pages) if vacuum_pages else 0,
+            }
+            LOGGER.info("retention: %s", summary)
+            return summary
+
+    def _archive_sightings(self, cutoff: str, archive_dir: str, pending: List[tuple]) -> int:
+        """
+        Write sightings of runs before `cutoff` to signals-YYYY-MM-DD.jsonl.gz.tmp
+        files: a copy of the day's existing archive plus the new rows. Each
+        (tmp_path, path) is added to `pending`; the caller renames them.
+        """
+        os.makedirs(archive_dir, exist_ok=True)
+        rows = self.conn.execute(
+            """
+            SELECT run_id, source_id, source_name, section_id, title, url, normalized_title, weight, crawled_at
+            FROM signals
+            WHERE crawled_at < ?
+            ORDER BY crawled_at
+            """,
+            (cutoff,),
+        )
+        count = 0
+        day, out = "", None
+        try:
+            for row in rows:
+                row_day = row["crawled_at"][:10]
+                if row_day != day:
+                    if out is not None:
+                        out.close()
+                    day = row_day
+                    path = os.path.join(archive_dir, f"signals-{day}.jsonl.gz")
+                    tmp_path = path + ".tmp"
+                    pending.append((tmp_path, path))
+                    existing = os.path.exists(path)
+                    if existing:
+                        shutil.copyfile(path, tmp_path)
+                    # Appending adds a gzip member; readers see one continuous stream.
+                    out = gzip.open(tmp_path, "at" if existing else "wt", encoding="utf-8")
+                out.write(json.dumps(dict(row), ensure_ascii=False) + "\n")
+                count += 1
+        finally:
+            if out is not None:
+                out.close()
+        return count
+
+    def incremental_vacuum(self, pages: int) -> int:
+        """Release up to `pages` free pages. Returns how many were released."""
+        with self.pool.write_lock:
+            if self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                # auto_vacuum can only be switched on an existing file by a full VACUUM.
+                LOGGER.info("converting database to incremental auto_vacuum (one-time VACUUM)")
+                self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                self.conn.execute("VACUUM")
+                return 0
+            before = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+            self.conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+            return before - self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9._:-]+)""", re.IGNORECASE)
+
 
 class RequestsCrawler:
+    # Only the head of the document is scanned for <meta charset>.
+    META_SNIFF_BYTES = 4096
+
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update(
@@ -406,6 +1304,8 @@ class RequestsCrawler:
                 )
             }
         )
+        # host -> codec name resolved on the first fetch from that host
+        self.host_encodings: Dict[str, str] = {}
 
     def fetch_html(self, url: str, timeout: int = 15) -> str:
         # ETtoday SSL certificate has issues (Missing Subject Key Identifier)
@@ -415,13 +1315,60 @@ class RequestsCrawler:
         try:
             resp = self.session.get(url, timeout=timeout, verify=verify_ssl)
             resp.raise_for_status()
-            return resp.text
+            return self._decode(url, resp)
         except requests.exceptions.SSLError as e:
             # Fallback: retry without SSL verification if SSL error occurs
             LOGGER.warning("SSL error for %s, retrying without verification: %s", url, e)
             resp = self.session.get(url, timeout=timeout, verify=False)
             resp.raise_for_status()
-            return resp.text
+            return self._decode(url, resp)
+
+    def _decode(self, url: str, resp) -> str:
+        """
+        Decode the body without going through `resp.text`.
+
+        `resp.text` either trusts requests' ISO-8859-1 default for text/* or runs
+        statistical detection over the whole body. We resolve the charset once per
+        host (HTTP header, then <meta>, then detection as a last resort) and reuse it.
+        """
+        host = urlparse(url).netloc
+        encoding = _charset_from_content_type(resp.headers.get("Content-Type", ""))
+        if encoding is None:
+            encoding = self.host_encodings.get(host)
+        if encoding is None:
+            encoding = _charset_from_meta(resp.content[: self.META_SNIFF_BYTES])
+        if encoding is None:
+            encoding = _lookup_codec(resp.apparent_encoding or "") or "utf-8"
+            LOGGER.debug("charset detection used for host=%s -> %s", host, encoding)
+
+        if self.host_encodings.get(host) != encoding:
+            self.host_encodings[host] = encoding
+        return resp.content.decode(encoding, errors="replace")
+
+
+def _lookup_codec(name: str) -> Optional[str]:
+    name = name.strip().strip("'\"").lower()
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def _charset_from_content_type(content_type: str) -> Optional[str]:
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            return _lookup_codec(value)
+    return None
+
+
+def _charset_from_meta(head: bytes) -> Optional[str]:
+    match = _META_CHARSET_RE.search(head)
+    if not match:
+        return None
+    return _lookup_codec(match.group(1).decode("ascii", errors="ignore"))
 
 
 class OpenClawCrawlerStub:
@@ -436,13 +1383,171 @@ class OpenClawCrawlerStub:
         )
 
 
-class MobilePushMonitorStub:
+class MobilePushMonitor:
     """
-    Reserved for future mobile push notification ingestion.
+    Local ingestion endpoint for mobile push / alert payloads.
+
+    `POST /push` accepts a JSON object, a list of objects, or {"alerts": [...]}.
+    Each alert needs a `title`; `url`, `source_id`, `source_name`, `section_id`
+    and `weight` are optional. Alerts are converted to `Signal`s and placed on a
+    bounded queue that `collect()` drains at the start of each run. Accepted
+    pushes stay part of the signal set for `retain_seconds` so they keep
+    contributing to clustering in the following cycles.
     """
 
+    def __init__(self, push_cfg: Dict):
+        self.cfg = push_cfg
+        self.queue: "queue.Queue[Signal]" = queue.Queue(maxsize=int(push_cfg.get("queue_size", 500)))
+        self.retain_seconds = float(push_cfg.get("retain_seconds", 900))
+        self.immediate_run = bool(push_cfg.get("immediate_run", True))
+        self.wakeup = threading.Event()
+        self._submit_lock = threading.Lock()
+        self._recent: List[tuple] = []  # (received monotonic time, Signal)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Optional[tuple]:
+        return self._server.server_address if self._server else None
+
+    def start(self) -> None:
+        if self._server:
+            return
+        host = self.cfg.get("host", "127.0.0.1")
+        port = int(self.cfg.get("port", 8765))
+        self._server = ThreadingHTTPServer((host, port), _make_push_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="push-ingest", daemon=True)
+        self._thread.start()
+        LOGGER.info("push ingestion listening on http://%s:%s/push", *self._server.server_address[:2])
+
+    def stop(self) -> None:
+        if not self._server:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5)
+        self._server = None
+        self._thread = None
+
+    def submit(self, payload) -> int:
+        """
+        Queue alerts from a decoded JSON payload. Returns the number accepted.
+        Raises ValueError for malformed alerts and queue.Full when the whole
+        batch does not fit; a batch is queued entirely or not at all, so a
+        client can retry it without duplicating alerts.
+        """
+        if isinstance(payload, dict) and isinstance(payload.get("alerts"), list):
+            payload = payload["alerts"]
+        alerts = payload if isinstance(payload, list) else [payload]
+        signals = [self._to_signal(a) for a in alerts]
+        # Only producers hold the lock and collect() only frees space, so the
+        # capacity checked here is still there when the puts run.
+        with self._submit_lock:
+            if self.queue.maxsize > 0 and self.queue.maxsize - self.queue.qsize() < len(signals):
+                raise queue.Full
+            for sig in signals:
+                self.queue.put_nowait(sig)
+        if signals and self.immediate_run:
+            self.wakeup.set()
+        return len(signals)
+
     def collect(self) -> List[Signal]:
-        return []
+        now = time.monotonic()
+        while True:
+            try:
+                self._recent.append((now, self.queue.get_nowait()))
+            except queue.Empty:
+                break
+        self._recent = [(t, s) for t, s in self._recent if now - t <= self.retain_seconds]
+        return [s for _, s in self._recent]
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to `timeout` seconds; True if a push asked for an immediate pass."""
+        if timeout <= 0:
+            return False
+        if not (self._server and self.immediate_run):
+            time.sleep(timeout)
+            return False
+        woke = self.wakeup.wait(timeout)
+        self.wakeup.clear()
+        return woke
+
+    def _to_signal(self, alert) -> Signal:
+        if not isinstance(alert, dict):
+            raise ValueError("alert must be a JSON object")
+        title = compact_space(str(alert.get("title") or ""))
+        if not title:
+            raise ValueError("alert title is required")
+        source_id = str(alert.get("source_id") or "push")
+        url = str(alert.get("url") or "")
+        if not url:
+            url = f"push://{source_id}/" + hashlib.md5(title.encode("utf-8")).hexdigest()[:12]
+        return Signal(
+            source_id=source_id,
+            source_name=str(alert.get("source_name") or "Mobile Push"),
+            section_id=str(alert.get("section_id") or "push"),
+            title=title,
+            url=url,
+            weight=int(alert.get("weight", self.cfg.get("weight", 7))),
+            crawled_at=self._received_at(alert.get("received_at")),
+        )
+
+    @staticmethod
+    def _received_at(value) -> str:
+        """
+        The client's receive time as UTC ISO 8601, like now_iso(), so it compares
+        correctly as a string in retention and `articles_seen_since`. Missing or
+        unparseable values fall back to now; a time without offset counts as UTC.
+        """
+        if not isinstance(value, str):
+            return now_iso()
+        try:
+            received = dt.datetime.fromisoformat(value.strip())
+        except ValueError:
+            return now_iso()
+        if received.tzinfo is None:
+            received = received.replace(tzinfo=dt.timezone.utc)
+        return received.astimezone(dt.timezone.utc).isoformat()
+
+
+def _make_push_handler(monitor: MobilePushMonitor):
+    token = monitor.cfg.get("token", "")
+
+    class PushHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/health":
+                return self._reply(404, {"error": "not found"})
+            return self._reply(200, {"status": "ok", "queued": monitor.queue.qsize()})
+
+        def do_POST(self):
+            if self.path != "/push":
+                return self._reply(404, {"error": "not found"})
+            supplied = self.headers.get("X-Push-Token", "")
+            if token and not hmac.compare_digest(supplied.encode("utf-8"), str(token).encode("utf-8")):
+                return self._reply(401, {"error": "invalid token"})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                accepted = monitor.submit(json.loads(self.rfile.read(length) or b"null"))
+            except queue.Full:
+                LOGGER.warning("push queue full, batch dropped")
+                return self._reply(429, {"error": "queue full", "accepted": 0})
+            except (ValueError, TypeError) as exc:
+                return self._reply(400, {"error": str(exc)})
+            return self._reply(202, {"accepted": accepted})
+
+        def _reply(self, status: int, body: Dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, fmt, *args):
+            LOGGER.debug("push ingest: " + fmt, *args)
+
+    return PushHandler
 
 
 class DraftGenerator:
@@ -619,14 +1724,30 @@ class PublisherCommandAdapter:
             }
 
 
+def configure_similarity(cfg: Dict) -> str:
+    """Apply the tokenizer and similarity settings; returns the feature cache path."""
+    set_sequence_ratio_mode(cfg.get("similarity", {}).get("sequence_ratio", "compat"))
+    set_tokenizer_mode(cfg.get("tokenizer", {}).get("mode", "jieba"))
+    return configure_feature_cache(cfg.get("similarity", {}))
+
+
 class MonitorApp:
     def __init__(self, cfg: Dict):
         self.cfg = cfg
-        self.repo = Repository(cfg["database_path"])
+        self.feature_cache_path = configure_similarity(cfg)
+        writer_cfg = cfg.get("database_writer", {})
+        self.repo = Repository(
+            cfg["database_path"],
+            background_writer=writer_cfg.get("background", False),
+            writer_queue_size=writer_cfg.get("queue_size", 256),
+        )
         self.crawler = self._build_crawler(cfg.get("crawler_backend", "requests"))
-        self.push_monitor = MobilePushMonitorStub()
+        self.push_monitor = MobilePushMonitor(cfg.get("mobile_push", {}))
         self.generator = DraftGenerator(cfg["llm"])
         self.publisher = self._build_publisher(cfg["publisher"])
+        # (source_id, section_id) -> article URLs seen in the previous cycle
+        self.high_water_urls: Dict[tuple, Set[str]] = {}
+        self.last_crawled_signals: List[Signal] = []
 
     def _build_crawler(self, backend: str):
         if backend == "openclaw":
@@ -640,38 +1761,56 @@ class MonitorApp:
             return PublisherCommandAdapter(pub_cfg.get("publish_command", ""))
         return PublisherStub()
 
-    def run_once(self, publish: bool = False) -> Dict:
-        run_id = self.repo.start_run()
-        LOGGER.info("run started: %s", run_id)
+    def apply_retention(self, keep_days: Optional[int] = None) -> Dict:
+        ret_cfg = self.cfg.get("retention", {})
+        return self.repo.apply_retention(
+            keep_days=ret_cfg.get("keep_days", 14) if keep_days is None else keep_days,
+            archive_dir=ret_cfg.get("archive_dir", ""),
+            vacuum_pages=int(ret_cfg.get("vacuum_pages", 0)),
+        )
 
+    def close(self) -> None:
+        """Stop the push endpoint and drain queued database writes."""
+        self.push_monitor.stop()
+        self.repo.close()
+        save_feature_cache(self.feature_cache_path)
+
+    def run_once(self, publish: bool = False, recrawl: bool = True) -> Dict:
+        """
+        Run one detection cycle. With recrawl=False the sites are not fetched
+        again: the previous crawl is combined with newly pushed alerts, which is
+        how out-of-cycle passes triggered by mobile pushes stay within seconds.
+        """
+        # Crawling, detection and the LLM run outside any transaction, so the
+        # write lock is only held for the short blocks that store the results.
+        run_id = ""
         try:
-            signals = self.collect_signals()
-            signal_ids = self.repo.save_signals(run_id, signals)
-
-            id_by_signature = {}
-            for sid, signal in zip(signal_ids, signals):
-                signature = f"{signal.source_id}|{signal.section_id}|{signal.normalized_title}|{signal.url}"
-                id_by_signature[signature] = sid
+            run_id = self.repo.start_run()
+            LOGGER.info("run started: %s", run_id)
 
+            signals = self.collect_signals(recrawl=recrawl)
             events = detect_events(
                 signals=signals,
                 score_threshold=self.cfg["event_threshold"],
                 similarity_threshold=self.cfg["cluster_similarity"],
             )
 
-            for event in events:
-                self.repo.upsert_event(event)
-                related_signal_ids = []
-                for sig in event.signals:
-                    signature = f"{sig.source_id}|{sig.section_id}|{sig.normalized_title}|{sig.url}"
-                    if signature in id_by_signature:
-                        related_signal_ids.append(id_by_signature[signature])
-                self.repo.bind_event_signals(event.event_key, related_signal_ids)
+            # Detection results commit as one unit; with the background writer that
+            # commit runs while the drafts below are generated.
+            with self.repo.transaction():
+                self.repo.save_signals(run_id, signals)
+                self.repo.upsert_events(events)
+                self.repo.bind_events(events)
 
-                draft = self.generator.generate(event)
-                self.repo.save_draft(event.event_key, draft)
+            drafts = [(event, self.generator.generate(event)) for event in events]
+            with self.repo.transaction():
+                for event, draft in drafts:
+                    self.repo.save_draft(event.event_key, draft)
 
+            for event, draft in drafts:
                 if publish:
+                    # Published only after its draft is stored; each log row commits
+                    # on its own, since the publish itself cannot be rolled back.
                     result = self.publisher.publish(draft)
                     self.repo.save_publish_log(event.event_key, result)
 
@@ -684,45 +1823,93 @@ class MonitorApp:
                     event.canonical_title,
                 )
 
+            # Barrier: with the background writer, a failed queued write marks the run failed.
+            self.repo.flush()
             self.repo.finish_run(run_id, "ok", f"signals={len(signals)}, events={len(events)}")
             return {"run_id": run_id, "signals": len(signals), "events": len(events)}
         except Exception as exc:
-            self.repo.finish_run(run_id, "failed", str(exc))
+            if run_id:
+                self.repo.finish_run(run_id, "failed", str(exc))
             raise
 
-    def collect_signals(self) -> List[Signal]:
-        all_signals: List[Signal] = []
-        ts = now_iso()
-
-        for source in self.cfg["sources"]:
-            for section in source["sections"]:
-                url = section["url"]
-                try:
-                    html = self.crawler.fetch_html(url)
-                except Exception as exc:
-                    LOGGER.warning("crawl failed source=%s section=%s url=%s err=%s", source["source_id"], section["section_id"], url, exc)
-                    continue
-
-                extracted = extract_signals(
-                    html=html,
-                    base_url=url,
-                    source_id=source["source_id"],
-                    source_name=source["source_name"],
-                    section_id=section["section_id"],
-                    domain_contains=source.get("domain_contains", ""),
-                    selectors=section.get("selectors", []),
-                    weight=section.get("weight", 1),
-                    crawled_at=ts,
-                    max_items=section.get("max_items", 20),
-                )
-                all_signals.extend(extracted)
+    def collect_signals(self, recrawl: bool = True) -> List[Signal]:
+        if recrawl:
+            crawled: List[Signal] = []
+            ts = now_iso()
+            for source in self.cfg["sources"]:
+                for section in source["sections"]:
+                    crawled.extend(self.crawl_section(source, section, ts))
+            self.last_crawled_signals = crawled
 
+        all_signals: List[Signal] = list(self.last_crawled_signals)
         if self.cfg.get("mobile_push", {}).get("enabled", False):
             all_signals.extend(self.push_monitor.collect())
 
         deduped = dedupe_signals(all_signals)
         return deduped
 
+    def crawl_section(self, source: Dict, section: Dict, ts: str) -> List[Signal]:
+        """
+        Crawl one configured section.
+
+        Sections with `pagination.url_template` are crawled incrementally: pages are
+        followed until one contains an article URL seen in the previous cycle (the
+        high-water mark), or `pagination.max_pages` is reached. Without a previous
+        cycle only the first page is fetched.
+        """
+        pagination = section.get("pagination") or {}
+        template = pagination.get("url_template", "")
+        max_pages = int(pagination.get("max_pages", 1)) if template else 1
+
+        key = (source["source_id"], section["section_id"])
+        previous_urls = self._previous_section_urls(key) if template else set()
+
+        collected: List[Signal] = []
+        seen_urls: Set[str] = set()
+        url = section["url"]
+        page = 1
+        while True:
+            try:
+                html = self.crawler.fetch_html(url)
+            except Exception as exc:
+                LOGGER.warning("crawl failed source=%s section=%s url=%s err=%s", source["source_id"], section["section_id"], url, exc)
+                break
+
+            extracted = extract_signals(
+                html=html,
+                base_url=url,
+                source_id=source["source_id"],
+                source_name=source["source_name"],
+                section_id=section["section_id"],
+                domain_contains=source.get("domain_contains", ""),
+                selectors=section.get("selectors", []),
+                weight=section.get("weight", 1),
+                crawled_at=ts,
+                max_items=section.get("max_items", 20),
+                exclude_patterns=source.get("exclude_patterns", []),
+            )
+            fresh = [s for s in extracted if s.url not in seen_urls]
+            collected.extend(fresh)
+            seen_urls.update(s.url for s in fresh)
+
+            reached_high_water = any(s.url in previous_urls for s in extracted)
+            if page >= max_pages or not previous_urls or reached_high_water or not fresh:
+                break
+            page += 1
+            url = template.format(page=page)
+
+        if template:
+            if page > 1:
+                LOGGER.info("incremental crawl source=%s section=%s pages=%d signals=%d", key[0], key[1], page, len(collected))
+            if collected:
+                self.high_water_urls[key] = seen_urls
+        return collected
+
+    def _previous_section_urls(self, key) -> Set[str]:
+        if key not in self.high_water_urls:
+            self.high_water_urls[key] = set(self.repo.latest_section_urls(*key))
+        return self.high_water_urls[key]
+
 
 class _FallbackAnchorParser(HTMLParser):
     def __init__(self):
@@ -939,41 +2126,66 @@ def dedupe_signals(signals: Iterable[Signal]) -> List[Signal]:
     deduped: List[Signal] = []
     seen = set()
     for s in signals:
-        key = f"{s.source_id}|{s.section_id}|{s.normalized_title}|{s.url}"
-        if key in seen:
+        if s.signature in seen:
             continue
-        seen.add(key)
+        seen.add(s.signature)
         deduped.append(s)
     return deduped
 
 
-def detect_events(signals: List[Signal], score_threshold: float, similarity_threshold: float) -> List[Event]:
-    if not signals:
-        return []
-
-    clusters: List[List[Signal]] = []
-    representatives: List[str] = []
+def cluster_titles(titles: Sequence[str], similarity_threshold: float) -> List[List[int]]:
+    """
+    detect_events 的分群：依序加入，歸入第一個相似度達門檻的群，代表標題取較長者
 
-    for signal in signals:
+    Returns:
+        每群的標題索引（依 titles 順序）；空標題不分群
+    """
+    clusters: List[List[int]] = []
+    # 代表標題的特徵；每個標題只分詞一次，比對時只比特徵
+    representatives: List[Union[str, TitleFeatures]] = []
+    features: Dict[str, Union[str, TitleFeatures]] = {}
+    # 門檻高於 0.25 時只需比對有共同詞、數字或包含關係的群（見 _ClusterIndex）
+    use_features = title_features_available()
+    index = _ClusterIndex(similarity_threshold) if use_features and similarity_threshold > 0.25 else None
+
+    for idx, title in enumerate(titles):
         # 使用原始標題進行比對（改進的演算法）
-        title = signal.title
         if not title:
             continue
+        feature = features.get(title)
+        if feature is None:
+            feature = cached_title_features(title) if use_features else title
+            features[title] = feature
 
+        candidates = index.candidates(feature) if index else None
         placed = False
-        for i, rep in enumerate(representatives):
-            # 使用改進的 title_similarity 函數比對原始標題
-            if title_similarity(title, rep) >= similarity_threshold:
-                clusters[i].append(signal)
-                # 更新代表標題為較長的標題
-                if len(title) > len(rep):
-                    representatives[i] = title
+        for i in range(len(representatives)) if candidates is None else candidates:
+            rep = representatives[i]
+            if title_similarity_at_least(feature, rep, similarity_threshold):
+                clusters[i].append(idx)
+                # 更新代表標題為較長的標題（沿用已算好的特徵）
+                if len(title) > len(_feature_text(rep)):
+                    representatives[i] = feature
+                    if index:
+                        index.add(i, feature)
                 placed = True
                 break
 
         if not placed:
-            clusters.append([signal])
-            representatives.append(title)
+            clusters.append([idx])
+            representatives.append(feature)
+            if index:
+                index.add(len(representatives) - 1, feature)
+    return clusters
+
+
+def detect_events(signals: List[Signal], score_threshold: float, similarity_threshold: float) -> List[Event]:
+    if not signals:
+        return []
+
+    clusters = [
+        [signals[i] for i in cluster] for cluster in cluster_titles([s.title for s in signals], similarity_threshold)
+    ]
 
     events: List[Event] = []
 
@@ -1002,6 +2214,65 @@ def detect_events(signals: List[Signal], score_threshold: float, similarity_thre
     return events
 
 
+class _ClusterIndex:
+    """
+    detect_events 的候選群索引（倒排索引：詞／數字 → 群編號）
+
+    title_similarity 只在以下情況可能達到 0.25 以上：
+    - 正規化後完全相同（1.0）或互相包含（0.85）
+    - 有共同詞或共同數字（_feature_similarity 沒有共同詞時，
+      Jaccard、餘弦與兩種加分皆為 0，只剩 LCS 0.25 + 數字 0.10）
+    因此門檻 > 0.25 時，只比對符合上述條件的群即可得到與逐一比對相同的結果。
+    包含關係以字元 bigram 查詢：代表標題被包含 → 其開頭 bigram 出現在新標題中；
+    新標題被包含 → 代表標題含有新標題全部的 bigram。
+    代表標題更新時只追加索引，舊標題留下的候選會在實際比對時被排除。
+    """
+
+    def __init__(self, similarity_threshold: float):
+        self.containment = similarity_threshold <= 0.85
+        self.postings: Dict[Union[int, str], Set[int]] = {}
+        self.exact: Dict[str, Set[int]] = {}
+        self.prefixes: Dict[str, Set[int]] = {}
+        self.bigrams: Dict[str, Set[int]] = {}
+        self.short: Set[int] = set()
+
+    def add(self, cluster: int, feature: TitleFeatures):
+        for key in itertools.chain(feature.ids, feature.numbers):
+            self.postings.setdefault(key, set()).add(cluster)
+        norm = _similarity_text(feature.text)
+        self.exact.setdefault(norm, set()).add(cluster)
+        if not self.containment:
+            return
+        if len(norm) < 2:
+            self.short.add(cluster)
+            return
+        self.prefixes.setdefault(norm[:2], set()).add(cluster)
+        for gram in _char_bigrams(norm):
+            self.bigrams.setdefault(gram, set()).add(cluster)
+
+    def candidates(self, feature: TitleFeatures) -> Optional[List[int]]:
+        """依群編號排序的候選；None 表示需要逐一比對"""
+        norm = _similarity_text(feature.text)
+        if self.containment and len(norm) < 2:
+            return None
+        found = set(self.exact.get(norm, ()))
+        for key in itertools.chain(feature.ids, feature.numbers):
+            found.update(self.postings.get(key, ()))
+        if self.containment:
+            grams = _char_bigrams(norm)
+            found.update(self.short)
+            for gram in grams:
+                found.update(self.prefixes.get(gram, ()))
+            postings = sorted((self.bigrams.get(gram, set()) for gram in grams), key=len)
+            containing = set(postings[0])
+            for posting in postings[1:]:
+                if not containing:
+                    break
+                containing &= posting
+            found |= containing
+        return sorted(found)
+
+
 def score_cluster(cluster: List[Signal]) -> (float, List[str]):
     reasons = []
     per_source_max: Dict[str, int] = {}
@@ -1029,8 +2300,6 @@ def select_canonical_title(cluster: List[Signal]) -> str:
     return sorted_titles[0]
 
 
-from typing import Union
-
 def title_similarity(a: Union[str, TitleFeatures], b: Union[str, TitleFeatures]) -> float:
     """
     改進的標題相似度演算法
@@ -1043,8 +2312,8 @@ def title_similarity(a: Union[str, TitleFeatures], b: Union[str, TitleFeatures])
     t1_text = a.text if isinstance(a, TitleFeatures) else a
     t2_text = b.text if isinstance(b, TitleFeatures) else b
     
-    t1_norm = ' '.join(t1_text.lower().split())
-    t2_norm = ' '.join(t2_text.lower().split())
+    t1_norm = _similarity_text(t1_text)
+    t2_norm = _similarity_text(t2_text)
 
     # 完全相同
     if t1_norm == t2_norm:
@@ -1054,16 +2323,73 @@ def title_similarity(a: Union[str, TitleFeatures], b: Union[str, TitleFeatures])
     if t1_norm in t2_norm or t2_norm in t1_norm:
         return 0.85
 
-    # 如果 jieba 可用，使用改進算法
-    if JIEBA_AVAILABLE:
+    # 分詞方式可用時（jieba 或 ngram 模式），使用改進算法
+    if title_features_available():
         # 如果輸入已經是 Features，直接使用高效能版
         if isinstance(a, TitleFeatures) and isinstance(b, TitleFeatures):
             return _feature_similarity(a, b)
-        # 否則回退到字串版（會內部計算 Features）
-        return _improved_similarity(t1_text, t2_text)
+        # 否則取快取的 Features（同一標題只分詞一次）
+        f1 = a if isinstance(a, TitleFeatures) else cached_title_features(t1_text)
+        f2 = b if isinstance(b, TitleFeatures) else cached_title_features(t2_text)
+        return _feature_similarity(f1, f2)
 
     # 否則使用原始算法
-    return SequenceMatcher(None, t1_text, t2_text).ratio()
+    return _sequence_ratio(t1_text, t2_text)
+
+
+def title_similarity_at_least(a: Union[str, TitleFeatures], b: Union[str, TitleFeatures], threshold: float) -> bool:
+    """
+    等同 title_similarity(a, b) >= threshold，但分數區間已決定結果時略過最耗時的序列相似度計算
+    （分群、去重等只需要判斷是否達門檻的場合使用）
+    """
+    return title_similarity_bounds(a, b, (threshold,))[0] >= threshold
+
+
+def title_similarity_bounds(
+    a: Union[str, TitleFeatures], b: Union[str, TitleFeatures], thresholds: Sequence[float] = ()
+) -> Tuple[float, float]:
+    """
+    title_similarity(a, b) 的分數區間 (low, high)：只有某個門檻落在區間內（low < t <= high）時
+    才計算序列相似度，並回傳確切分數 (score, score)。同一組標題要和多個門檻比較時只需呼叫一次，
+    之後 low >= t 即等同 title_similarity(a, b) >= t
+    """
+    if not a or not b:
+        return 0.0, 0.0
+
+    t1_text = a.text if isinstance(a, TitleFeatures) else a
+    t2_text = b.text if isinstance(b, TitleFeatures) else b
+    t1_norm = _similarity_text(t1_text)
+    t2_norm = _similarity_text(t2_text)
+
+    if t1_norm == t2_norm:
+        return 1.0, 1.0
+    if t1_norm in t2_norm or t2_norm in t1_norm:
+        return 0.85, 0.85
+
+    if title_features_available():
+        f1 = a if isinstance(a, TitleFeatures) else cached_title_features(t1_text)
+        f2 = b if isinstance(b, TitleFeatures) else cached_title_features(t2_text)
+        return _feature_similarity_bounds(f1, f2, thresholds)
+
+    total_len = len(t1_text) + len(t2_text)
+    high = 2.0 * min(len(t1_text), len(t2_text)) / total_len if total_len else 1.0
+    if any(t <= high for t in thresholds):
+        score = _sequence_ratio(t1_text, t2_text)
+        return score, score
+    return 0.0, high
+
+
+def _similarity_text(text: str) -> str:
+    """title_similarity 判斷相同／包含時使用的正規化文字"""
+    return ' '.join(text.lower().split())
+
+
+def _char_bigrams(text: str) -> Set[str]:
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+def _feature_text(value: Union[str, TitleFeatures]) -> str:
+    return value.text if isinstance(value, TitleFeatures) else value
 
 
 from functools import lru_cache
@@ -1074,22 +2400,174 @@ def get_jieba_tokens(text: str) -> tuple:
     return tuple(jieba.cut(text.lower()))
 
 
-@dataclass
+_NGRAM_RUN_RE = re.compile(r"[0-9a-z]+|[\u3040-\u30ff\u3400-\u9fff\uf900-\ufaff]+")
+
+
+def get_ngram_tokens(text: str) -> tuple:
+    """不需詞典的分詞：英數字取整段，中文（含日文假名）連續字取所有 2-gram 與 3-gram，單一字保留原字"""
+    tokens: List[str] = []
+    for run in _NGRAM_RUN_RE.findall(text.lower()):
+        if len(run) == 1 or run.isascii():
+            tokens.append(run)
+            continue
+        tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+        tokens.extend(run[i : i + 3] for i in range(len(run) - 2))
+    return tuple(tokens)
+
+
+TOKENIZERS: Dict[str, Callable[[str], tuple]] = {
+    "jieba": get_jieba_tokens,
+    "ngram": get_ngram_tokens,
+}
+
+# compute_title_features 使用的分詞方式（config: tokenizer.mode）
+_tokenizer_mode = "jieba"
+_tokenize = get_jieba_tokens
+
+
+def set_tokenizer_mode(mode: str):
+    """切換標題特徵的分詞方式：jieba（詞典分詞）或 ngram（字元 n-gram，不必載入詞典）"""
+    global _tokenizer_mode, _tokenize
+    if mode not in TOKENIZERS:
+        raise ValueError(f"unknown tokenizer mode: {mode!r} (expected one of {sorted(TOKENIZERS)})")
+    if mode != _tokenizer_mode:
+        TITLE_FEATURE_CACHE.clear()  # 兩種模式的特徵不能混用
+    _tokenizer_mode, _tokenize = mode, TOKENIZERS[mode]
+
+
+def title_features_available() -> bool:
+    """目前的分詞方式能否計算 TitleFeatures（ngram 模式不需要 jieba）；否則比對退回序列相似度"""
+    return JIEBA_AVAILABLE or _tokenizer_mode == "ngram"
+
+
+# 分詞器（jieba 前綴詞典）載入完成後設定；健康檢查以此判斷是否可以接流量
+TOKENIZER_READY = threading.Event()
+
+
+def warm_up_tokenizer(cache_dir: str = "") -> float:
+    """
+    在行程啟動時載入 jieba 前綴詞典，避免第一次 jieba.cut 時才花數秒建詞典
+
+    cache_dir 為 jieba.cache 所在目錄（預設是系統暫存目錄，部署或重啟後常被清空）；
+    部署時先執行一次即可把建好的詞典留在 cache_dir，之後啟動直接載入。回傳耗時秒數。
+    """
+    start = time.perf_counter()
+    if JIEBA_AVAILABLE and _tokenizer_mode == "jieba":
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            jieba.dt.tmp_dir = cache_dir
+        jieba.initialize()
+        jieba.lcut("台積電股價創新高")  # 一併載入 HMM 新詞模型
+    elapsed = time.perf_counter() - start
+    TOKENIZER_READY.set()
+    LOGGER.info("tokenizer ready in %.2fs (mode=%s, jieba=%s)", elapsed, _tokenizer_mode, JIEBA_AVAILABLE)
+    return elapsed
+
+
+_FTS_WORD_RE = re.compile(r"[^\W_]")
+_FTS_FALLBACK_RE = re.compile(r"[0-9a-z]+|[^\W_]")
+_CJK_RUN_RE = re.compile(r"[\u3400-\u9fff\uf900-\ufaff]{2,}")
+
+
+def _fts_words(text: str) -> List[str]:
+    if _tokenizer_mode == "ngram":
+        return list(get_ngram_tokens(text))
+    if JIEBA_AVAILABLE:
+        return [t for t in (tok.strip() for tok in get_jieba_tokens(text)) if _FTS_WORD_RE.search(t)]
+    return _FTS_FALLBACK_RE.findall(text.lower())
+
+
+def _cjk_bigrams(text: str) -> List[str]:
+    return [run[i : i + 2] for run in _CJK_RUN_RE.findall(text) for i in range(len(run) - 1)]
+
+
+def fts_tokens(text: Optional[str]) -> str:
+    """
+    Space-joined search tokens for the FTS5 indexes: jieba words (character
+    n-grams in ngram mode, ASCII words and single characters without jieba)
+    followed by the title's CJK bigrams.
+    jieba splits the same word differently depending on context (台積電 vs
+    台積/電股), so the bigrams let fts_query still find it.
+    """
+    if not text:
+        return ""
+    return " ".join(_fts_words(text) + _cjk_bigrams(text))
+
+
+def fts_query(text: str, any_token: bool = False) -> str:
+    """
+    Build an FTS5 MATCH expression from free text. Each query word matches either
+    as a whole indexed word or as all of its CJK bigrams.
+    """
+
+    def quote(token: str) -> str:
+        return '"' + token.replace('"', '""') + '"'
+
+    terms: List[str] = []
+    for word in _fts_words(text or ""):
+        bigrams = _cjk_bigrams(word)
+        if len(bigrams) > 1:
+            term = f"({quote(word)} OR ({' AND '.join(quote(b) for b in bigrams)}))"
+        else:
+            term = quote(word)
+        if term not in terms:
+            terms.append(term)
+    return (" OR " if any_token else " AND ").join(terms)
+
+
+def token_id(token: str) -> int:
+    """
+    詞的穩定 id：blake2b 前 8 bytes，最低位元改為「長度 >= 2」旗標（共同實體判斷用）
+
+    id 由詞本身決定，不需要隨新詞增長的行程內詞彙表，存檔後在其他行程仍然有效；
+    63 位元雜湊的碰撞機率可忽略。
+    """
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    return (int.from_bytes(digest, "big") & ~1) | (len(token) >= 2)
+
+
+_NO_NUMBERS: frozenset = frozenset()
+
+
 class TitleFeatures:
-    """標題特徵類別（用於快取分詞結果與統計量）"""
-    text: str
-    tokens: List[str]
-    token_set: Set[str]
-    token_counter: Counter
-    clean_text: str
-    numbers: Set[str]
-    vec_magnitude: float
+    """
+    標題特徵類別（用於快取分詞結果與統計量）
 
-def compute_title_features(text: str) -> TitleFeatures:
-    """計算標題特徵（一次性計算，避免重複運算）"""
-    # 分詞
+    詞以 token_id 儲存：ids 為遞增排序的 id、counts 為對應的出現次數，
+    兩兩比對時以集合交集找共同詞。tokens / token_set / token_counter 為相容用的唯讀屬性
+    （由 text 重新分詞，使用目前的分詞方式）。
+    """
+
+    __slots__ = ("text", "ids", "counts", "clean_text", "numbers", "vec_magnitude")
+
+    def __init__(self, text: str, ids: array, counts: array, clean_text: str, numbers: frozenset, vec_magnitude: float):
+        self.text = text
+        self.ids = ids
+        self.counts = counts
+        self.clean_text = clean_text
+        self.numbers = numbers
+        self.vec_magnitude = vec_magnitude
+
+    def __repr__(self) -> str:
+        return f"TitleFeatures({self.text!r})"
+
+    @property
+    def tokens(self) -> List[str]:
+        return _title_tokens(self.text)
+
+    @property
+    def token_set(self) -> Set[str]:
+        return set(_title_tokens(self.text))
+
+    @property
+    def token_counter(self) -> Counter:
+        return Counter(_title_tokens(self.text))
+
+
+def _title_tokens(text: str) -> List[str]:
+    """分詞後去掉停用詞與標點"""
     import re
-    tokens = list(get_jieba_tokens(text))
+    tokens = list(_tokenize(text))
 
     # 過濾停用詞和標點
     stopwords = {
@@ -1099,88 +2577,322 @@ def compute_title_features(text: str) -> TitleFeatures:
         '！', '？', '，', '。', '：', '；', '、', '「', '」', '『', '』', '（', '）',
         '【', '】', '《', '》', '〈', '〉', '．', '・', '…', '—', '～', '｜', '/', '|',
     }
-    filtered_tokens = [t.strip() for t in tokens if t.strip() and t not in stopwords and not re.match(r'^[^\w]+$', t)]
-    
-    # 計算集合與計數
-    token_set = set(filtered_tokens)
-    token_counter = Counter(filtered_tokens)
-    
+    return [t.strip() for t in tokens if t.strip() and t not in stopwords and not re.match(r'^[^\w]+$', t)]
+
+
+def compute_title_features(text: str) -> TitleFeatures:
+    """計算標題特徵（一次性計算，避免重複運算）"""
+    # 分詞並轉成詞 id 與計數（依 id 排序）
+    token_counter = Counter(token_id(t) for t in _title_tokens(text))
+    ids = sorted(token_counter)
+
     # 計算向量長度
     vec_magnitude = math.sqrt(sum(v ** 2 for v in token_counter.values()))
-    
+
     # 清理後的文字（用於 LCS）
     clean_text = re.sub(r'\s+', '', text)
-    
+
     # 提取數字
-    numbers = set(re.findall(r'\d+', text))
-    
+    numbers = frozenset(re.findall(r'\d+', text)) or _NO_NUMBERS
+
     return TitleFeatures(
         text=text,
-        tokens=filtered_tokens,
-        token_set=token_set,
-        token_counter=token_counter,
+        ids=array("Q", ids),
+        counts=array("H", [token_counter[i] for i in ids]),
         clean_text=clean_text,
         numbers=numbers,
-        vec_magnitude=vec_magnitude
+        vec_magnitude=vec_magnitude,
     )
 
-def _feature_similarity(f1: TitleFeatures, f2: TitleFeatures) -> float:
-    """使用預計算特徵的相似度演算法（高效能版）"""
-    if not f1.tokens or not f2.tokens:
-        return 0.0
+class TitleFeatureCache:
+    """
+    標題特徵的 LRU 快取（以標題 blake2b 雜湊為鍵），依估計的記憶體用量限制大小
+
+    多數標題會在首頁停留數小時，每次比對只需為新標題分詞。
+    save / load 以 gzip JSON lines 保存詞 id 與計數（token_id 跨行程不變），重啟後不必重新分詞。
+    """
+
+    # 每筆的固定開銷：OrderedDict 節點、(features, size) tuple 與 size 整數、16 bytes 雜湊鍵
+    ENTRY_OVERHEAD = 200
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    @classmethod
+    def _size(cls, features: TitleFeatures) -> int:
+        size = (
+            cls.ENTRY_OVERHEAD
+            + sys.getsizeof(features)
+            + sys.getsizeof(features.text)
+            + sys.getsizeof(features.clean_text)
+            + sys.getsizeof(features.ids)
+            + sys.getsizeof(features.counts)
+            + sys.getsizeof(features.vec_magnitude)
+        )
+        if features.numbers:
+            size += sys.getsizeof(features.numbers) + sum(sys.getsizeof(n) for n in features.numbers)
+        return size
+
+    def get(self, text: str) -> TitleFeatures:
+        key = self._key(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0].text == text:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        features = compute_title_features(text)
+        self._put(key, features)
+        with self._lock:
+            self.misses += 1
+        return features
+
+    def _put(self, key: bytes, features: TitleFeatures) -> None:
+        size = self._size(features)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (features, size)
+            self.bytes += size
+            self.dirty = True
+        self.resize(self.max_bytes)
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self.bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict:
+        return {"entries": len(self._entries), "bytes": self.bytes, "hits": self.hits, "misses": self.misses}
+
+    def save(self, path: str) -> int:
+        """寫出目前的快取（由舊到新），先寫暫存檔再 rename；回傳筆數"""
+        with self._lock:
+            entries = [features for features, _ in self._entries.values()]
+            self.dirty = False
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            # 檔頭記錄分詞方式，切換 tokenizer.mode 後不會載入另一種模式的特徵
+            f.write(json.dumps({"tokenizer": _tokenizer_mode}) + "\n")
+            for features in entries:
+                record = {
+                    "text": features.text,
+                    "ids": [[i, n] for i, n in zip(features.ids, features.counts)],
+                    "numbers": sorted(features.numbers),
+                }
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, path)
+        return len(entries)
+
+    def load(self, path: str) -> int:
+        """
+        載入 save() 寫出的檔案；檔案不存在或分詞方式不同時回傳 0，超出記憶體上限的舊項目會被淘汰
+        """
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if "tokenizer" in record:
+                    if record["tokenizer"] != _tokenizer_mode:
+                        return 0
+                    continue
+                if "ids" in record:
+                    counts = dict(record["ids"])
+                else:  # 舊版檔案保存的是詞
+                    counts = {token_id(token): n for token, n in record["tokens"]}
+                ids = sorted(counts)
+                features = TitleFeatures(
+                    text=record["text"],
+                    ids=array("Q", ids),
+                    counts=array("H", [counts[i] for i in ids]),
+                    clean_text=re.sub(r"\s+", "", record["text"]),
+                    numbers=frozenset(record["numbers"]) or _NO_NUMBERS,
+                    vec_magnitude=math.sqrt(sum(v ** 2 for v in counts.values())),
+                )
+                self._put(self._key(features.text), features)
+                count += 1
+        self.dirty = False
+        return count
+
+
+# 行程共用的特徵快取；MonitorApp 與儀表板依設定調整上限並載入 / 保存
+TITLE_FEATURE_CACHE = TitleFeatureCache()
+
+
+def cached_title_features(text: str) -> TitleFeatures:
+    """compute_title_features 的快取版本"""
+    return TITLE_FEATURE_CACHE.get(text)
+
+
+def configure_feature_cache(similarity_cfg: Dict) -> str:
+    """依 similarity 設定調整特徵快取上限並載入磁碟檔；回傳保存路徑（空字串表示不保存）"""
+    TITLE_FEATURE_CACHE.resize(int(float(similarity_cfg.get("feature_cache_mb", 32)) * 1024 * 1024))
+    path = similarity_cfg.get("feature_cache_path", "")
+    if path and title_features_available() and not len(TITLE_FEATURE_CACHE):
+        try:
+            TITLE_FEATURE_CACHE.load(path)
+        except (OSError, EOFError, ValueError, KeyError, TypeError) as e:
+            LOGGER.warning("could not load title feature cache %s: %s", path, e)
+    return path
+
+
+def save_feature_cache(path: str) -> None:
+    """有新項目時才寫回磁碟"""
+    if not path or not TITLE_FEATURE_CACHE.dirty:
+        return
+    try:
+        TITLE_FEATURE_CACHE.save(path)
+    except OSError as e:
+        LOGGER.warning("could not save title feature cache %s: %s", path, e)
+
+
+def _similarity_parts(f1: TitleFeatures, f2: TitleFeatures) -> tuple:
+    """_feature_similarity 中 LCS 以外的各項（以集合交集找共同詞 id，成本低）"""
+    ids1, ids2 = f1.ids, f2.ids
+    n1, n2 = len(ids1), len(ids2)
+    common = set(ids1).intersection(ids2)
+    inter_len = len(common)
+    dot_product = common_long = 0
+    # 共同詞通常只有幾個，計數以二分搜尋在排序的 id 陣列中取得
+    for token in common:
+        dot_product += f1.counts[bisect_left(ids1, token)] * f2.counts[bisect_left(ids2, token)]
+        common_long += token & 1
 
     # 計算 Jaccard 相似度
-    inter_len = len(f1.token_set & f2.token_set)
-    union_len = len(f1.token_set | f2.token_set)
+    union_len = n1 + n2 - inter_len
     jaccard = inter_len / union_len if union_len else 0.0
 
-    # 計算餘弦相似度
-    # 只需計算 dot product，分母 Magnitude 已經預計算
-    all_tokens = set(f1.token_counter.keys()) | set(f2.token_counter.keys())
-    dot_product = sum(f1.token_counter.get(t, 0) * f2.token_counter.get(t, 0) for t in all_tokens)
+    # 計算餘弦相似度（分母 Magnitude 已經預計算）
     cosine = dot_product / (f1.vec_magnitude * f2.vec_magnitude) if f1.vec_magnitude and f2.vec_magnitude else 0.0
 
-    # 計算最長公共子字串比例 (使用 SequenceMatcher 優化效能)
-    # SequenceMatcher handles empty strings gracefully
-    lcs_ratio = SequenceMatcher(None, f1.clean_text, f2.clean_text).ratio()
-
     # 數字匹配
     if f1.numbers and f2.numbers:
         number_match = len(f1.numbers & f2.numbers) / len(f1.numbers | f2.numbers)
     else:
         number_match = 0.0
 
-    # 加權組合
-    combined_similarity = (
+    # 檢查共同實體（長度 >= 2 的詞）
+    has_entity = common_long >= 2
+
+    # 數字匹配且有共同詞時額外加分
+    number_bonus = bool(f1.numbers and f2.numbers and number_match >= 0.5 and inter_len >= 1)
+    return jaccard, cosine, number_match, inter_len, has_entity, number_bonus
+
+
+def _weighted_similarity(parts: tuple, lcs_ratio: float) -> float:
+    """加權組合（加分前）"""
+    jaccard, cosine, number_match = parts[:3]
+    return (
         jaccard * 0.35 +
         cosine * 0.30 +
         lcs_ratio * 0.25 +
         number_match * 0.10
     )
 
-    # 檢查共同實體（長度 >= 2 的詞）
-    long_tokens1 = {t for t in f1.token_set if len(t) >= 2}
-    long_tokens2 = {t for t in f2.token_set if len(t) >= 2}
-    common_tokens = long_tokens1 & long_tokens2
-    has_entity = len(common_tokens) >= 2
+
+def _combine_similarity(parts: tuple, lcs_ratio: float) -> float:
+    return _apply_boosts(parts, _weighted_similarity(parts, lcs_ratio))
+
+
+def _apply_boosts(parts: tuple, combined_similarity: float) -> float:
+    _, _, _, inter_len, has_entity, number_bonus = parts
 
     # 如果有共同實體，提升相似度
     if has_entity and 0.15 <= combined_similarity < 0.7:
-        common_keywords_count = len(f1.token_set & f2.token_set)
-        if common_keywords_count >= 3:
+        if inter_len >= 3:
             boost = 0.30
-        elif common_keywords_count >= 2:
+        elif inter_len >= 2:
             boost = 0.25
         else:
             boost = 0.20
         combined_similarity = min(combined_similarity + boost, 0.85)
 
     # 如果數字匹配且有共同詞，額外加分
-    if f1.numbers and f2.numbers and number_match >= 0.5 and len(f1.token_set & f2.token_set) >= 1:
+    if number_bonus:
         combined_similarity = min(combined_similarity + 0.15, 0.9)
 
     return combined_similarity
 
+
+# 序列相似度引擎（sequence_ratio.MODES）；預設與 difflib.SequenceMatcher.ratio() 相同
+_sequence_ratio = sequence_ratio.ratcliff_obershelp_ratio
+
+
+def set_sequence_ratio_mode(mode: str):
+    """切換 title_similarity 的 LCS 項：compat（與 SequenceMatcher 相同）或 lcs（位元平行 LCS）"""
+    global _sequence_ratio
+    _sequence_ratio = sequence_ratio.get_ratio(mode)
+
+
+def _lcs_ratio(f1: TitleFeatures, f2: TitleFeatures) -> float:
+    # 計算最長公共子字串比例（預設為 Ratcliff/Obershelp，與 SequenceMatcher 相同）
+    return _sequence_ratio(f1.clean_text, f2.clean_text)
+
+
+def _feature_similarity(f1: TitleFeatures, f2: TitleFeatures) -> float:
+    """使用預計算特徵的相似度演算法（高效能版）"""
+    if not f1.ids or not f2.ids:
+        return 0.0
+    return _combine_similarity(_similarity_parts(f1, f2), _lcs_ratio(f1, f2))
+
+
+# 共同實體加分只在 combined < 0.7 時生效；0.7 左側最接近的浮點數是加分後的最大值
+_BELOW_ENTITY_CAP = math.nextafter(0.7, 0.0)
+
+
+def _feature_similarity_bounds(f1: TitleFeatures, f2: TitleFeatures, thresholds: Sequence[float] = ()) -> Tuple[float, float]:
+    """
+    _feature_similarity(f1, f2) 的分數區間：先以 LCS 的範圍估算，
+    只有某個門檻落在區間內時才計算序列相似度並回傳確切分數
+
+    LCS 比例介於 0 與 2·min(len) / (len1 + len2)（兩種 sequence_ratio 模式皆然）之間。
+    加分規則在 combined = 0.15 與 0.7 處不連續，但在每一段內隨 combined 遞增，
+    因此區間的最小值在下界或 0.7，最大值在上界或 0.7 左側；
+    浮點運算對單調的加法與 min 保序，判斷結果與完整計算完全相同。
+    """
+    if not f1.ids or not f2.ids:
+        return 0.0, 0.0
+    parts = _similarity_parts(f1, f2)
+    total_len = len(f1.clean_text) + len(f2.clean_text)
+    lcs_upper = 2.0 * min(len(f1.clean_text), len(f2.clean_text)) / total_len if total_len else 1.0
+
+    low_c = _weighted_similarity(parts, 0.0)
+    high_c = _weighted_similarity(parts, lcs_upper)
+    low = _apply_boosts(parts, low_c)
+    high = _apply_boosts(parts, high_c)
+    if low_c < 0.7 <= high_c:
+        low = min(low, _apply_boosts(parts, 0.7))
+        high = max(high, _apply_boosts(parts, _BELOW_ENTITY_CAP))
+    if any(low < t <= high for t in thresholds):
+        score = _combine_similarity(parts, _lcs_ratio(f1, f2))
+        return score, score
+    return low, high
+
+
 def _improved_similarity(title1: str, title2: str) -> float:
     """相容舊版接口的包裝函數"""
     f1 = compute_title_features(title1)
@@ -1192,18 +2904,30 @@ def now_iso() -> str:
     return dt.datetime.now(dt.timezone.utc).isoformat()
 
 
+# `\w` is exactly str.isalnum() plus "_", so this keeps what the old per-character
+# isalnum()/CJK-range loop kept (CJK ideographs are alphanumeric).
+_NON_ALNUM_RE = re.compile(r"[\W_]+")
+_NON_ALNUM_KEEP_NEWLINE_RE = re.compile(r"[^\w\n]+")
+
+
 def compact_space(text: str) -> str:
     return " ".join(text.split())
 
 
 def normalize_title(text: str) -> str:
-    keep = []
-    for ch in compact_space(text).lower():
-        if ch.isalnum():
-            keep.append(ch)
-        elif "\u4e00" <= ch <= "\u9fff":  # CJK unified ideographs
-            keep.append(ch)
-    return "".join(keep)
+    # Whitespace is dropped anyway, so compact_space() is not needed first.
+    return _NON_ALNUM_RE.sub("", text.lower())
+
+
+def normalize_titles(titles: Iterable[str]) -> List[str]:
+    """normalize_title over many titles with a single lower() and regex pass."""
+    titles = list(titles)
+    if not titles:
+        return []
+    joined = "\n".join(titles)
+    if joined.count("\n") != len(titles) - 1:
+        return [normalize_title(t) for t in titles]
+    return _NON_ALNUM_KEEP_NEWLINE_RE.sub("", joined.lower()).replace("_", "").split("\n")
 
 
 def is_reasonable_title(text: str) -> bool:
@@ -1271,9 +2995,75 @@ def build_parser() -> argparse.ArgumentParser:
     list_events = sub.add_parser("list-events", help="list recent events")
     list_events.add_argument("--limit", type=int, default=20)
 
+    search = sub.add_parser("search", help="full-text search over article (or event) titles")
+    search.add_argument("query")
+    search.add_argument("--events", action="store_true", help="search event titles instead of articles")
+    search.add_argument("--today", action="store_true", help="only items seen today (UTC)")
+    search.add_argument("--since", default="", help="only items seen since this ISO date/time")
+    search.add_argument("--any", action="store_true", help="match any word instead of all")
+    search.add_argument("--limit", type=int, default=20)
+
+    retention = sub.add_parser("retention", help="archive, roll up and delete old signals, then vacuum")
+    retention.add_argument("--keep-days", type=int, default=None, help="override retention.keep_days")
+
+    export = sub.add_parser("export", help="export signals/events to day-partitioned Parquet (needs pyarrow)")
+    export.add_argument("--out", default="./analytics", help="output directory")
+    export.add_argument("--since", default="", help="only days on or after YYYY-MM-DD")
+    export.add_argument(
+        "--tables", nargs="+", default=["signals", "events", "event_articles"], help="tables to export"
+    )
+    export.add_argument("--skip-archive", action="store_true", help="ignore retention archive files")
+
+    recluster = sub.add_parser("recluster", help="regroup recent article titles with the same index as detect_events")
+    recluster.add_argument("--hours", type=float, default=24, help="articles seen in the last N hours")
+    recluster.add_argument("--threshold", type=float, default=None, help="override cluster_similarity")
+    recluster.add_argument("--min-sources", type=int, default=2, help="only show clusters from this many sources")
+    recluster.add_argument("--limit", type=int, default=20)
+
     return parser
 
 
+def run_read_command(args: argparse.Namespace, cfg: Dict, repo: Repository) -> int:
+    """`search`, `recluster` and `list-events`: they only read from `repo`."""
+    if args.command == "search":
+        since = dt.datetime.now(dt.timezone.utc).date().isoformat() if args.today else args.since
+        if args.events:
+            for r in repo.search_events(args.query, limit=args.limit, since=since, any_token=args.any):
+                print(f"{r['last_seen']} | score={r['score']:.1f} | sources={r['source_count']} | {r['canonical_title']}")
+        else:
+            for r in repo.search_articles(args.query, limit=args.limit, since=since, any_token=args.any):
+                print(f"{r['last_seen']} | {r['source_name']} | {r['title']} | {r['url']}")
+        return 0
+
+    if args.command == "recluster":
+        import near_duplicates
+
+        since = (dt.datetime.now(dt.timezone.utc) - dt.timedelta(hours=args.hours)).isoformat()
+        rows = repo.articles_seen_since(since)
+        threshold = args.threshold if args.threshold is not None else float(cfg["cluster_similarity"])
+        clusters = near_duplicates.recluster([r["title"] for r in rows], threshold)
+        groups = [[rows[i] for i in c] for c in clusters]
+        groups = [g for g in groups if len({r["source_id"] for r in g}) >= args.min_sources]
+        groups.sort(key=lambda g: (len({r["source_id"] for r in g}), len(g)), reverse=True)
+        print(f"{len(rows)} articles -> {len(clusters)} clusters, {len(groups)} with >= {args.min_sources} sources")
+        for g in groups[: args.limit]:
+            sources = sorted({r["source_name"] for r in g})
+            print(f"sources={len(sources)} | articles={len(g)} | {max((r['title'] for r in g), key=len)}")
+            print(f"    {', '.join(sources)}")
+        return 0
+
+    if args.command == "list-events":
+        rows = repo.list_recent_events(limit=args.limit)
+        for r in rows:
+            print(
+                f"{r['last_seen']} | score={r['score']:.1f} | sources={r['source_count']} | "
+                f"signals={r['signal_count']} | {r['canonical_title']}"
+            )
+        return 0
+
+    return 1
+
+
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
@@ -1284,32 +3074,81 @@ def main() -> int:
     )
 
     cfg = load_config(args.config)
+
+    # Export reads its own read-only connection; it needs none of the app's setup.
+    if args.command == "export":
+        import analytics_export
+
+        ret_cfg = cfg.get("retention", {})
+        result = analytics_export.export(
+            cfg["database_path"],
+            args.out,
+            tables=args.tables,
+            since=args.since,
+            archive_dir="" if args.skip_archive else ret_cfg.get("archive_dir", ""),
+        )
+        summary = {table: sum(days.values()) for table, days in result.items()}
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return 0
+
+    # Read-only commands open the database with mode=ro: no writer thread, crawler or
+    # schema setup, and no waiting on a running loop's write lock.
+    if args.command in ("search", "recluster", "list-events"):
+        configure_similarity(cfg)
+        if not os.path.exists(cfg["database_path"]):
+            LOGGER.error("database not found: %s", cfg["database_path"])
+            return 1
+        repo = Repository(cfg["database_path"], read_only=True)
+        try:
+            return run_read_command(args, cfg, repo)
+        finally:
+            repo.close()
+
     app = MonitorApp(cfg)
 
     if args.command == "run-once":
-        result = app.run_once(publish=args.publish)
+        try:
+            result = app.run_once(publish=args.publish)
+        finally:
+            app.close()
         print(json.dumps(result, ensure_ascii=False, indent=2))
         return 0
 
     if args.command == "loop":
         interval = int(cfg.get("interval_seconds", 180))
         LOGGER.info("loop mode started, interval=%ss", interval)
+        warm_up_tokenizer(cfg.get("tokenizer", {}).get("dictionary_cache_dir", ""))
+        if cfg.get("mobile_push", {}).get("enabled", False):
+            app.push_monitor.start()
+        ret_cfg = cfg.get("retention", {})
+        retention_every = float(ret_cfg.get("interval_hours", 24)) * 3600
+        next_retention = time.monotonic()
         try:
             while True:
                 result = app.run_once(publish=args.publish)
                 LOGGER.info("cycle done: %s", result)
-                time.sleep(interval)
+                save_feature_cache(app.feature_cache_path)
+                if ret_cfg.get("enabled", False) and time.monotonic() >= next_retention:
+                    app.apply_retention()
+                    next_retention = time.monotonic() + retention_every
+                deadline = time.monotonic() + interval
+                # A push wakes the loop early for a detection pass without recrawling.
+                while app.push_monitor.wait(deadline - time.monotonic()):
+                    result = app.run_once(publish=args.publish, recrawl=False)
+                    LOGGER.info("push pass done: %s", result)
         except KeyboardInterrupt:
             LOGGER.info("stopped by user")
             return 0
+        finally:
+            # Queued writes are applied before exit; an interrupted cycle rolls back.
+            app.close()
 
-    if args.command == "list-events":
-        rows = app.repo.list_recent_events(limit=args.limit)
-        for r in rows:
-            print(
-                f"{r['last_seen']} | score={r['score']:.1f} | sources={r['source_count']} | "
-                f"signals={r['signal_count']} | {r['canonical_title']}"
-            )
+    if args.command == "retention":
+        try:
+            result = app.apply_retention(keep_days=args.keep_days)
+        finally:
+            app.close()
+        print(json.dumps(result, ensure_ascii=False, indent=2))
         return 0
 
     return 1
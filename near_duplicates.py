@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+大量標題的近似重複偵測 - MinHash 簽章 + LSH 分桶，作為 title_similarity 之前的候選產生器
+
+跨輪比對（match_titles）時，逐對計算 _feature_similarity 不可行。
+每個標題的特徵集合 = 正規化標題的字元 n-gram + jieba 詞；MinHash 簽章切成數個 band，
+任一 band 完全相同的標題落在同一個桶，只有同桶的配對才交給 title_similarity 完整評分。
+整天標題的重新分群（recluster）則使用 detect_events 的精確倒排索引：
+在實測資料上它比 LSH 更快，且分群結果與 detect_events 完全相同。
+
+- 兩個標題成為候選的機率約為 1 - (1 - J^rows)^bands（J 為特徵集合的 Jaccard）
+- 預設 128 個雜湊、64 個 band（每 band 2 列）：J = 0.2 時約 93%、J = 0.02 時約 2.5%
+- 有 numpy 時以向量化計算簽章，否則使用純 Python（結果相同）
+"""
+
+from __future__ import annotations
+
+import random
+import zlib
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from main import (
+    TitleFeatures,
+    cached_title_features,
+    cluster_titles,
+    normalize_title,
+    title_features_available,
+    title_similarity,
+)
+
+# 2^31 - 1：a * crc32 + b 在 uint64 內不會溢位
+_PRIME = (1 << 31) - 1
+
+Title = Union[str, TitleFeatures]
+
+
+def title_features(text: str) -> Title:
+    """與 detect_events 相同：分詞方式可用時使用 TitleFeatures，否則直接用字串"""
+    return cached_title_features(text) if title_features_available() else text
+
+
+def shingles(title: Title, ngram: int = 2) -> Set[str]:
+    """字元 n-gram（正規化標題）加上 jieba 詞（加前綴避免與 n-gram 相撞）"""
+    text = title.text if isinstance(title, TitleFeatures) else title
+    norm = normalize_title(text)
+    grams = {norm[i : i + ngram] for i in range(len(norm) - ngram + 1)} or ({norm} if norm else set())
+    if isinstance(title, TitleFeatures):
+        grams.update(f"w:{i}" for i in title.ids)
+    return grams
+
+
+class MinHashLSH:
+    """MinHash 簽章與 LSH 桶索引；key 可以是任何可雜湊的值（文章 id、群編號…）"""
+
+    def __init__(self, num_perm: int = 128, bands: int = 64, ngram: int = 2, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        rng = random.Random(seed)
+        self._a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+        if NUMPY_AVAILABLE:
+            self._a_np = np.array(self._a, dtype=np.uint64)[:, None]
+            self._b_np = np.array(self._b, dtype=np.uint64)[:, None]
+        self._buckets: List[Dict[Tuple[int, ...], List[Hashable]]] = [{} for _ in range(bands)]
+
+    def signature(self, title: Title) -> Optional[Tuple[int, ...]]:
+        """MinHash 簽章；標題正規化後為空則回傳 None（不會與任何標題成為候選）"""
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles(title, self.ngram)]
+        if not hashes:
+            return None
+        if NUMPY_AVAILABLE:
+            values = np.array(hashes, dtype=np.uint64)[None, :]
+            return tuple(((self._a_np * values + self._b_np) % _PRIME).min(axis=1).tolist())
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in zip(self._a, self._b))
+
+    def _band_keys(self, signature: Sequence[int]):
+        for band in range(self.bands):
+            yield band, tuple(signature[band * self.rows : (band + 1) * self.rows])
+
+    def insert(self, key: Hashable, signature: Optional[Tuple[int, ...]]):
+        if signature is None:
+            return
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def query(self, signature: Optional[Tuple[int, ...]]) -> Set[Hashable]:
+        """與簽章至少共用一個桶的 key"""
+        found: Set[Hashable] = set()
+        if signature is None:
+            return found
+        for band, band_key in self._band_keys(signature):
+            found.update(self._buckets[band].get(band_key, ()))
+        return found
+
+
+def recluster(titles: Sequence[str], similarity_threshold: float) -> List[List[int]]:
+    """
+    以 detect_events 的方式將大量標題分群（同一個精確倒排索引，結果與 detect_events 完全相同）
+
+    Returns:
+        每群的標題索引（依 titles 順序）
+    """
+    return cluster_titles(titles, similarity_threshold)
+
+
+def match_titles(
+    known: Iterable[Tuple[Hashable, str]],
+    titles: Sequence[str],
+    similarity_threshold: float,
+    lsh: Optional[MinHashLSH] = None,
+) -> List[List[Tuple[Hashable, float]]]:
+    """
+    跨輪比對：titles 中每個標題在 known（(key, 標題)）裡的近似重複
+
+    Returns:
+        與 titles 對齊的清單，每項為 [(key, 相似度)]，相似度由高到低
+    """
+    lsh = lsh or MinHashLSH()
+    known_features: Dict[Hashable, Title] = {}
+    for key, text in known:
+        feature = title_features(text)
+        known_features[key] = feature
+        lsh.insert(key, lsh.signature(feature))
+
+    results: List[List[Tuple[Hashable, float]]] = []
+    for text in titles:
+        feature = title_features(text)
+        scored = [(key, title_similarity(feature, known_features[key])) for key in lsh.query(lsh.signature(feature))]
+        results.append(sorted((m for m in scored if m[1] >= similarity_threshold), key=lambda m: m[1], reverse=True))
+    return results
@@ -6,10 +6,13 @@
 
 from __future__ import annotations
 
+import datetime as dt
 import json
 import os
+import sqlite3
+import threading
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from cache_manager import NewsCache
 
@@ -31,11 +34,18 @@ from flask_cors import CORS
 import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from main import (
+    Repository,
     RequestsCrawler,
     Signal,
+    TOKENIZER_READY,
     extract_signals,
     normalize_title,
     now_iso,
+    configure_feature_cache,
+    save_feature_cache,
+    set_sequence_ratio_mode,
+    set_tokenizer_mode,
+    warm_up_tokenizer,
 )
 from hybrid_similarity import HybridSimilarityChecker
 
@@ -75,6 +85,10 @@ class NewsDashboard:
     def __init__(self, config_path: str = "./config.yaml"):
         with open(config_path, 'r', encoding='utf-8') as f:
             self.config = yaml.safe_load(f)
+        set_sequence_ratio_mode(self.config.get('similarity', {}).get('sequence_ratio', 'compat'))
+        set_tokenizer_mode(self.config.get('tokenizer', {}).get('mode', 'jieba'))
+        # 標題特徵快取：跨請求保留（有上限），重啟時從磁碟載入，只有新標題需要分詞
+        self.feature_cache_path = configure_feature_cache(self.config.get('similarity', {}))
 
         self.crawler = RequestsCrawler()
         if not CLAUDE_API_KEY:
@@ -89,10 +103,36 @@ class NewsDashboard:
             timeout=10  # API 請求超時 10 秒（防止單次請求卡住）
         )
 
+        # 監控資料庫（第一次使用時才開啟）；儀表板只讀取，以唯讀模式（mode=ro）開啟：
+        # 不建立資料表、不回填索引，也不會與監控程式搶寫入鎖；每個請求執行緒各用一條連線
+        self._repo = None
+        self._repo_lock = threading.Lock()
+
         # 初始化快取管理器（ETtoday 快取 5 分鐘）
         self.cache = NewsCache(cache_dir="./cache", ttl_minutes=5)
         print("✅ 快取系統已啟用（TTL: 5 分鐘）")
 
+        # 背景載入 jieba 詞典：伺服器先開始監聽，/healthz 在載入完成前回 503，
+        # 部署平台等到就緒才切換流量，第一個分析請求不必等詞典
+        self.tokenizer_seconds = None
+        threading.Thread(target=self._warm_up_tokenizer, name="tokenizer-warm-up", daemon=True).start()
+
+    def _warm_up_tokenizer(self):
+        cache_dir = self.config.get('tokenizer', {}).get('dictionary_cache_dir', './cache')
+        try:
+            self.tokenizer_seconds = warm_up_tokenizer(cache_dir)
+            print(f"✅ 分詞器就緒（jieba 詞典載入 {self.tokenizer_seconds:.2f} 秒）", flush=True)
+        except Exception as e:
+            print(f"⚠️  分詞器預載失敗，將於第一次分析時載入: {e}", flush=True)
+
+    @property
+    def repo(self) -> Repository:
+        if self._repo is None:
+            with self._repo_lock:
+                if self._repo is None:
+                    self._repo = Repository(self.config.get('database_path', './newsfollow.db'), read_only=True)
+        return self._repo
+
     def crawl_source(self, source_config: Dict) -> List[NewsItem]:
         """爬取單一媒體來源"""
         items = []
@@ -208,6 +248,54 @@ class NewsDashboard:
 
         return unique_items
 
+    @property
+    def mode(self) -> str:
+        """crawl：每次即時爬取所有來源；database：讀監控資料庫，只爬 ETtoday"""
+        return os.getenv("DASHBOARD_MODE", self.config.get('dashboard', {}).get('mode', 'crawl'))
+
+    def load_latest_run(self) -> Optional[Dict]:
+        """
+        讀取監控程式（main.py loop）最近一次成功 run 的 signals 與事件
+
+        Returns:
+            {'run_id', 'age_seconds', 'sources': {來源名稱: [NewsItem]}, 'events': [...]}；
+            資料庫尚無 run 或 run 太舊（超過 dashboard.max_run_age_minutes）時回傳 None
+        """
+        try:
+            snapshot = self.repo.latest_run_snapshot()
+        except sqlite3.OperationalError as e:  # 監控程式尚未建立資料庫
+            print(f"⚠️  無法讀取監控資料庫（{e}），改為即時爬取")
+            return None
+        if snapshot is None:
+            print("⚠️  監控資料庫尚無完成的 run，改為即時爬取")
+            return None
+
+        run = snapshot['run']
+        age = (dt.datetime.now(dt.timezone.utc) - dt.datetime.fromisoformat(run['started_at'])).total_seconds()
+        max_age = self.config.get('dashboard', {}).get('max_run_age_minutes', 30) * 60
+        if age > max_age:
+            print(f"⚠️  最近一次 run 是 {age / 60:.0f} 分鐘前（{run['run_id']}），改為即時爬取")
+            return None
+
+        sources: Dict[str, List[NewsItem]] = {s['source_name']: [] for s in self.config.get('sources', [])}
+        for sig in snapshot['signals']:
+            sources.setdefault(sig.source_name, []).append(NewsItem(
+                source=sig.source_name,
+                title=sig.title,
+                url=sig.url,
+                normalized_title=sig.normalized_title,
+                crawled_at=sig.crawled_at,
+                section=sig.section_id,
+                weight=sig.weight,
+            ))
+
+        return {
+            'run_id': run['run_id'],
+            'age_seconds': age,
+            'sources': sources,
+            'events': [dict(e) for e in snapshot['events']],
+        }
+
     def find_missing_news(self, all_source_items: Dict[str, List[NewsItem]],
                          ettoday_items: List[NewsItem]) -> List[Dict]:
         """
@@ -215,45 +303,30 @@ class NewsDashboard:
         使用混合策略（演算法 + LLM）進行相似度比對
         並將相同新聞分群顯示
         """
-        from main import title_similarity, compute_title_features
+        from main import title_similarity_at_least, cached_title_features
         from news_importance import calculate_news_importance, format_star_rating
 
         # 預計算 ETtoday 所有標題特徵（用於混合比對）
         # 這能大幅減少重複建立 Set/Counter 的記憶體開銷
-        ettoday_features_list = [compute_title_features(item.title) for item in ettoday_items]
+        ettoday_features_list = [cached_title_features(item.title) for item in ettoday_items]
 
         # 收集所有不在 ETtoday 的新聞（使用混合相似度比對）
         self.similarity_checker.reset_statistics()
-        missing_items = []
-
-        # 用於群集的項目列表（儲存 (item, features)）
-        missing_items_with_features = []
-
-        # 批次處理以減少記憶體峰值
         import gc
-        batch_count = 0
-
-        for source_name, items in all_source_items.items():
-            for item in items:
-                # 預計算候選標題特徵
-                candidate_features = compute_title_features(item.title)
-
-                # 使用混合策略檢查是否在 ETtoday 中存在
-                # 傳遞預計算的特徵物件
-                is_in_ettoday = self.similarity_checker.batch_check(
-                    candidate_title=candidate_features,
-                    reference_titles=ettoday_features_list
-                )
 
-                # 只有當確定不在 ETtoday 時，才加入缺少列表
-                if not is_in_ettoday:
-                    missing_items.append(item)
-                    missing_items_with_features.append((item, candidate_features))
+        candidates = [item for items in all_source_items.values() for item in items]
+        candidate_features = [cached_title_features(item.title) for item in candidates]
+
+        # 一次比對所有候選：先以矩陣運算算出相似度上界，只對可能相同的配對做完整比對
+        in_ettoday = self.similarity_checker.batch_check_many(candidate_features, ettoday_features_list)
 
-                # 每處理 50 則新聞就回收一次記憶體
-                batch_count += 1
-                if batch_count % 50 == 0:
-                    gc.collect()
+        # 用於群集的項目列表（儲存 (item, features)）
+        missing_items_with_features = [
+            (item, features)
+            for item, features, found in zip(candidates, candidate_features, in_ettoday)
+            if not found
+        ]
+        del candidate_features
 
         # 顯示統計資訊
         stats = self.similarity_checker.get_statistics()
@@ -271,7 +344,7 @@ class NewsDashboard:
                 for existing_item, existing_features in cluster:
                     # 使用 0.47 閾值（比 0.5 稍低，因為這是最終顯示用）
                     # 直接使用特徵進行比對
-                    if title_similarity(features, existing_features) >= 0.47:
+                    if title_similarity_at_least(features, existing_features, 0.47):
                         clusters[i].append((item, features))
                         placed = True
                         break
@@ -555,6 +628,17 @@ def index():
     return render_template('dashboard.html')
 
 
+@app.route('/healthz')
+def healthz():
+    """健康檢查：分詞器載入完成前回 503"""
+    ready = TOKENIZER_READY.is_set()
+    return jsonify({
+        'status': 'ok' if ready else 'starting',
+        'tokenizer_ready': ready,
+        'tokenizer_seconds': dashboard.tokenizer_seconds,
+    }), 200 if ready else 503
+
+
 @app.route('/api/crawl', methods=['POST'])
 def api_crawl():
     """爬取所有來源（平行執行）"""
@@ -564,12 +648,15 @@ def api_crawl():
     print(f"🚀 開始分析流程 (時間戳: {time.strftime('%Y-%m-%d %H:%M:%S')})", flush=True)
     print(f"{'='*60}", flush=True)
 
-    # 清除 jieba 分詞快取（釋放記憶體）
+    # 清除 jieba 分詞快取（釋放記憶體）；標題特徵另有 TITLE_FEATURE_CACHE 保留（有記憶體上限）
     from main import get_jieba_tokens
     get_jieba_tokens.cache_clear()
     print("🧹 已清除 jieba 分詞快取")
 
     try:
+        # database 模式：直接使用監控程式最近一次 run 的結果，只需爬 ETtoday
+        latest_run = dashboard.load_latest_run() if dashboard.mode == 'database' else None
+
         # 定義爬取任務
         def crawl_udn():
             config = next((s for s in dashboard.config['sources'] if s['source_id'] == 'udn'), None)
@@ -594,23 +681,28 @@ def api_crawl():
         def crawl_et():
             return ('ETtoday', dashboard.crawl_ettoday())
 
-        # 平行爬取所有來源（最多 1 個同時執行，避免記憶體不足）
         results = {}
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            # 提交所有任務
-            futures = [
-                executor.submit(crawl_udn),
-                executor.submit(crawl_tvbs),
-                executor.submit(crawl_chinatimes),
-                executor.submit(crawl_setn),
-                executor.submit(crawl_ebc),
-                executor.submit(crawl_et),
-            ]
-
-            # 收集結果
-            for future in as_completed(futures):
-                source_name, items = future.result()
-                results[source_name] = items
+        if latest_run:
+            print(f"🗄️  使用監控資料庫 {latest_run['run_id']}（{latest_run['age_seconds']:.0f}秒前），只爬取 ETtoday")
+            results.update(latest_run['sources'])
+            results['ETtoday'] = dashboard.crawl_ettoday()
+        else:
+            # 平行爬取所有來源（最多 1 個同時執行，避免記憶體不足）
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                # 提交所有任務
+                futures = [
+                    executor.submit(crawl_udn),
+                    executor.submit(crawl_tvbs),
+                    executor.submit(crawl_chinatimes),
+                    executor.submit(crawl_setn),
+                    executor.submit(crawl_ebc),
+                    executor.submit(crawl_et),
+                ]
+
+                # 收集結果
+                for future in as_completed(futures):
+                    source_name, items = future.result()
+                    results[source_name] = items
 
         # 主動回收記憶體（釋放 BeautifulSoup 解析產生的大量物件）
         import gc
@@ -651,6 +743,13 @@ def api_crawl():
         llm_calls = dashboard.similarity_checker.llm_call_count
         print(f"📊 LLM 調用統計: {llm_calls} 次")
 
+        # 保存標題特徵快取（僅在有新標題時寫檔），重啟後不必重新分詞
+        from main import TITLE_FEATURE_CACHE
+        cache_stats = TITLE_FEATURE_CACHE.stats()
+        print(f"📊 標題特徵快取: {cache_stats['entries']} 則, {cache_stats['bytes'] / 1024 / 1024:.1f} MB, "
+              f"命中 {cache_stats['hits']} / 未命中 {cache_stats['misses']}")
+        save_feature_cache(dashboard.feature_cache_path)
+
         total_time = time.time() - start_time
         print(f"\n✅ 分析完成！總耗時: {total_time:.2f} 秒", flush=True)
         print(f"   - 找到缺少新聞: {len(missing_news)} 則", flush=True)
@@ -667,6 +766,9 @@ def api_crawl():
             'missing': missing_news,
             'llm_calls': llm_calls,
             'total_time': f"{total_time:.2f}s",
+            'mode': 'database' if latest_run else 'crawl',
+            'run_id': latest_run['run_id'] if latest_run else None,
+            'events': latest_run['events'] if latest_run else [],
         })
 
     except Exception as e:
@@ -682,6 +784,35 @@ def api_crawl():
         }), 500
 
 
+@app.route('/api/search')
+def api_search():
+    """標題全文搜尋（例如：今天是否已經看過這則新聞？）
+
+    參數: q, scope=articles|events, since=today|ISO 時間, any=1（任一詞符合）, limit
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'success': False, 'error': 'q is required'}), 400
+
+        since = request.args.get('since', '')
+        if since == 'today':
+            since = dt.datetime.now(dt.timezone.utc).date().isoformat()
+        limit = max(1, min(int(request.args.get('limit', 20)), 100))
+        any_token = request.args.get('any', '') in ('1', 'true')
+
+        repo = dashboard.repo
+        if request.args.get('scope', 'articles') == 'events':
+            rows = repo.search_events(query, limit=limit, since=since, any_token=any_token)
+        else:
+            rows = repo.search_articles(query, limit=limit, since=since, any_token=any_token)
+
+        return jsonify({'success': True, 'query': query, 'results': [dict(r) for r in rows]})
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/rewrite', methods=['POST'])
 def api_rewrite():
     """改寫單則新聞（根據勾選的多個來源）"""
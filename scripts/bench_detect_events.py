@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+detect_events 效能比較：舊版（每次比對都以字串呼叫 title_similarity，重新計算兩邊特徵，
+逐一比對所有群）vs 新版（每個標題只計算一次 TitleFeatures，以倒排索引只比對候選群）
+
+另外量測 signals 數量加倍時新版的耗時，確認成長接近線性。
+
+用法: python scripts/bench_detect_events.py [signals]
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Signal, detect_events, get_jieba_tokens, now_iso, title_similarity
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "ettoday.json")
+
+
+def legacy_detect_clusters(signals, similarity_threshold):
+    clusters, representatives = [], []
+    for signal in signals:
+        title = signal.title
+        placed = False
+        for i, rep in enumerate(representatives):
+            if title_similarity(title, rep) >= similarity_threshold:
+                clusters[i].append(signal)
+                if len(title) > len(rep):
+                    representatives[i] = title
+                placed = True
+                break
+        if not placed:
+            clusters.append([signal])
+            representatives.append(title)
+    return clusters
+
+
+def vocabulary():
+    """取快取 ETtoday 標題中的詞（長度 >= 2）當作詞庫"""
+    with open(CACHE_PATH, "r", encoding="utf-8") as f:
+        titles = [item["title"] for item in json.load(f)["data"]]
+    return sorted({t for title in titles for t in get_jieba_tokens(title) if len(t.strip()) >= 2})
+
+
+def make_signals(count, words):
+    """
+    每則新聞由 3 個詞組成，各來源以不同詞序報導（平均 4 個 signal 一則）
+
+    標題若帶有「最新」「（影）」這類各則新聞共用的字樣，所有群都會成為候選，
+    倒排索引就無法省下比對。
+    """
+    sources = ["udn", "tvbs", "setn", "chinatimes", "ebc"]
+    rng = random.Random(count)
+    stories = [rng.sample(words, 3) for _ in range(max(count // 4, 1))]
+    ts = now_iso()
+    signals = []
+    for i in range(count):
+        a, b, c = rng.choice(stories)
+        title = f"{a}{b} {c}" if i % 2 else f"{b}{a}{c}"
+        source = rng.choice(sources)
+        signals.append(Signal(source, source, "hot", title, f"https://{source}.example/{i}", 5, ts))
+    return signals
+
+
+def measure(label, fn):
+    get_jieba_tokens.cache_clear()
+    start = time.perf_counter()
+    clusters = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<9} {elapsed:8.2f} s | {clusters} clusters")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    words = vocabulary()
+    signals = make_signals(n, words)
+    print(f"📊 {n} signals, similarity_threshold=0.5")
+    measure("legacy", lambda: len(legacy_detect_clusters(signals, 0.5)))
+    measure("features", lambda: len(detect_events(signals, score_threshold=0, similarity_threshold=0.5)))
+    for scale in (2, 4):
+        more = make_signals(n * scale, words)
+        measure(f"x{scale}", lambda: len(detect_events(more, score_threshold=0, similarity_threshold=0.5)))
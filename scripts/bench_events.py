@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+事件寫入效能比較：舊版（逐筆 SELECT → UPDATE/INSERT + 逐事件綁定）vs 批次 UPSERT
+
+模擬重大新聞爆量：每輪 1k 個事件、每個事件綁定 5 篇文章，
+其中約 90% 事件與上一輪相同（走 UPDATE 路徑）。觀察每輪寫入時間是否隨輪數持平。
+用法: python scripts/bench_events.py [runs] [events]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Event, Repository, now_iso
+
+
+def make_events(run_index, count):
+    offset = run_index * max(count // 10, 1)
+    return [
+        Event(f"evt_{offset + i:08d}", f"第{offset + i}則事件標題", 10.0 + i % 7, 2 + i % 3, 5, [], [])
+        for i in range(count)
+    ]
+
+
+def bindings_for(events):
+    return {e.event_key: [int(e.event_key[4:]) * 5 + k for k in range(5)] for e in events}
+
+
+def legacy_write(repo, events, bindings):
+    conn = repo.conn
+    now = now_iso()
+    for event in events:
+        existing = conn.execute("SELECT event_key, first_seen FROM events WHERE event_key = ?", (event.event_key,)).fetchone()
+        if existing:
+            conn.execute(
+                "UPDATE events SET canonical_title = ?, score = ?, source_count = ?, signal_count = ?, last_seen = ? "
+                "WHERE event_key = ?",
+                (event.canonical_title, event.score, event.source_count, event.signal_count, now, event.event_key),
+            )
+        else:
+            conn.execute(
+                "INSERT INTO events (event_key, canonical_title, score, source_count, signal_count, first_seen, last_seen, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 'new')",
+                (event.event_key, event.canonical_title, event.score, event.source_count, event.signal_count, now, now),
+            )
+        for article_id in bindings[event.event_key]:
+            conn.execute("INSERT OR IGNORE INTO event_articles (event_key, article_id) VALUES (?, ?)",
+                         (event.event_key, article_id))
+
+
+def batched_write(repo, events, bindings):
+    repo.upsert_events(events)
+    repo.bind_events_signals(bindings)
+
+
+def measure(label, write, runs, count):
+    repo = Repository(os.path.join(tempfile.mkdtemp(), "events.db"))
+    timings = []
+    for i in range(runs):
+        events = make_events(i, count)
+        bindings = bindings_for(events)
+        start = time.perf_counter()
+        with repo.transaction():
+            write(repo, events, bindings)
+        timings.append(time.perf_counter() - start)
+    repo.conn.close()
+    first, last = timings[: max(runs // 10, 1)], timings[-max(runs // 10, 1):]
+    print(f"  {label:<8} avg {1000 * sum(timings) / runs:7.2f} ms/run | "
+          f"first 10% {1000 * sum(first) / len(first):7.2f} ms | last 10% {1000 * sum(last) / len(last):7.2f} ms")
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    print(f"📊 {runs} runs × {count} events")
+    measure("legacy", legacy_write, runs, count)
+    measure("batched", batched_write, runs, count)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+標題特徵快取：儀表板重複分析時的特徵計算成本
+
+模擬連續幾輪分析，每輪約 10% 的標題是新的（其餘仍在首頁上），比較：
+- 無快取：每輪清空 jieba 快取並重新計算所有標題的特徵（原本的 api_crawl 行為）
+- 快取：TitleFeatureCache，只為新標題分詞
+- 重啟：從 save() 的檔案載入 vs 全部重新分詞
+用法: python scripts/bench_feature_cache.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import TitleFeatureCache, compute_title_features, get_jieba_tokens
+from tests.test_detect_events import recorded_signals
+
+ROUNDS = 10
+
+
+def rounds(titles):
+    """每輪換掉 10% 的標題（以加上輪次編號模擬新標題）"""
+    step = max(1, len(titles) // 10)
+    current = list(titles)
+    for r in range(ROUNDS):
+        for i in range(r * step % len(current), min(len(current), r * step % len(current) + step)):
+            current[i] = f"{titles[i]} 第{r}輪"
+        yield list(current)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return 1000 * (time.perf_counter() - start), result
+
+
+if __name__ == "__main__":
+    titles = sorted({s.title for s in recorded_signals()})
+    for t in titles:
+        compute_title_features(t)  # 預熱 jieba 詞典
+
+    def uncached():
+        for batch in rounds(titles):
+            get_jieba_tokens.cache_clear()
+            for t in batch:
+                compute_title_features(t)
+
+    cache = TitleFeatureCache()
+    seen = set()
+
+    def cached():
+        get_jieba_tokens.cache_clear()
+        for batch in rounds(titles):
+            for t in batch:
+                cache.get(t)
+            seen.update(batch)
+
+    print(f"📊 {len(titles)} titles x {ROUNDS} rounds (10% new per round)")
+    ms, _ = timed(uncached)
+    print(f"no cache        {ms:8.1f} ms")
+    ms, _ = timed(cached)
+    stats = cache.stats()
+    print(f"feature cache   {ms:8.1f} ms | {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KiB, "
+          f"hits {stats['hits']} / misses {stats['misses']}")
+
+    path = os.path.join(tempfile.mkdtemp(), "title_features.jsonl.gz")
+    cache.save(path)
+    get_jieba_tokens.cache_clear()
+    ms, _ = timed(lambda: [compute_title_features(t) for t in seen])
+    print(f"restart: retokenize {ms:8.1f} ms")
+    ms, count = timed(lambda: TitleFeatureCache().load(path))
+    print(f"restart: load file  {ms:8.1f} ms ({count} entries, {os.path.getsize(path) / 1024:.0f} KiB on disk)")
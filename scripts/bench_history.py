@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+歷史查詢效能回歸測試：keyset 分頁 + 覆蓋索引 vs 舊版（無索引排序 / OFFSET 分頁）
+
+建立合成資料庫（預設 100 萬則草稿與發布紀錄、25 萬個事件），
+量測第一頁與第 100 頁的查詢時間。keyset 版本在不同資料量下應維持常數時間。
+用法: python scripts/bench_history.py [rows ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Repository
+
+PAGE = 20
+DEEP_PAGE = 100
+
+
+def build(path, rows):
+    repo = Repository(path)
+    events = max(rows // 4, 1)
+    with repo.transaction():
+        repo.conn.executemany(
+            "INSERT INTO events (event_key, canonical_title, score, source_count, signal_count, first_seen, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((f"evt_{i:08d}", f"第{i}則事件標題", 10.0 + i % 9, 2, 5, _ts(i), _ts(i * 3 % events)) for i in range(events)),
+        )
+        repo.conn.executemany(
+            "INSERT INTO drafts (event_key, generated_at, title, body, image_prompt, sources_json, raw_json) "
+            "VALUES (?, ?, ?, ?, '', '[]', '{}')",
+            ((f"evt_{i % events:08d}", _ts(i), f"草稿標題{i}", "內文" * 50) for i in range(rows)),
+        )
+        repo.conn.executemany(
+            "INSERT INTO publish_logs (event_key, published_at, status, external_id, message) VALUES (?, ?, 'ok', ?, '')",
+            ((f"evt_{i % events:08d}", _ts(i), f"ext_{i}") for i in range(rows)),
+        )
+    repo.conn.execute("ANALYZE")
+    return repo
+
+
+def _ts(i):
+    return f"2026-{1 + i // 2_000_000 % 12:02d}-01T00:00:00.{i:07d}+00:00"
+
+
+def timed(fn, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def keyset_deep(page_fn):
+    cursor = ""
+    for _ in range(DEEP_PAGE):
+        _, cursor = page_fn(limit=PAGE, cursor=cursor)
+    return cursor
+
+
+def measure(rows):
+    path = os.path.join(tempfile.mkdtemp(), "history.db")
+    start = time.perf_counter()
+    repo = build(path, rows)
+    print(f"📊 {rows:,} drafts / publish logs, {max(rows // 4, 1):,} events (build {time.perf_counter() - start:.1f} s)")
+
+    legacy_events = (
+        "SELECT event_key, canonical_title, score, source_count, signal_count, first_seen, last_seen, status "
+        "FROM events NOT INDEXED ORDER BY last_seen DESC LIMIT ? OFFSET ?"
+    )
+    legacy_drafts = (
+        "SELECT d.*, e.score FROM drafts d NOT INDEXED LEFT JOIN events e ON d.event_key = e.event_key "
+        "ORDER BY d.generated_at DESC LIMIT ? OFFSET ?"
+    )
+    deep_cursor = {
+        name: keyset_deep(fn)
+        for name, fn in (("events", repo.page_events), ("drafts", repo.page_drafts), ("logs", repo.page_publish_logs))
+    }
+    results = [
+        ("events page 1", lambda: repo.conn.execute(legacy_events, (PAGE, 0)).fetchall(),
+         lambda: repo.page_events(limit=PAGE)),
+        (f"events page {DEEP_PAGE}", lambda: repo.conn.execute(legacy_events, (PAGE, PAGE * DEEP_PAGE)).fetchall(),
+         lambda: repo.page_events(limit=PAGE, cursor=deep_cursor["events"])),
+        ("drafts page 1", lambda: repo.conn.execute(legacy_drafts, (PAGE, 0)).fetchall(),
+         lambda: repo.page_drafts(limit=PAGE)),
+        (f"drafts page {DEEP_PAGE}", lambda: repo.conn.execute(legacy_drafts, (PAGE, PAGE * DEEP_PAGE)).fetchall(),
+         lambda: repo.page_drafts(limit=PAGE, cursor=deep_cursor["drafts"])),
+        ("drafts of one event", lambda: repo.conn.execute(
+            "SELECT * FROM drafts NOT INDEXED WHERE event_key = 'evt_00000007' ORDER BY generated_at DESC LIMIT ?",
+            (PAGE,)).fetchall(),
+         lambda: repo.page_drafts(limit=PAGE, event_key="evt_00000007")),
+        (f"logs page {DEEP_PAGE}", lambda: repo.conn.execute(
+            "SELECT * FROM publish_logs NOT INDEXED ORDER BY published_at DESC LIMIT ? OFFSET ?",
+            (PAGE, PAGE * DEEP_PAGE)).fetchall(),
+         lambda: repo.page_publish_logs(limit=PAGE, cursor=deep_cursor["logs"])),
+    ]
+    for label, legacy, keyset in results:
+        legacy_ms = timed(legacy, repeat=3)
+        print(f"  {label:<20} legacy {legacy_ms:9.2f} ms | keyset {timed(keyset):7.3f} ms")
+    repo.close()
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [100_000, 1_000_000]
+    for n in sizes:
+        measure(n)
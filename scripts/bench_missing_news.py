@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+find_missing_news 比對效能：逐一 batch_check（每個候選對所有 ETtoday 標題呼叫 title_similarity）
+vs batch_check_many（先以稀疏矩陣算出相似度上界，只對可能達到 0.3 的配對完整比對）
+
+參考標題取快取 ETtoday 前 90 則，候選為 tests/test_detect_events 的改寫標題（約 400 則）。
+LLM 停用，只量測演算法部分。
+用法: python scripts/bench_missing_news.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hybrid_similarity import HybridSimilarityChecker
+from main import compute_title_features
+from tests.test_detect_events import recorded_signals
+
+
+def measure(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<17} {1000 * (time.perf_counter() - start):8.1f} ms | {sum(result)} found in ETtoday")
+    return result
+
+
+if __name__ == "__main__":
+    titles = [s.title for s in recorded_signals()]
+    references = [compute_title_features(t) for t in titles[:200:2]][:90]
+    candidates = [compute_title_features(t) for t in titles] + [compute_title_features(t + "！") for t in titles[:40]]
+    checker = HybridSimilarityChecker(enable_llm=False)
+    print(f"📊 {len(candidates)} candidates x {len(references)} ETtoday titles")
+    legacy = measure("batch_check", lambda: [checker.batch_check(c, references) for c in candidates])
+    batched = measure("batch_check_many", lambda: checker.batch_check_many(candidates, references))
+    assert legacy == batched
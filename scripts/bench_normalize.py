@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+normalize_title / compact_space 微基準測試：舊版逐字元迴圈 vs 正規表示式版 vs 批次 API
+使用 cache/ettoday.json 的實際標題
+"""
+
+import json
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from main import compact_space, normalize_title, normalize_titles
+
+
+def legacy_normalize_title(text):
+    keep = []
+    for ch in " ".join(text.split()).lower():
+        if ch.isalnum():
+            keep.append(ch)
+        elif "一" <= ch <= "鿿":
+            keep.append(ch)
+    return "".join(keep)
+
+
+def bench(label, fn, titles, number):
+    seconds = min(timeit.repeat(fn, number=number, repeat=5))
+    per_title = seconds / (number * len(titles)) * 1e6
+    print(f"  {label:<28} {per_title:6.2f} µs/title")
+
+
+if __name__ == "__main__":
+    with open(os.path.join(ROOT, "cache", "ettoday.json"), "r", encoding="utf-8") as f:
+        titles = [item["title"] for item in json.load(f)["data"]]
+    number = 200
+
+    print(f"📊 {len(titles)} 則 ETtoday 標題")
+    print("normalize_title:")
+    bench("legacy loop", lambda: [legacy_normalize_title(t) for t in titles], titles, number)
+    bench("regex", lambda: [normalize_title(t) for t in titles], titles, number)
+    bench("normalize_titles (bulk)", lambda: normalize_titles(titles), titles, number)
+    print("compact_space:")
+    bench("split/join", lambda: [compact_space(t) for t in titles], titles, number)
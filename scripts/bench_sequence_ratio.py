@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+序列相似度效能：difflib.SequenceMatcher vs sequence_ratio 的 compat（相同分數）與 lcs（位元平行）模式
+
+配對取自快取 ETtoday 標題及其改寫版本（去除空白，與 TitleFeatures.clean_text 相同），
+依兩者中較長標題的長度分組報告每對平均耗時。
+用法: python scripts/bench_sequence_ratio.py
+"""
+
+import os
+import re
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sequence_ratio
+from tests.test_detect_events import recorded_signals
+
+ENGINES = [
+    ("difflib", lambda a, b: SequenceMatcher(None, a, b).ratio()),
+    ("compat", sequence_ratio.ratcliff_obershelp_ratio),
+    ("lcs", sequence_ratio.lcs_ratio),
+]
+BUCKETS = [(0, 20), (20, 30), (30, 40), (40, 80)]
+
+
+def per_pair_us(fn, pairs, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for a, b in pairs:
+            fn(a, b)
+        best = min(best, time.perf_counter() - start)
+    return 1e6 * best / len(pairs)
+
+
+if __name__ == "__main__":
+    titles = sorted({re.sub(r"\s+", "", s.title) for s in recorded_signals()})
+    lengths = sorted(len(t) for t in titles)
+    print(f"📊 {len(titles)} titles, length p50={lengths[len(lengths) // 2]} "
+          f"p90={lengths[len(lengths) * 9 // 10]} max={lengths[-1]}")
+    pairs = [(titles[i], titles[j]) for i in range(0, len(titles), 2) for j in range(i + 1, len(titles), 3)]
+    print(f"{'length':<8}{'pairs':>7}" + "".join(f"{name:>10}" for name, _ in ENGINES) + "   (us/pair)")
+    for lo, hi in BUCKETS:
+        bucket = [(a, b) for a, b in pairs if lo <= max(len(a), len(b)) < hi]
+        if bucket:
+            print(f"{lo:>2}-{hi:<5}{len(bucket):>7}" + "".join(f"{per_pair_us(fn, bucket):>10.1f}" for _, fn in ENGINES))
+    print(f"{'all':<8}{len(pairs):>7}" + "".join(f"{per_pair_us(fn, pairs):>10.1f}" for _, fn in ENGINES))
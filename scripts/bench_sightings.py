@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+資料庫成長與寫入時間比較：舊版 signals（每輪整列重存）vs articles + sightings
+
+模擬 3 分鐘一輪、每輪約 200 則幾乎不變的標題（一天 480 輪）。
+用法: python scripts/bench_sightings.py [runs] [headlines]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Repository, Signal, now_iso
+
+LEGACY_SCHEMA = """
+CREATE TABLE signals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, source_id TEXT NOT NULL, source_name TEXT NOT NULL,
+    section_id TEXT NOT NULL, title TEXT NOT NULL, url TEXT NOT NULL, normalized_title TEXT NOT NULL,
+    weight INTEGER NOT NULL, crawled_at TEXT NOT NULL
+);
+CREATE INDEX idx_signals_run ON signals(run_id);
+CREATE INDEX idx_signals_norm ON signals(normalized_title);
+"""
+
+
+def make_batch(run_index, headlines):
+    ts = now_iso()
+    # 每輪約 5% 標題換新
+    offset = run_index * max(headlines // 20, 1)
+    return [
+        Signal("udn", "UDN", ("homepage", "realtime", "hot")[i % 3],
+               f"快訊／第{offset + i}則即時新聞標題 各界關注後續發展",
+               f"https://udn.com/news/story/7266/{offset + i}", 5, ts)
+        for i in range(headlines)
+    ]
+
+
+def legacy_run(conn, run_id, signals):
+    for s in signals:
+        conn.execute(
+            "INSERT INTO signals (run_id, source_id, source_name, section_id, title, url, normalized_title, weight, crawled_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (run_id, s.source_id, s.source_name, s.section_id, s.title, s.url, s.normalized_title, s.weight, s.crawled_at),
+        )
+    conn.commit()
+
+
+def file_size(path):
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 480
+    headlines = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    tmp = tempfile.mkdtemp()
+    batches = [make_batch(i, headlines) for i in range(runs)]
+
+    legacy_path = os.path.join(tmp, "legacy.db")
+    conn = sqlite3.connect(legacy_path)
+    conn.executescript(LEGACY_SCHEMA)
+    start = time.perf_counter()
+    for i, batch in enumerate(batches):
+        legacy_run(conn, f"run_20261019T{i:06d}Z", batch)
+    legacy_time = time.perf_counter() - start
+    conn.close()
+
+    new_path = os.path.join(tmp, "sightings.db")
+    repo = Repository(new_path)
+    start = time.perf_counter()
+    for batch in batches:
+        with repo.transaction():  # run_once 一輪一次 commit
+            repo.save_signals(repo.start_run(), batch)
+    new_time = time.perf_counter() - start
+    repo.conn.close()
+
+    print(f"📊 {runs} runs × {headlines} headlines")
+    print(f"  legacy signals     : {file_size(legacy_path) / 1024 / 1024:7.2f} MB, insert {legacy_time:6.2f} s")
+    print(f"  articles+sightings : {file_size(new_path) / 1024 / 1024:7.2f} MB, insert {new_time:6.2f} s")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Signal 表示法效能比較：舊版（每次存取重算 normalized_title）vs 新版（slots + 建構時快取）
+
+模擬一輪 run_once 對 signal 的存取模式：
+dedupe_signals → save_signals → run_once 的 signature 對照表（每個 signal 兩次）
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Signal, dedupe_signals, normalize_title, now_iso
+
+
+@dataclass
+class LegacySignal:
+    source_id: str
+    source_name: str
+    section_id: str
+    title: str
+    url: str
+    weight: int
+    crawled_at: str
+
+    @property
+    def normalized_title(self) -> str:
+        return normalize_title(self.title)
+
+
+def legacy_cycle(signals):
+    deduped, seen = [], set()
+    for s in signals:
+        key = f"{s.source_id}|{s.section_id}|{s.normalized_title}|{s.url}"
+        if key not in seen:
+            seen.add(key)
+            deduped.append(s)
+    stored = [s.normalized_title for s in deduped]  # save_signals
+    ids = {f"{s.source_id}|{s.section_id}|{s.normalized_title}|{s.url}": i for i, s in enumerate(deduped)}
+    bound = [ids[f"{s.source_id}|{s.section_id}|{s.normalized_title}|{s.url}"] for s in deduped]
+    return len(stored) + len(bound)
+
+
+def new_cycle(signals):
+    deduped = dedupe_signals(signals)
+    stored = [s.normalized_title for s in deduped]
+    ids = {s.signature: i for i, s in enumerate(deduped)}
+    bound = [ids[s.signature] for s in deduped]
+    return len(stored) + len(bound)
+
+
+def make_rows(count):
+    subjects = ["台積電", "輝達", "黃仁勳", "颱風", "地震", "立法院", "賴清德", "NBA"]
+    actions = ["宣布", "大漲", "來襲", "三讀", "訪台", "創新高", "停班停課"]
+    ts = now_iso()
+    rows = []
+    for i in range(count):
+        title = f"快訊／{random.choice(subjects)}{random.choice(actions)} 第{i % 2000}則 最新消息"
+        rows.append(("udn", "UDN", random.choice(["homepage", "realtime", "hot"]), title,
+                     f"https://udn.com/news/story/{i % 2000}", 5, ts))
+    return rows
+
+
+def measure(label, cls, cycle, rows):
+    tracemalloc.start()
+    start = time.perf_counter()
+    signals = [cls(*r) for r in rows]
+    built = time.perf_counter()
+    cycle(signals)
+    done = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<8} build {1000 * (built - start):7.1f} ms | cycle {1000 * (done - built):7.1f} ms | "
+          f"total {1000 * (done - start):7.1f} ms | peak {peak / 1024 / 1024:6.2f} MB")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    random.seed(7)
+    rows = make_rows(n)
+    print(f"📊 {n} signals")
+    measure("legacy", LegacySignal, legacy_cycle, rows)
+    measure("slotted", Signal, new_cycle, rows)
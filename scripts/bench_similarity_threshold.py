@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+門檻判斷效能：title_similarity(a, b) >= threshold（每對都跑 SequenceMatcher）
+vs title_similarity_at_least（分數區間已決定時略過 SequenceMatcher）
+
+配對取自快取 ETtoday 標題及其改寫版本（tests/test_detect_events.recorded_signals）的所有組合。
+用法: python scripts/bench_similarity_threshold.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import compute_title_features, title_similarity, title_similarity_at_least
+from tests.test_detect_events import recorded_signals
+
+
+def measure(label, fn, pairs, threshold):
+    start = time.perf_counter()
+    hits = sum(1 for a, b in pairs if fn(a, b, threshold))
+    print(f"{label:<10} threshold={threshold:<4} {1000 * (time.perf_counter() - start):8.1f} ms | {hits} pairs")
+
+
+if __name__ == "__main__":
+    titles = sorted({s.title for s in recorded_signals()})
+    features = [compute_title_features(t) for t in titles]
+    pairs = [(features[i], features[j]) for i in range(len(features)) for j in range(i + 1, len(features))]
+    print(f"📊 {len(pairs)} title pairs")
+    for threshold in (0.3, 0.5, 0.74):
+        measure("full", lambda a, b, t: title_similarity(a, b) >= t, pairs, threshold)
+        measure("at_least", title_similarity_at_least, pairs, threshold)
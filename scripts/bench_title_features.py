@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+TitleFeatures 表示法比較：舊版（每個標題一份 list + set + Counter 的字串）vs 新版（排序的詞雜湊 id /
+計數陣列）
+
+量測每個標題的特徵記憶體（tracemalloc）與每對的 Jaccard／餘弦／共同實體計算時間。
+用法: python scripts/bench_title_features.py
+"""
+
+import math
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Set
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import _similarity_parts, compute_title_features
+from tests.test_detect_events import recorded_signals
+
+
+@dataclass
+class LegacyFeatures:
+    text: str
+    tokens: List[str]
+    token_set: Set[str]
+    token_counter: Counter
+    clean_text: str
+    numbers: Set[str]
+    vec_magnitude: float
+
+
+def legacy_features(f):
+    tokens = list(f.tokens)
+    counter = Counter(tokens)
+    return LegacyFeatures(f.text, tokens, set(tokens), counter, f.clean_text, set(f.numbers),
+                          math.sqrt(sum(v ** 2 for v in counter.values())))
+
+
+def legacy_parts(f1, f2):
+    inter_len = len(f1.token_set & f2.token_set)
+    union_len = len(f1.token_set | f2.token_set)
+    jaccard = inter_len / union_len if union_len else 0.0
+    all_tokens = set(f1.token_counter.keys()) | set(f2.token_counter.keys())
+    dot_product = sum(f1.token_counter.get(t, 0) * f2.token_counter.get(t, 0) for t in all_tokens)
+    cosine = dot_product / (f1.vec_magnitude * f2.vec_magnitude) if f1.vec_magnitude and f2.vec_magnitude else 0.0
+    long_tokens1 = {t for t in f1.token_set if len(t) >= 2}
+    long_tokens2 = {t for t in f2.token_set if len(t) >= 2}
+    return jaccard, cosine, len(long_tokens1 & long_tokens2) >= 2
+
+
+def memory_per_title(build, titles):
+    tracemalloc.start()
+    kept = [build(t) for t in titles]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(kept)
+
+
+def per_pair_us(fn, features):
+    pairs = [(features[i], features[j]) for i in range(0, len(features), 2) for j in range(i + 1, len(features), 3)]
+    start = time.perf_counter()
+    for a, b in pairs:
+        fn(a, b)
+    return 1e6 * (time.perf_counter() - start) / len(pairs)
+
+
+if __name__ == "__main__":
+    titles = sorted({s.title for s in recorded_signals()})
+    features = [compute_title_features(t) for t in titles]  # 先填好 jieba 快取
+    legacy = [legacy_features(f) for f in features]
+    text_features = {f.text: f for f in features}
+
+    print(f"📊 {len(titles)} titles")
+    print(f"legacy    {memory_per_title(lambda t: legacy_features(text_features[t]), titles):7.0f} B/title | "
+          f"{per_pair_us(legacy_parts, legacy):6.2f} us/pair")
+    print(f"id arrays {memory_per_title(compute_title_features, titles):7.0f} B/title | "
+          f"{per_pair_us(_similarity_parts, features):6.2f} us/pair")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+分詞方式比較：jieba（詞典分詞）vs ngram（中文字元 2/3-gram + 英數字段）
+
+品質：以 tests/test_real_news_similarity.py 與 tests/test_similarity_case.py 的人工標註配對，
+列出各門檻下的同一新聞召回率與不同新聞排除率。標註的不同新聞只有 4 對，另外把不同事件的標題
+兩兩配對（同一事件的多組配對視為同一群）當作不同新聞。
+速度：每個標題的特徵計算時間、每對相似度時間，以及新行程從 import 到第一個特徵的冷啟動時間。
+用法: python scripts/bench_tokenizer_modes.py
+"""
+
+import itertools
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import compute_title_features, get_jieba_tokens, set_tokenizer_mode, title_similarity
+from tests.test_detect_events import recorded_signals
+from tests.test_real_news_similarity import DIFFERENT_NEWS_PAIRS, SAME_NEWS_PAIRS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ("jieba", "ngram")
+THRESHOLDS = (0.3, 0.4, 0.5, 0.6, 0.7)
+
+# tests/test_similarity_case.py 的實際案例（該檔在 import 時就會呼叫 LLM，無法直接匯入）
+CASE_PAIRS = [("賴清德五度造訪台中 何欣純：有信心贏回台中", "賴清德頻赴台中力挺　何欣純：年底「決戰中台灣」是重中之重")]
+
+# 與 SAME_NEWS_PAIRS + CASE_PAIRS 對齊的事件編號（兩組日本大選是同一事件）
+STORIES = [0, 1, 1, 2, 3, 4, 5, 6, 7]
+
+COLD_START = (
+    "import time; t = time.perf_counter(); import main; main.set_tokenizer_mode({mode!r}); "
+    "main.compute_title_features('台積電股價創新高 外資大買'); print(time.perf_counter() - t)"
+)
+
+
+def labelled_pairs():
+    same = SAME_NEWS_PAIRS + CASE_PAIRS
+    titles = [(story, t) for story, pair in zip(STORIES, same) for t in pair]
+    cross = [(a, b) for (sa, a), (sb, b) in itertools.combinations(titles, 2) if sa != sb]
+    return same, DIFFERENT_NEWS_PAIRS + cross
+
+
+def quality(same, different):
+    same_scores = [title_similarity(a, b) for a, b in same]
+    diff_scores = [title_similarity(a, b) for a, b in different]
+    return {
+        th: (sum(s >= th for s in same_scores) / len(same_scores), sum(s < th for s in diff_scores) / len(diff_scores))
+        for th in THRESHOLDS
+    }
+
+
+def speed(titles):
+    get_jieba_tokens.cache_clear()
+    start = time.perf_counter()
+    features = [compute_title_features(t) for t in titles]
+    per_title = 1e6 * (time.perf_counter() - start) / len(titles)
+    pairs = [(features[i], features[j]) for i in range(0, len(features), 2) for j in range(i + 1, len(features), 3)]
+    start = time.perf_counter()
+    for a, b in pairs:
+        title_similarity(a, b)
+    per_pair = 1e6 * (time.perf_counter() - start) / len(pairs)
+    return per_title, per_pair
+
+
+def cold_start(mode):
+    out = subprocess.run([sys.executable, "-c", COLD_START.format(mode=mode)], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.split()[-1])
+
+
+if __name__ == "__main__":
+    titles = sorted({s.title for s in recorded_signals()})
+    same, different = labelled_pairs()
+    print(f"📊 {len(same)} same-news pairs, {len(different)} different-news pairs, {len(titles)} recorded titles")
+    print("recall = same-news pairs >= threshold, reject = different-news pairs < threshold")
+
+    for mode in MODES:
+        set_tokenizer_mode(mode)
+        compute_title_features("暖身")  # 載入 jieba 詞典，不計入速度
+        scores = quality(same, different)
+        per_title, per_pair = speed(titles)
+        print(f"\n{mode}: {per_title:6.1f} us/title features | {per_pair:5.1f} us/pair | "
+              f"cold start {cold_start(mode):5.2f} s")
+        for th, (recall, reject) in scores.items():
+            print(f"  threshold {th:.1f}: recall {recall:6.1%} | reject {reject:6.1%}")
+    set_tokenizer_mode("jieba")
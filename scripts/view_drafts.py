@@ -5,33 +5,37 @@
 
 import argparse
 import json
+import os
 import sqlite3
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def view_drafts(db_path: str, limit: int = 5, event_key: str = None):
-    """顯示草稿"""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+from main import Repository
 
-    if event_key:
-        query = """
-            SELECT d.*, e.score, e.source_count, e.signal_count
-            FROM drafts d
-            LEFT JOIN events e ON d.event_key = e.event_key
-            WHERE d.event_key = ?
-            ORDER BY d.generated_at DESC
-        """
-        rows = conn.execute(query, (event_key,)).fetchall()
-    else:
-        query = """
-            SELECT d.*, e.score, e.source_count, e.signal_count
-            FROM drafts d
-            LEFT JOIN events e ON d.event_key = e.event_key
-            ORDER BY d.generated_at DESC
-            LIMIT ?
-        """
-        rows = conn.execute(query, (limit,)).fetchall()
+
+def view_drafts(db_path: str, limit: int = None, event_key: str = None, cursor: str = ""):
+    """
+    顯示草稿（keyset 分頁，用 --cursor 接續下一頁）
+
+    未指定 limit 時顯示最新 5 則；指定 event_key 時則顯示該事件的全部草稿。
+    """
+    if not os.path.exists(db_path):
+        print(f"❌ 找不到資料庫: {db_path}")
+        return
+    repo = Repository(db_path, read_only=True)  # 只讀取，不與監控程式搶寫入鎖
+    try:
+        if event_key and limit is None:
+            rows, next_cursor = [], cursor
+            while True:
+                page, next_cursor = repo.page_drafts(limit=100, cursor=next_cursor, event_key=event_key)
+                rows.extend(page)
+                if not next_cursor:
+                    break
+        else:
+            rows, next_cursor = repo.page_drafts(limit=limit or 5, cursor=cursor, event_key=event_key or "")
+    finally:
+        repo.close()
 
     if not rows:
         print("❌ 沒有找到草稿")
@@ -85,7 +89,8 @@ def view_drafts(db_path: str, limit: int = 5, event_key: str = None):
 
         print()
 
-    conn.close()
+    if next_cursor:
+        print(f"➡️  下一頁: --cursor {next_cursor}")
 
 
 def list_events(db_path: str, limit: int = 20):
@@ -128,8 +133,9 @@ def main():
 
     # view-drafts 命令
     view = sub.add_parser("view-drafts", help="檢視草稿")
-    view.add_argument("--limit", type=int, default=5, help="顯示數量")
+    view.add_argument("--limit", type=int, help="顯示數量（預設 5；指定 --event-key 時預設全部）")
     view.add_argument("--event-key", help="指定 event key")
+    view.add_argument("--cursor", default="", help="上一頁輸出的分頁游標")
 
     # list-events 命令
     list_cmd = sub.add_parser("list-events", help="列出事件")
@@ -138,7 +144,7 @@ def main():
     args = parser.parse_args()
 
     if args.command == "view-drafts":
-        view_drafts(args.db, limit=args.limit, event_key=args.event_key)
+        view_drafts(args.db, limit=args.limit, event_key=args.event_key, cursor=args.cursor)
     elif args.command == "list-events":
         list_events(args.db, limit=args.limit)
 
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+批次相似度上界 - 以稀疏矩陣一次算出候選 × 參考標題所有配對的 Jaccard、餘弦與數字匹配
+
+_feature_similarity 中最貴的是序列相似度（LCS 比例），其餘各項都是詞集合運算。
+這裡把詞 id 與數字轉成稀疏計數矩陣，以矩陣乘法求出所有配對的共同詞數、內積與共同數字數，
+再把 LCS 比例以長度上界 2·min(len) / (len1 + len2) 代入，得到每個配對相似度的上界；
+互相包含的配對同樣先以共同字元雙字組數的矩陣乘法篩出，只確認少數候選。
+上界低於門檻的配對不可能達到門檻，不必再呼叫 title_similarity。
+
+需要 numpy 與 scipy（皆為選用）；未安裝時 SIMILARITY_MATRIX_AVAILABLE 為 False，
+呼叫端應回退到逐對比對。
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Hashable, List, Sequence
+
+try:
+    import numpy as np
+    from scipy import sparse
+    SIMILARITY_MATRIX_AVAILABLE = True
+except ImportError:
+    SIMILARITY_MATRIX_AVAILABLE = False
+
+from main import TitleFeatures, _char_bigrams, _similarity_text
+
+# 浮點運算順序與純量版不同，上界多留一點餘裕
+_EPSILON = 1e-9
+
+
+def _count_matrix(rows: Sequence[Dict[Hashable, int]], vocab: Dict[Hashable, int]):
+    indptr, indices, data = [0], [], []
+    for counts in rows:
+        for key, count in counts.items():
+            indices.append(vocab.setdefault(key, len(vocab)))
+            data.append(count)
+        indptr.append(len(indices))
+    return indptr, indices, data
+
+
+def _pair_products(left: Sequence[Dict[Hashable, int]], right: Sequence[Dict[Hashable, int]]):
+    """left × right 所有配對的 Σ left[t]·right[t]（稠密陣列）"""
+    vocab: Dict[Hashable, int] = {}
+    a = _count_matrix(left, vocab)
+    b = _count_matrix(right, vocab)
+    shape = len(vocab) or 1
+    a_mat = sparse.csr_matrix((a[2], a[1], a[0]), shape=(len(left), shape), dtype=np.float64)
+    b_mat = sparse.csr_matrix((b[2], b[1], b[0]), shape=(len(right), shape), dtype=np.float64)
+    return (a_mat @ b_mat.T).toarray()
+
+
+def _ones(keys) -> Dict[Hashable, int]:
+    return dict.fromkeys(keys, 1)
+
+
+def similarity_upper_bounds(candidates: Sequence[TitleFeatures], references: Sequence[TitleFeatures]):
+    """
+    title_similarity(candidates[i], references[j]) 的上界矩陣（len(candidates) × len(references)）
+
+    完全相同（1.0）與互相包含（0.85）的配對直接給 1.0。
+    """
+    n, m = len(candidates), len(references)
+    if not n or not m:
+        return np.zeros((n, m))
+
+    inter = _pair_products([_ones(f.ids) for f in candidates], [_ones(f.ids) for f in references])
+    dot = _pair_products([dict(zip(f.ids, f.counts)) for f in candidates], [dict(zip(f.ids, f.counts)) for f in references])
+    common_numbers = _pair_products([_ones(f.numbers) for f in candidates], [_ones(f.numbers) for f in references])
+    common_long = _pair_products(
+        [_ones(i for i in f.ids if i & 1) for f in candidates],
+        [_ones(i for i in f.ids if i & 1) for f in references],
+    )
+
+    def column(values):
+        return np.array(values, dtype=np.float64)[:, None]
+
+    def row(values):
+        return np.array(values, dtype=np.float64)[None, :]
+
+    set_a, set_b = column([len(f.ids) for f in candidates]), row([len(f.ids) for f in references])
+    mag_a, mag_b = column([f.vec_magnitude for f in candidates]), row([f.vec_magnitude for f in references])
+    num_a, num_b = column([len(f.numbers) for f in candidates]), row([len(f.numbers) for f in references])
+    len_a, len_b = column([len(f.clean_text) for f in candidates]), row([len(f.clean_text) for f in references])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        union = set_a + set_b - inter
+        jaccard = np.where(union > 0, inter / union, 0.0)
+        cosine = np.where((mag_a > 0) & (mag_b > 0), dot / (mag_a * mag_b), 0.0)
+        has_numbers = (num_a > 0) & (num_b > 0)
+        number_union = num_a + num_b - common_numbers
+        number_match = np.where(has_numbers & (number_union > 0), common_numbers / number_union, 0.0)
+        total_len = len_a + len_b
+        lcs_bound = np.where(total_len > 0, 2.0 * np.minimum(len_a, len_b) / total_len, 0.0)
+
+    combined = jaccard * 0.35 + cosine * 0.30 + lcs_bound * 0.25 + number_match * 0.10 + _EPSILON
+
+    # 共同實體加分：combined 落在 [0.15, 0.7) 時加分（上限 0.85）；不確定 LCS 落點，取兩者較大
+    boost = np.where(inter >= 3, 0.30, np.where(inter >= 2, 0.25, 0.20))
+    entity = (common_long >= 2) & (combined >= 0.15)
+    bound = np.where(entity, np.maximum(combined, np.minimum(combined + boost, 0.85)), combined)
+
+    # 數字匹配加分（+0.15，上限 0.9）
+    numbers = has_numbers & (number_match >= 0.5) & (inter >= 1)
+    bound = np.where(numbers, np.maximum(bound, np.minimum(bound + 0.15, 0.9)), bound)
+
+    # 沒有詞的標題，_feature_similarity 回傳 0
+    bound = np.where((set_a > 0) & (set_b > 0), bound, 0.0)
+
+    # 完全相同或互相包含時 title_similarity 不經過特徵比對。
+    # 子字串的每個字元雙字組都出現在另一方，因此先以共同雙字組數找出可能包含的配對，
+    # 只有這些配對才逐一以字串比對確認
+    norms_a = [_similarity_text(f.text) for f in candidates]
+    norms_b = [_similarity_text(f.text) for f in references]
+    bigrams_a = [_ones(_char_bigrams(t)) for t in norms_a]
+    bigrams_b = [_ones(_char_bigrams(t)) for t in norms_b]
+    shared = _pair_products(bigrams_a, bigrams_b)
+    possible = (shared >= column([len(g) for g in bigrams_a])) | (shared >= row([len(g) for g in bigrams_b]))
+    for i, j in zip(*np.nonzero(possible)):
+        if norms_a[i] in norms_b[j] or norms_b[j] in norms_a[i]:
+            bound[i, j] = 1.0
+    return bound
+
+
+def pairs_above(candidates: Sequence[TitleFeatures], references: Sequence[TitleFeatures], threshold: float) -> List[List[int]]:
+    """每個候選中，上界達到 threshold 的參考索引（依參考順序）"""
+    bound = similarity_upper_bounds(candidates, references)
+    return [np.flatnonzero(bound[i] >= threshold).tolist() for i in range(len(candidates))]
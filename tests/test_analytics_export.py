@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+測試欄式匯出：依日期切批、唯讀連線，以及（已安裝 pyarrow 時）Parquet 分區往返
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import pytest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics_export
+import main
+from main import Event, Repository, Signal
+
+
+def test_day_batches_split_on_day_and_size():
+    rows = [("2026-10-18", 1), ("2026-10-18", 2), ("2026-10-18", 3), ("2026-10-19", 4)]
+    batches = list(analytics_export.iter_day_batches(rows, batch_rows=2))
+    assert batches == [
+        ("2026-10-18", [(1,), (2,)], False),
+        ("2026-10-18", [(3,)], True),
+        ("2026-10-19", [(4,)], True),
+    ]
+    # 剛好切滿一批就換日時，前一天仍要收尾
+    batches = list(analytics_export.iter_day_batches(rows[:2] + rows[3:], batch_rows=2))
+    assert [(day, last) for day, _, last in batches] == [("2026-10-18", False), ("2026-10-18", True), ("2026-10-19", True)]
+    assert list(analytics_export.iter_day_batches([])) == []
+
+
+def test_readonly_connection_cannot_write():
+    path = os.path.join(tempfile.mkdtemp(), "newsfollow.db")
+    Repository(path).close()
+    conn = analytics_export.connect_readonly(path)
+    try:
+        conn.execute("DELETE FROM runs")
+        raise AssertionError("read-only connection accepted a write")
+    except sqlite3.OperationalError:
+        pass
+    finally:
+        conn.close()
+
+
+def test_export_command_skips_app_setup():
+    tmp = tempfile.mkdtemp()
+    config = os.path.join(tmp, "config.yaml")
+    with open(config, "w", encoding="utf-8") as f:
+        f.write(f"database_path: {os.path.join(tmp, 'newsfollow.db')}\n")
+    calls = []
+
+    def no_app(cfg):
+        raise AssertionError("export built a MonitorApp")
+
+    saved = (main.MonitorApp, analytics_export.export, sys.argv)
+    main.MonitorApp = no_app
+    analytics_export.export = lambda db_path, out, **kwargs: calls.append((db_path, out)) or {}
+    sys.argv = ["main.py", "--config", config, "export", "--out", os.path.join(tmp, "analytics")]
+    try:
+        assert main.main() == 0
+    finally:
+        main.MonitorApp, analytics_export.export, sys.argv = saved
+    assert calls == [(os.path.join(tmp, "newsfollow.db"), os.path.join(tmp, "analytics"))]
+
+
+def test_parquet_roundtrip():
+    pytest.importorskip("pyarrow")
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "newsfollow.db")
+    repo = Repository(path)
+    run_id = repo.start_run()
+    signals = [
+        Signal("udn", "UDN", "hot", "台積電股價創新高", "https://udn.com/1", 6, "2026-10-18T01:00:00+00:00"),
+        Signal("tvbs", "TVBS", "hot", "台積電股價再創新高", "https://tvbs.com/1", 5, "2026-10-18T01:00:00+00:00"),
+    ]
+    repo.save_signals(run_id, signals)
+    repo.upsert_events([Event("evt_a", "台積電股價創新高", 11.0, 2, 2, [], signals)])
+    repo.bind_events([Event("evt_a", "台積電股價創新高", 11.0, 2, 2, [], signals)])
+    repo.close()
+
+    out = os.path.join(tmp, "analytics")
+    result = analytics_export.export(path, out)
+    assert sum(result["signals"].values()) == 2
+    assert sum(result["event_articles"].values()) == 2
+
+    table = analytics_export.query(out, "event_articles", columns=["source_id"])
+    assert sorted(table.column("source_id").to_pylist()) == ["tvbs", "udn"]
+
+
+if __name__ == "__main__":
+    test_day_batches_split_on_day_and_size()
+    test_readonly_connection_cannot_write()
+    test_export_command_skips_app_setup()
+    if analytics_export.PYARROW_AVAILABLE:
+        test_parquet_roundtrip()
+    print("✅ 欄式匯出測試通過")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+測試背景資料庫寫入執行緒（有界佇列 + flush 屏障 + 關閉時回滾未完成交易）
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import DatabaseWriter, MonitorApp, Repository, Signal, load_config, now_iso
+
+SOURCE = {
+    "source_id": "demo",
+    "source_name": "Demo",
+    "domain_contains": "news.example.com",
+    "sections": [{"section_id": "hot", "url": "https://news.example.com/hot", "weight": 7, "selectors": ["a"]}],
+}
+
+
+class FakeCrawler:
+    def fetch_html(self, url, timeout=15):
+        return (
+            '<a href="https://news.example.com/story/1">快訊／花蓮外海規模6.5地震 全台有感</a>'
+            '<a href="https://news.example.com/story/2">颱風海上警報發布 北部風雨增強</a>'
+        )
+
+
+def temp_db_path():
+    return os.path.join(tempfile.mkdtemp(), "newsfollow.db")
+
+
+def count(path, table):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_run_once_persists_through_writer():
+    cfg = load_config("/nonexistent.yaml")
+    cfg["database_path"] = temp_db_path()
+    cfg["database_writer"] = {"background": True, "queue_size": 4}
+    cfg["llm"]["enabled"] = False
+    cfg["sources"] = [SOURCE]
+    cfg["event_threshold"] = 5
+    app = MonitorApp(cfg)
+    app.crawler = FakeCrawler()
+    assert app.repo.writer is not None
+
+    first = app.run_once()
+    second = app.run_once()
+    app.close()
+
+    assert first["run_id"] != second["run_id"]
+    path = cfg["database_path"]
+    assert count(path, "runs") == 2
+    assert count(path, "articles") == 2
+    assert count(path, "sightings") == 4
+    assert count(path, "events") == first["events"] == 2
+    assert count(path, "event_articles") == 2
+    assert count(path, "drafts") == 4
+
+
+def test_drafts_are_generated_while_detection_results_commit():
+    cfg = load_config("/nonexistent.yaml")
+    cfg["database_path"] = temp_db_path()
+    cfg["database_writer"] = {"background": True}
+    cfg["llm"]["enabled"] = False
+    cfg["sources"] = [SOURCE]
+    cfg["event_threshold"] = 5
+    app = MonitorApp(cfg)
+    app.crawler = FakeCrawler()
+    writer, steps = app.repo.writer, []
+    submit, flush, generate = writer.submit, writer.flush, app.generator.generate
+    writer.submit = lambda op, *args: (steps.append(getattr(op, "__name__", op)), submit(op, *args))[1]
+    writer.flush = lambda: (steps.append("flush"), flush())[1]
+    app.generator.generate = lambda event: (steps.append("generate"), generate(event))[1]
+
+    app.run_once()
+    app.close()
+
+    first_generate = steps.index("generate")
+    # 偵測結果整筆交易已送入佇列，產生稿件前沒有等待寫入
+    assert steps[:first_generate].count(DatabaseWriter.COMMIT) == 1
+    assert "flush" not in steps[:first_generate]
+    # 只在標記 run 完成之前等待一次
+    assert steps.count("flush") == 1
+    assert steps.index("flush") < len(steps) - 1
+    assert count(cfg["database_path"], "drafts") == 2
+
+
+def test_writer_error_raised_at_flush():
+    repo = Repository(temp_db_path(), background_writer=True)
+    with repo.transaction():
+        repo.save_signals("run_missing", [Signal("udn", "UDN", "hot", "標題", "https://udn.com/1", 5, now_iso())])
+        repo.finish_run("run_skipped", "ok")  # 同一交易中失敗之後的寫入會被略過
+    try:
+        repo.flush()
+        raise AssertionError("flush should re-raise the writer error")
+    except KeyError:
+        pass
+    repo.flush()  # 錯誤只回報一次
+    assert repo.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 0
+    repo.close()
+
+
+def test_failed_commit_keeps_writer_running():
+    path = temp_db_path()
+    setup = sqlite3.connect(path)
+    setup.executescript(
+        """
+        CREATE TABLE parent (id INTEGER PRIMARY KEY);
+        CREATE TABLE child (parent_id INTEGER REFERENCES parent(id) DEFERRABLE INITIALLY DEFERRED);
+        """
+    )
+    setup.close()
+    writer = DatabaseWriter(path, setup=lambda conn: conn.execute("PRAGMA foreign_keys = ON"))
+    insert = lambda conn, parent_id: conn.execute("INSERT INTO child VALUES (?)", (parent_id,))
+
+    # 外鍵延後檢查：COMMIT 時才失敗
+    writer.submit(DatabaseWriter.BEGIN)
+    writer.submit(insert, 1)
+    writer.submit(DatabaseWriter.COMMIT)
+    try:
+        writer.flush()
+        raise AssertionError("flush should re-raise the failed COMMIT")
+    except sqlite3.IntegrityError:
+        pass
+
+    writer.submit(lambda conn: conn.execute("INSERT INTO parent VALUES (1)"))
+    writer.submit(DatabaseWriter.BEGIN)
+    writer.submit(insert, 1)
+    writer.submit(DatabaseWriter.COMMIT)
+    writer.flush()
+    writer.close()
+    assert count(path, "child") == 1
+
+
+def test_stopped_writer_raises_instead_of_blocking():
+    writer = DatabaseWriter(temp_db_path(), queue_size=1)
+    writer.close()
+    for call in (writer.flush, lambda: writer.submit(DatabaseWriter.BEGIN)):
+        try:
+            call()
+            raise AssertionError("expected RuntimeError")
+        except RuntimeError:
+            pass
+
+
+def test_close_rolls_back_unfinished_transaction():
+    path = temp_db_path()
+    repo = Repository(path, background_writer=True)
+    repo.finish_run(repo.start_run(), "ok")
+    try:
+        with repo.transaction():
+            repo.start_run()
+            raise KeyboardInterrupt
+    except KeyboardInterrupt:
+        pass
+    repo.close()
+    assert count(path, "runs") == 1
+
+
+def test_memory_database_writes_inline():
+    repo = Repository(":memory:", background_writer=True)
+    assert repo.writer is None
+    assert repo.save_signals(repo.start_run(), [Signal("udn", "UDN", "hot", "標題", "https://udn.com/1", 5, now_iso())])
+
+
+if __name__ == "__main__":
+    test_run_once_persists_through_writer()
+    test_drafts_are_generated_while_detection_results_commit()
+    test_writer_error_raised_at_flush()
+    test_failed_commit_keeps_writer_running()
+    test_stopped_writer_raises_instead_of_blocking()
+    test_close_rolls_back_unfinished_transaction()
+    test_memory_database_writes_inline()
+    print("✅ 背景寫入測試通過")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+測試 RequestsCrawler 的編碼判斷（HTTP header → meta → 偵測，並依 host 記憶）
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import RequestsCrawler
+
+
+class FakeResponse:
+    def __init__(self, content: bytes, content_type: str = "text/html"):
+        self.content = content
+        self.headers = {"Content-Type": content_type}
+        self.detect_calls = 0
+
+    def raise_for_status(self):
+        pass
+
+    @property
+    def apparent_encoding(self):
+        self.detect_calls += 1
+        return "big5"
+
+
+def make_crawler(responses):
+    crawler = RequestsCrawler()
+    queue = list(responses)
+    crawler.session.get = lambda url, timeout=15, verify=True: queue.pop(0)
+    return crawler
+
+
+def test_header_charset_wins():
+    title = "台積電股價創新高"
+    resp = FakeResponse(title.encode("big5"), "text/html; charset=Big5")
+    crawler = make_crawler([resp])
+
+    assert crawler.fetch_html("https://example.com/a") == title
+    assert crawler.host_encodings["example.com"] == "big5"
+    assert resp.detect_calls == 0
+
+
+def test_meta_charset_remembered_per_host():
+    page = '<html><head><meta charset="utf-8"></head><body>快訊／地震規模6.5</body></html>'
+    first = FakeResponse(page.encode("utf-8"))
+    # 第二頁沒有 meta，也沒有 header charset，應沿用 host 記憶的編碼
+    second = FakeResponse("颱風即將來襲 全台戒備".encode("utf-8"))
+    crawler = make_crawler([first, second])
+
+    assert "快訊／地震規模6.5" in crawler.fetch_html("https://news.example.com/1")
+    assert crawler.fetch_html("https://news.example.com/2") == "颱風即將來襲 全台戒備"
+    assert first.detect_calls == 0
+    assert second.detect_calls == 0
+
+
+def test_detection_runs_once_per_host():
+    first = FakeResponse("黃國昌政見遭打臉".encode("big5"))
+    second = FakeResponse("蘇巧慧回應政見爭議".encode("big5"))
+    crawler = make_crawler([first, second])
+
+    assert crawler.fetch_html("https://big5.example.com/1") == "黃國昌政見遭打臉"
+    assert crawler.fetch_html("https://big5.example.com/2") == "蘇巧慧回應政見爭議"
+    assert first.detect_calls == 1
+    assert second.detect_calls == 0
+
+
+if __name__ == "__main__":
+    test_header_charset_wins()
+    test_meta_charset_remembered_per_host()
+    test_detection_runs_once_per_host()
+    print("✅ 編碼判斷測試通過")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+測試 Repository 連線池：每個執行緒各自的唯讀連線 + 單一序列化寫入連線
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Repository, Signal, now_iso
+
+
+def signals_for(worker, ts):
+    return [
+        Signal("udn", "UDN", "hot", f"第{worker}號執行緒的新聞標題{i}", f"https://udn.com/{worker}/{i}", 5, ts)
+        for i in range(20)
+    ]
+
+
+def run_threads(target, count):
+    errors = []
+
+    def wrapped(i):
+        try:
+            target(i)
+        except Exception as exc:  # 收集後在主執行緒斷言
+            errors.append(exc)
+
+    threads = [threading.Thread(target=wrapped, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == [], errors
+
+
+def test_concurrent_reads_and_serialized_writes():
+    repo = Repository(os.path.join(tempfile.mkdtemp(), "newsfollow.db"))
+    readers = []  # 保留連線物件：執行緒結束後連線會被關閉，id() 可能被重複使用
+
+    def writer(i):
+        for _ in range(5):
+            with repo.transaction():
+                run_id = repo.start_run()
+                repo.save_signals(run_id, signals_for(i, now_iso()))
+                repo.finish_run(run_id, "ok")
+
+    def reader(i):
+        readers.append(repo.pool.reader())
+        for _ in range(20):
+            repo.page_events(limit=5)
+            repo.search_articles("新聞標題")
+            repo.latest_section_urls("udn", "hot")
+
+    run_threads(lambda i: writer(i) if i % 2 else reader(i), 8)
+
+    assert repo.conn.execute("SELECT COUNT(*) FROM runs WHERE status = 'ok'").fetchone()[0] == 20
+    assert repo.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 80
+    assert len({id(conn) for conn in readers}) == 4  # 每個讀取執行緒一條自己的連線
+    assert len(repo.search_articles("新聞標題", limit=100)) == 80
+    repo.close()
+
+
+def test_concurrent_start_run_ids_are_unique():
+    for background_writer in (False, True):
+        repo = Repository(os.path.join(tempfile.mkdtemp(), "newsfollow.db"), background_writer=background_writer)
+        run_ids = []
+        run_threads(lambda i: run_ids.extend(repo.start_run() for _ in range(20)), 8)
+        repo.flush()
+        assert len(set(run_ids)) == 160
+        assert repo.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 160
+        repo.close()
+
+
+def test_reader_connections_are_read_only():
+    repo = Repository(os.path.join(tempfile.mkdtemp(), "newsfollow.db"))
+    try:
+        repo.pool.reader().execute("DELETE FROM runs")
+        raise AssertionError("reader connection accepted a write")
+    except sqlite3.OperationalError:
+        pass
+    repo.close()
+
+
+def test_memory_database_shares_one_connection():
+    repo = Repository(":memory:")
+    repo.save_signals(repo.start_run(), signals_for(0, now_iso()))
+    seen = []
+    run_threads(lambda i: seen.append(len(repo.search_articles("新聞標題", limit=100))), 4)
+    assert seen == [20, 20, 20, 20]
+    assert repo.pool.reader() is repo.conn
+
+
+if __name__ == "__main__":
+    test_concurrent_reads_and_serialized_writes()
+    test_concurrent_start_run_ids_are_unique()
+    test_reader_connections_are_read_only()
+    test_memory_database_shares_one_connection()
+    print("✅ 連線池測試通過")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+測試儀表板 database 模式：讀取監控資料庫最近一次成功 run 的 signals 與事件
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Event, MonitorApp, Repository, Signal, load_config, now_iso
+from news_dashboard import NewsDashboard
+from tests.test_repository import hold_write_lock
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.yaml")
+
+
+def make_dashboard(db_path, max_age=30):
+    d = NewsDashboard(CONFIG_PATH)
+    d.config = dict(d.config, database_path=db_path, dashboard={"mode": "database", "max_run_age_minutes": max_age})
+    return d
+
+
+def record_run(db_path, status="ok"):
+    repo = Repository(db_path)
+    ts = now_iso()
+    signals = [
+        Signal("udn", "UDN", "hot", "台積電股價創新高 外資大買", "https://udn.com/1", 6, ts),
+        Signal("tvbs", "TVBS", "hot", "台積電股價再創新高", "https://tvbs.com/1", 5, ts),
+    ]
+    with repo.transaction():
+        run_id = repo.start_run()
+        repo.save_signals(run_id, signals)
+        repo.upsert_events([Event("evt_a", "台積電股價創新高", 11.0, 2, 2, [], signals)])
+        repo.finish_run(run_id, status)
+    repo.close()
+    return run_id
+
+
+def test_latest_ok_run_grouped_by_source():
+    db_path = os.path.join(tempfile.mkdtemp(), "newsfollow.db")
+    run_id = record_run(db_path)
+    record_run(db_path, status="failed")  # 失敗的 run 不採用
+
+    latest = make_dashboard(db_path).load_latest_run()
+    assert latest["run_id"] == run_id
+    assert [i.title for i in latest["sources"]["UDN"]] == ["台積電股價創新高 外資大買"]
+    assert [i.url for i in latest["sources"]["TVBS"]] == ["https://tvbs.com/1"]
+    assert latest["sources"]["東森新聞"] == []
+    assert [e["event_key"] for e in latest["events"]] == ["evt_a"]
+
+
+def test_missing_or_stale_run_falls_back_to_crawling():
+    db_path = os.path.join(tempfile.mkdtemp(), "newsfollow.db")
+    assert make_dashboard(db_path).load_latest_run() is None
+
+    record_run(db_path)
+    assert make_dashboard(db_path, max_age=0).load_latest_run() is None
+
+
+def test_reads_while_monitor_holds_write_lock():
+    db_path = os.path.join(tempfile.mkdtemp(), "newsfollow.db")
+    run_id = record_run(db_path)
+    d = make_dashboard(db_path)
+    holder = hold_write_lock(db_path)
+    try:
+        assert d.load_latest_run()["run_id"] == run_id
+        assert [r["title"] for r in d.repo.search_articles("台積電", limit=5)]
+    finally:
+        holder.rollback()
+        holder.close()
+    try:
+        d.repo.conn.execute("DELETE FROM runs")
+        raise AssertionError("dashboard connection accepted a write")
+    except sqlite3.OperationalError:
+        pass
+
+
+def test_missing_database_is_not_created():
+    db_path = os.path.join(tempfile.mkdtemp(), "newsfollow.db")
+    assert make_dashboard(db_path).load_latest_run() is None
+    assert not os.path.exists(db_path)
+
+
+def test_monitor_applies_exclude_patterns_like_crawl_mode():
+    db_path = os.path.join(tempfile.mkdtemp(), "newsfollow.db")
+    source = {
+        "source_id": "tvbs",
+        "source_name": "TVBS",
+        "domain_contains": "news.tvbs.com.tw",
+        "exclude_patterns": ["/english"],
+        "sections": [{"section_id": "homepage", "url": "https://news.tvbs.com.tw/", "weight": 5, "selectors": ["a"]}],
+    }
+
+    class FakeCrawler:
+        def fetch_html(self, url, timeout=15):
+            return (
+                '<a href="https://news.tvbs.com.tw/politics/1">立法院三讀通過預算案 朝野協商破局</a>'
+                '<a href="https://news.tvbs.com.tw/english/2">Typhoon warning issued for northern Taiwan</a>'
+            )
+
+    cfg = load_config("/nonexistent.yaml")
+    cfg.update(database_path=db_path, sources=[source])
+    cfg["llm"]["enabled"] = False
+    app = MonitorApp(cfg)
+    app.crawler = FakeCrawler()
+    app.run_once()
+    app.close()
+
+    d = make_dashboard(db_path)
+    d.crawler = FakeCrawler()
+    crawled = [i.url for i in d.crawl_source(source)]
+    stored = [i.url for i in d.load_latest_run()["sources"]["TVBS"]]
+    assert stored == crawled == ["https://news.tvbs.com.tw/politics/1"]
+
+
+if __name__ == "__main__":
+    test_latest_ok_run_grouped_by_source()
+    test_missing_or_stale_run_falls_back_to_crawling()
+    test_reads_while_monitor_holds_write_lock()
+    test_missing_database_is_not_created()
+    test_monitor_applies_exclude_patterns_like_crawl_mode()
+    print("✅ 儀表板 database 模式測試通過")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+測試 detect_events 以預先計算的 TitleFeatures 分群：結果與逐次字串比對一致，且每個標題只計算一次特徵；
+倒排索引只挑候選群，分群結果須與逐一比對完全相同
+"""
+
+import sys
+import os
+import json
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from main import Signal, compute_title_features, detect_events, now_iso, title_similarity
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "ettoday.json")
+
+TITLES = [
+    "黃國昌政見遭打臉！蘇巧慧這麼說",
+    "蘇巧慧回應黃國昌政見爭議",
+    "黃國昌vs蘇巧慧政見論戰",
+    "NONO性侵案失業2年",
+    "NONO捲性侵案2年失業！愛妻朱海君近況曝",
+    "台積電股價創新高",
+    "台積電股價創新高 外資大買",
+    "颱風海上警報發布 北部風雨增強",
+    "台積電股價創新高",
+]
+
+
+def make_signals():
+    ts = now_iso()
+    sources = ["udn", "tvbs", "setn"]
+    return [
+        Signal(sources[i % 3], sources[i % 3], "hot", title, f"https://example.com/{i}", 5, ts)
+        for i, title in enumerate(TITLES)
+    ]
+
+
+def legacy_clusters(signals, similarity_threshold):
+    clusters, representatives = [], []
+    for signal in signals:
+        placed = False
+        for i, rep in enumerate(representatives):
+            if title_similarity(signal.title, rep) >= similarity_threshold:
+                clusters[i].append(signal)
+                if len(signal.title) > len(rep):
+                    representatives[i] = signal.title
+                placed = True
+                break
+        if not placed:
+            clusters.append([signal])
+            representatives.append(signal.title)
+    return clusters
+
+
+def recorded_signals():
+    """快取的 ETtoday 標題，加上改寫過的版本（加前綴、截短、換數字）模擬其他來源"""
+    with open(CACHE_PATH, "r", encoding="utf-8") as f:
+        titles = [item["title"] for item in json.load(f)["data"]]
+    variants = []
+    for i, title in enumerate(titles):
+        variants.append(title)
+        if i % 2 == 0:
+            variants.append("快訊／" + title)
+        if i % 3 == 0:
+            variants.append(title[: max(len(title) * 2 // 3, 1)])
+        if i % 5 == 0:
+            variants.append(title.replace("1", "2") + " 最新")
+    variants += ["   ", "台", "台積電", "台積電股價"]
+    ts = now_iso()
+    return [Signal("src%d" % (i % 4), "src", "hot", t, f"https://example.com/{i}", 5, ts) for i, t in enumerate(variants)]
+
+
+def full_scan_clusters(signals, similarity_threshold):
+    clusters, representatives = [], []
+    for signal in signals:
+        if not signal.title:
+            continue
+        feature = compute_title_features(signal.title) if main.title_features_available() else signal.title
+        placed = False
+        for i, rep in enumerate(representatives):
+            if title_similarity(feature, rep) >= similarity_threshold:
+                clusters[i].append(signal)
+                if len(signal.title) > len(main._feature_text(rep)):
+                    representatives[i] = feature
+                placed = True
+                break
+        if not placed:
+            clusters.append([signal])
+            representatives.append(feature)
+    return clusters
+
+
+def test_clusters_match_string_comparison():
+    signals = make_signals()
+    for threshold in (0.3, 0.5, 0.7):
+        expected = sorted(sorted(s.url for s in c) for c in legacy_clusters(signals, threshold))
+        events = detect_events(signals, score_threshold=0, similarity_threshold=threshold)
+        assert sorted(sorted(s.url for s in e.signals) for e in events) == expected
+
+
+def test_inverted_index_matches_full_scan_on_recorded_titles():
+    signals = recorded_signals()
+    for threshold in (0.2, 0.5, 0.86):
+        expected = [[s.url for s in c] for c in full_scan_clusters(signals, threshold)]
+        events = detect_events(signals, score_threshold=0, similarity_threshold=threshold)
+        assert len(events) == len(expected), threshold
+        assert sorted(sorted(s.url for s in e.signals) for e in events) == sorted(sorted(c) for c in expected)
+
+
+def test_features_computed_once_per_title():
+    calls = []
+    original = main.compute_title_features
+
+    def counting(text):
+        calls.append(text)
+        return original(text)
+
+    main.compute_title_features = counting
+    saved_cache, main.TITLE_FEATURE_CACHE = main.TITLE_FEATURE_CACHE, main.TitleFeatureCache()
+    try:
+        detect_events(make_signals(), score_threshold=0, similarity_threshold=0.5)
+    finally:
+        main.compute_title_features = original
+        main.TITLE_FEATURE_CACHE = saved_cache
+    if main.title_features_available():
+        assert sorted(calls) == sorted(set(TITLES))
+
+
+if __name__ == "__main__":
+    test_clusters_match_string_comparison()
+    test_inverted_index_matches_full_scan_on_recorded_titles()
+    test_features_computed_once_per_title()
+    print("✅ detect_events 特徵分群測試通過")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+測試標題特徵快取：命中時不重新分詞、依記憶體上限淘汰最久未用的項目、存檔後重新載入的特徵與原本相同
+"""
+
+import sys
+import os
+import gzip
+import json
+import tempfile
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from main import TitleFeatureCache, compute_title_features, title_similarity
+from tests.test_detect_events import recorded_signals
+
+
+def test_hits_skip_tokenization():
+    cache = TitleFeatureCache()
+    calls = []
+    original = main.compute_title_features
+    main.compute_title_features = lambda text: calls.append(text) or original(text)
+    try:
+        first = cache.get("颱風海上警報發布 北部風雨增強")
+        second = cache.get("颱風海上警報發布 北部風雨增強")
+    finally:
+        main.compute_title_features = original
+    assert first is second
+    assert calls == ["颱風海上警報發布 北部風雨增強"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_budget_evicts_least_recently_used():
+    titles = sorted({s.title for s in recorded_signals()})[:60]
+    cache = TitleFeatureCache()
+    for title in titles:
+        cache.get(title)
+    full = cache.bytes
+
+    cache = TitleFeatureCache(max_bytes=full // 3)
+    for title in titles:
+        cache.get(title)
+        cache.get(titles[0])  # 一直被使用的標題不會被淘汰
+    assert 0 < cache.bytes <= full // 3
+    assert len(cache) < len(titles)
+    cache.hits = 0
+    cache.get(titles[0])
+    cache.get(titles[-1])
+    assert cache.hits == 2
+    cache.get(titles[1])
+    assert cache.misses == len(titles) + 1
+
+    cache.resize(0)
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_budget_covers_feature_memory():
+    # ngram 模式不經過 jieba（jieba 內部另有自己的記憶體），只量測快取本身
+    budget = 64 * 1024
+    main.set_tokenizer_mode("ngram")
+    try:
+        cache = TitleFeatureCache(max_bytes=budget)
+        for i in range(3000):  # 填滿快取，也讓直譯器的 tuple 空閒串列先填滿
+            cache.get(f"台積電股價創新高{i} 外資大買 {i}%")
+        tracemalloc.start()
+        try:
+            for i in range(10000, 13000):
+                cache.get(f"台積電股價創新高{i} 外資大買 {i}%")  # 每個標題都有新詞
+            retained = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+    finally:
+        main.set_tokenizer_mode("jieba")
+    # 留下的只有取代舊項目的新項目，沒有其他隨新詞增長的結構
+    assert cache.bytes <= budget
+    assert retained <= 1.05 * budget
+
+
+def test_save_and_load_round_trip():
+    titles = sorted({s.title for s in recorded_signals()})
+    cache = TitleFeatureCache()
+    for title in titles:
+        cache.get(title)
+    path = os.path.join(tempfile.mkdtemp(), "cache", "title_features.jsonl.gz")
+    assert cache.save(path) == len(titles)
+    assert not cache.dirty
+
+    loaded = TitleFeatureCache()
+    assert loaded.load(path) == len(titles)
+    assert loaded.bytes == cache.bytes and not loaded.dirty
+    for title in titles:
+        f = loaded.get(title)
+        expected = compute_title_features(title)
+        assert (list(f.ids), list(f.counts)) == (list(expected.ids), list(expected.counts))
+        assert (f.clean_text, f.numbers, f.vec_magnitude) == (expected.clean_text, expected.numbers, expected.vec_magnitude)
+    assert loaded.misses == 0
+    for i in range(0, len(titles), 7):
+        for j in range(i + 1, len(titles), 11):
+            a, b = titles[i], titles[j]
+            assert title_similarity(loaded.get(a), loaded.get(b)) == title_similarity(a, b)
+
+    assert TitleFeatureCache().load(path + ".missing") == 0
+
+
+def test_loads_files_that_saved_tokens():
+    path = os.path.join(tempfile.mkdtemp(), "title_features.jsonl.gz")
+    title = "颱風海上警報發布 北部風雨增強"
+    expected = compute_title_features(title)
+    with gzip.open(path, "wt", encoding="utf-8") as f:  # 改用詞 id 之前的格式
+        f.write(json.dumps({"tokenizer": "jieba"}) + "\n")
+        tokens = [[t, n] for t, n in expected.token_counter.items()]
+        f.write(json.dumps({"text": title, "tokens": tokens, "numbers": []}, ensure_ascii=False) + "\n")
+    cache = TitleFeatureCache()
+    assert cache.load(path) == 1
+    assert (list(cache.get(title).ids), list(cache.get(title).counts)) == (list(expected.ids), list(expected.counts))
+
+
+def test_configure_tolerates_corrupt_file():
+    path = os.path.join(tempfile.mkdtemp(), "title_features.jsonl.gz")
+    with open(path, "wb") as f:
+        f.write(b"not gzip")
+    saved = main.TITLE_FEATURE_CACHE
+    main.TITLE_FEATURE_CACHE = TitleFeatureCache()
+    try:
+        assert main.configure_feature_cache({"feature_cache_mb": 1, "feature_cache_path": path}) == path
+        assert main.TITLE_FEATURE_CACHE.max_bytes == 1024 * 1024 and len(main.TITLE_FEATURE_CACHE) == 0
+        main.cached_title_features("台積電股價創新高 外資大買")
+        main.save_feature_cache(path)
+        assert TitleFeatureCache().load(path) == 1
+    finally:
+        main.TITLE_FEATURE_CACHE = saved
+
+
+if __name__ == "__main__":
+    test_hits_skip_tokenization()
+    test_budget_evicts_least_recently_used()
+    test_budget_covers_feature_memory()
+    test_save_and_load_round_trip()
+    test_loads_files_that_saved_tokens()
+    test_configure_tolerates_corrupt_file()
+    print("✅ 標題特徵快取測試通過")
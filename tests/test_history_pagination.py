@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+測試事件 / 草稿 / 發布紀錄的 keyset 分頁與索引使用
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Repository
+
+TS = "2026-10-19T00:00:00+00:00"
+
+
+def make_repo():
+    repo = Repository(":memory:")
+    for i in range(7):
+        # 前四個事件 last_seen 相同，分頁需靠 event_key 決定順序
+        last_seen = TS if i < 4 else f"2026-10-19T0{i}:00:00+00:00"
+        repo.conn.execute(
+            "INSERT INTO events (event_key, canonical_title, score, source_count, signal_count, first_seen, last_seen) "
+            "VALUES (?, ?, 10, 2, 3, ?, ?)",
+            (f"evt_{i}", f"事件{i}", TS, last_seen),
+        )
+        for _ in range(2):
+            repo.save_draft(f"evt_{i}", {"title": f"草稿{i}", "body": "內文"})
+            repo.save_publish_log(f"evt_{i}", {"status": "ok", "external_id": f"ext_{i}"})
+    return repo
+
+
+def walk(page_fn, limit, **kwargs):
+    pages, cursor = [], ""
+    while True:
+        rows, cursor = page_fn(limit=limit, cursor=cursor, **kwargs)
+        pages.append(rows)
+        if not cursor:
+            return pages
+
+
+def test_events_pages_cover_every_row_once():
+    repo = make_repo()
+    pages = walk(repo.page_events, 3)
+    keys = [r["event_key"] for page in pages for r in page]
+    assert keys == ["evt_6", "evt_5", "evt_4", "evt_3", "evt_2", "evt_1", "evt_0"]
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert [r["event_key"] for r in repo.list_recent_events(limit=2)] == ["evt_6", "evt_5"]
+
+
+def test_drafts_and_logs_pages_with_event_filter():
+    repo = make_repo()
+    drafts = [r["id"] for page in walk(repo.page_drafts, 4) for r in page]
+    assert len(drafts) == 14 and len(set(drafts)) == 14
+    assert drafts == sorted(drafts, reverse=True)  # 同一秒產生時以 id 排序
+
+    one = [r for page in walk(repo.page_drafts, 1, event_key="evt_3") for r in page]
+    assert [r["event_key"] for r in one] == ["evt_3", "evt_3"] and one[0]["score"] == 10
+
+    logs = [r["external_id"] for page in walk(repo.page_publish_logs, 5, event_key="evt_5") for r in page]
+    assert logs == ["ext_5", "ext_5"]
+
+
+def test_invalid_cursor_rejected():
+    repo = make_repo()
+    try:
+        repo.page_events(cursor="not-a-cursor")
+        raise AssertionError("invalid cursor should raise ValueError")
+    except ValueError:
+        pass
+
+
+def test_event_pages_use_covering_index():
+    repo = make_repo()
+    plan = " ".join(
+        r[3] for r in repo.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT event_key, canonical_title, score, source_count, signal_count, first_seen, "
+            "last_seen, status FROM events WHERE (last_seen, event_key) < (?, ?) "
+            "ORDER BY last_seen DESC, event_key DESC LIMIT 20",
+            (TS, "evt_9"),
+        )
+    )
+    assert "COVERING INDEX idx_events_last_seen" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+if __name__ == "__main__":
+    test_events_pages_cover_every_row_once()
+    test_drafts_and_logs_pages_with_event_filter()
+    test_invalid_cursor_rejected()
+    test_event_pages_use_covering_index()
+    print("✅ keyset 分頁測試通過")
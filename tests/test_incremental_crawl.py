@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+測試列表頁增量爬取（翻頁直到遇到上一輪已見過的文章網址）
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import MonitorApp, load_config, now_iso
+
+SECTION = {
+    "section_id": "realtime",
+    "url": "https://news.example.com/list/1",
+    "weight": 6,
+    "max_items": 3,
+    "selectors": ["a"],
+    "pagination": {"url_template": "https://news.example.com/list/{page}", "max_pages": 4},
+}
+SOURCE = {"source_id": "demo", "source_name": "Demo", "domain_contains": "news.example.com", "sections": [SECTION]}
+
+
+def page_html(article_ids):
+    links = "".join(
+        f'<a href="https://news.example.com/story/{i}">即時新聞標題第{i}則 最新消息</a>' for i in article_ids
+    )
+    return f"<html><body>{links}</body></html>"
+
+
+class FakeCrawler:
+    def __init__(self, pages):
+        self.pages = pages
+        self.fetched = []
+
+    def fetch_html(self, url, timeout=15):
+        self.fetched.append(url)
+        return page_html(self.pages[url])
+
+
+def make_app(pages):
+    cfg = load_config("/nonexistent.yaml")
+    cfg["database_path"] = ":memory:"
+    cfg["sources"] = [SOURCE]
+    app = MonitorApp(cfg)
+    app.crawler = FakeCrawler(pages)
+    return app
+
+
+def test_first_cycle_fetches_only_first_page():
+    app = make_app({"https://news.example.com/list/1": [10, 9, 8]})
+    signals = app.crawl_section(SOURCE, SECTION, now_iso())
+
+    assert len(signals) == 3
+    assert app.crawler.fetched == ["https://news.example.com/list/1"]
+
+
+def test_follows_pages_until_high_water_mark():
+    app = make_app({"https://news.example.com/list/1": [10, 9, 8]})
+    app.crawl_section(SOURCE, SECTION, now_iso())
+
+    # 新聞爆量：第 1、2 頁都是新文章，第 3 頁才遇到上一輪看過的 #10
+    app.crawler = FakeCrawler({
+        "https://news.example.com/list/1": [16, 15, 14],
+        "https://news.example.com/list/2": [13, 12, 11],
+        "https://news.example.com/list/3": [10, 9, 8],
+        "https://news.example.com/list/4": [7, 6, 5],
+    })
+    signals = app.crawl_section(SOURCE, SECTION, now_iso())
+
+    assert app.crawler.fetched == [
+        "https://news.example.com/list/1",
+        "https://news.example.com/list/2",
+        "https://news.example.com/list/3",
+    ]
+    assert len(signals) == 9
+
+
+def test_high_water_mark_seeded_from_repository():
+    app = make_app({"https://news.example.com/list/1": [10, 9, 8]})
+    run_id = app.repo.start_run()
+    app.repo.save_signals(run_id, app.crawl_section(SOURCE, SECTION, now_iso()))
+    app.high_water_urls.clear()  # 模擬程序重啟
+
+    app.crawler = FakeCrawler({
+        "https://news.example.com/list/1": [12, 11, 10],
+        "https://news.example.com/list/2": [9, 8, 7],
+    })
+    app.crawl_section(SOURCE, SECTION, now_iso())
+
+    assert app.crawler.fetched == ["https://news.example.com/list/1"]
+
+
+if __name__ == "__main__":
+    test_first_cycle_fetches_only_first_page()
+    test_follows_pages_until_high_water_mark()
+    test_high_water_mark_seeded_from_repository()
+    print("✅ 增量爬取測試通過")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+測試 MinHash/LSH 近似重複候選產生器、match_titles，以及與 detect_events 相同的 recluster
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import near_duplicates
+from main import Repository, Signal, detect_events, now_iso
+from near_duplicates import MinHashLSH, match_titles, recluster, title_features
+from tests.test_detect_events import recorded_signals
+
+TITLES = [
+    "NONO捲性侵案2年失業！愛妻朱海君近況曝",
+    "颱風海上警報發布 北部風雨增強",
+    "NONO性侵案失業2年 妻子朱海君現況",
+    "台積電股價創新高 外資大買",
+    "颱風海上警報發布　北部風雨持續增強",
+    "台積電股價創新高",
+]
+
+
+def test_signature_same_with_and_without_numpy():
+    lsh = MinHashLSH(num_perm=32, bands=16)
+    feature = title_features(TITLES[0])
+    with_numpy = lsh.signature(feature)
+    available = near_duplicates.NUMPY_AVAILABLE
+    near_duplicates.NUMPY_AVAILABLE = False
+    try:
+        assert lsh.signature(feature) == with_numpy
+    finally:
+        near_duplicates.NUMPY_AVAILABLE = available
+    assert len(with_numpy) == 32
+    assert lsh.signature(title_features("！？")) is None
+
+
+def test_recluster_groups_near_duplicates():
+    clusters = recluster(TITLES + ["", "！？"], 0.5)
+    assert sorted(sorted(c) for c in clusters) == [[0, 2], [1, 4], [3, 5], [7]]
+
+
+def test_recluster_matches_detect_events_on_recorded_titles():
+    signals = recorded_signals()
+    position = {id(s): i for i, s in enumerate(signals)}
+    exact = sorted(sorted(position[id(s)] for s in e.signals) for e in detect_events(signals, 0, 0.5))
+    assert sorted(recluster([s.title for s in signals], 0.5)) == exact
+
+
+def test_match_titles_across_runs():
+    known = [(10, TITLES[0]), (11, TITLES[1]), (12, TITLES[3])]
+    matches = match_titles(known, [TITLES[2], TITLES[4], "地震規模6.5 全台有感"], 0.5)
+    assert [k for k, _ in matches[0]] == [10]
+    assert [k for k, _ in matches[1]] == [11]
+    assert matches[2] == []
+
+
+def test_articles_seen_since():
+    repo = Repository(":memory:")
+    ts = now_iso()
+    repo.save_signals(repo.start_run(), [
+        Signal("udn", "UDN", "hot", TITLES[0], "https://udn.com/1", 5, ts),
+        Signal("tvbs", "TVBS", "hot", TITLES[2], "https://tvbs.com/1", 5, ts),
+    ])
+    assert [r["url"] for r in repo.articles_seen_since(ts[:10])] == ["https://udn.com/1", "https://tvbs.com/1"]
+    assert repo.articles_seen_since("9999") == []
+
+
+if __name__ == "__main__":
+    test_signature_same_with_and_without_numpy()
+    test_recluster_groups_near_duplicates()
+    test_recluster_matches_detect_events_on_recorded_titles()
+    test_match_titles_across_runs()
+    test_articles_seen_since()
+    print("✅ MinHash/LSH 近似重複測試通過")
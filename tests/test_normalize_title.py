@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+驗證正規表示式版 normalize_title / compact_space 與舊版逐字元迴圈輸出完全一致
+"""
+
+import sys
+import os
+import json
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import compact_space, normalize_title, normalize_titles
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "ettoday.json")
+
+
+def legacy_compact_space(text):
+    return " ".join(text.split())
+
+
+def legacy_normalize_title(text):
+    keep = []
+    for ch in legacy_compact_space(text).lower():
+        if ch.isalnum():
+            keep.append(ch)
+        elif "一" <= ch <= "鿿":
+            keep.append(ch)
+    return "".join(keep)
+
+
+def stored_titles():
+    with open(CACHE_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)["data"]
+    return [item["title"] for item in data]
+
+
+def all_code_points():
+    return [chr(i) for i in range(sys.maxunicode + 1) if not 0xD800 <= i <= 0xDFFF]
+
+
+def test_stored_titles_match_legacy():
+    titles = stored_titles()
+    assert titles
+    for title in titles:
+        assert normalize_title(title) == legacy_normalize_title(title)
+        assert compact_space(title) == legacy_compact_space(title)
+    assert normalize_titles(titles) == [legacy_normalize_title(t) for t in titles]
+
+
+def test_every_code_point_matches_legacy():
+    chars = all_code_points()
+    for ch in chars:
+        text = f" 台積電{ch}  A{ch}\t"
+        assert normalize_title(text) == legacy_normalize_title(text), repr(text)
+        assert compact_space(text) == legacy_compact_space(text), repr(text)
+        for short in (ch, f"A{ch}B"):
+            assert compact_space(short) == legacy_compact_space(short), repr(short)
+
+
+def test_bulk_api_edge_cases():
+    titles = [
+        "ΟΔΟΣ ΣΑΣ",          # final sigma depends on neighbouring characters
+        "",
+        "多行\n標題\r\n測試",   # embedded newlines fall back to per-title path
+        "snake_case_Title 2026",
+        "快訊／寇世勳道歉！　重磅喊話",
+    ]
+    assert normalize_titles(titles) == [legacy_normalize_title(t) for t in titles]
+    assert normalize_titles(["ΣΑΣ", "Σ"]) == [legacy_normalize_title("ΣΑΣ"), legacy_normalize_title("Σ")]
+    assert normalize_titles([]) == []
+
+
+if __name__ == "__main__":
+    test_stored_titles_match_legacy()
+    test_every_code_point_matches_legacy()
+    test_bulk_api_edge_cases()
+    print("✅ normalize_title 等價性測試通過")
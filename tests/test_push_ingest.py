@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+測試手機推播接收端點（HTTP → 有界佇列 → Signal）
+"""
+
+import sys
+import os
+import datetime as dt
+import json
+import urllib.error
+import urllib.request
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import MobilePushMonitor, MonitorApp, load_config, now_iso
+
+
+def post(monitor, payload, path="/push", headers=None):
+    host, port = monitor.address[:2]
+    req = urllib.request.Request(
+        f"http://{host}:{port}{path}",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json", **(headers or {})},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_push_endpoint_queues_signals():
+    monitor = MobilePushMonitor({"port": 0, "queue_size": 2, "immediate_run": True})
+    monitor.start()
+    try:
+        status, body = post(monitor, {"alerts": [
+            {"title": "快訊／花蓮外海規模6.5地震 全台有感", "source_id": "cna_app"},
+        ]})
+        assert status == 202 and body["accepted"] == 1
+        assert monitor.wait(1.0) is True
+
+        status, _ = post(monitor, {"url": "https://example.com/1"})
+        assert status == 400
+
+        # 佇列只剩一格：整批都不收，重送不會重複
+        status, body = post(monitor, [{"title": "颱風海上警報發布 北部風雨增強"}, {"title": "放不下的第二則推播"}])
+        assert status == 429 and body["accepted"] == 0
+        assert monitor.queue.qsize() == 1
+
+        post(monitor, {"title": "颱風海上警報發布 北部風雨增強"})
+        status, _ = post(monitor, {"title": "佇列已滿時應回應 429 的推播"})
+        assert status == 429
+
+        signals = monitor.collect()
+        assert [s.source_id for s in signals] == ["cna_app", "push"]
+        assert signals[0].section_id == "push"
+        assert signals[0].url.startswith("push://cna_app/")
+        assert monitor.queue.qsize() == 0
+    finally:
+        monitor.stop()
+
+
+def test_push_token_required():
+    monitor = MobilePushMonitor({"port": 0, "token": "s3cret"})
+    monitor.start()
+    try:
+        for headers in ({}, {"X-Push-Token": "wrong"}, {"X-Push-Token": "s3cret2"}):
+            status, _ = post(monitor, {"title": "未授權的推播"}, headers=headers)
+            assert status == 401
+        status, body = post(monitor, {"title": "授權的推播"}, headers={"X-Push-Token": "s3cret"})
+        assert status == 202 and body["accepted"] == 1
+    finally:
+        monitor.stop()
+
+
+def test_received_at_is_normalized_to_utc_iso():
+    monitor = MobilePushMonitor({})
+    for received_at in ("2026-03-01T20:30:00+08:00", "2026-03-01T12:30:00Z", "2026-03-01T12:30:00"):
+        monitor.submit({"title": "時間格式正確的推播", "received_at": received_at})
+    assert [s.crawled_at for s in monitor.collect()] == ["2026-03-01T12:30:00+00:00"] * 3
+
+    before = now_iso()
+    for received_at in ("yesterday", "9999-99-99", 1772368200, "", None):
+        signal = monitor._to_signal({"title": "時間格式錯誤的推播", "received_at": received_at})
+        dt.datetime.fromisoformat(signal.crawled_at)  # analytics 匯出會這樣解析
+        assert signal.crawled_at >= before
+
+
+def test_pushed_signals_retained_across_runs():
+    monitor = MobilePushMonitor({"retain_seconds": 900})
+    monitor.submit({"title": "台積電宣布赴美擴廠 投資再加碼"})
+
+    assert len(monitor.collect()) == 1
+    assert len(monitor.collect()) == 1  # 仍在保留時間內
+
+    monitor.retain_seconds = 0
+    monitor._recent = [(t - 1, s) for t, s in monitor._recent]
+    assert monitor.collect() == []
+
+
+def test_push_pass_without_recrawl():
+    cfg = load_config("/nonexistent.yaml")
+    cfg["database_path"] = ":memory:"
+    cfg["llm"]["enabled"] = False
+    cfg["mobile_push"]["enabled"] = True
+    cfg["event_threshold"] = 5
+    app = MonitorApp(cfg)
+
+    class NoCrawl:
+        def fetch_html(self, url, timeout=15):
+            raise AssertionError("push pass must not recrawl")
+
+    app.crawler = NoCrawl()
+    app.push_monitor.submit({"title": "快訊／北市信義區大樓火警 濃煙竄出", "weight": 7})
+    result = app.run_once(recrawl=False)
+
+    assert result["signals"] == 1
+    assert result["events"] == 1
+
+
+if __name__ == "__main__":
+    test_push_endpoint_queues_signals()
+    test_push_token_required()
+    test_received_at_is_normalized_to_utc_iso()
+    test_pushed_signals_retained_across_runs()
+    test_push_pass_without_recrawl()
+    print("✅ 推播接收測試通過")
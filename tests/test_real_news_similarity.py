@@ -105,37 +105,48 @@ def cluster_news(news_list, threshold):
 
 
 # 手動測試案例（來自真實新聞）
-def test_manual_cases():
-    """測試手動準備的案例"""
+# 應該被識別為同一新聞的案例
+SAME_NEWS_PAIRS = [
+    # 黃國昌 vs 蘇巧慧政見爭議
+    ("黃國昌政見遭打臉！蘇巧慧這麼說", "蘇巧慧回應黃國昌政見爭議"),
 
-    print("\n" + "="*80)
-    print("手動測試案例")
-    print("="*80)
+    # 日本大選
+    ("日眾院大選登場！高市有望勝出拿逾300席", "日本眾議院選舉開跑 高市領先有望拿下300席"),
+    ("日本大選決戰日　高市能否大勝定調執政走向", "日本大選決戰　高市衝刺選情"),
+
+    # 火災新聞
+    ("一家7口鐵棺火…焦屍身份曝！母斷腸指路", "火災釀7死慘劇 母親悲痛認屍"),
+
+    # NONO 性侵案
+    ("NONO捲性侵案2年失業！愛妻朱海君近況曝", "NONO性侵案失業2年 妻子朱海君現況"),
 
-    # 應該被識別為同一新聞的案例
-    same_news_pairs = [
-        # 黃國昌 vs 蘇巧慧政見爭議
-        ("黃國昌政見遭打臉！蘇巧慧這麼說", "蘇巧慧回應黃國昌政見爭議"),
+    # 勞保勞退
+    ("勞保＋勞退可月領6萬？40歲開始做對「這2件事」就夠了", "勞保勞退月領6萬 40歲要做這2件事"),
 
-        # 日本大選
-        ("日眾院大選登場！高市有望勝出拿逾300席", "日本眾議院選舉開跑 高市領先有望拿下300席"),
-        ("日本大選決戰日　高市能否大勝定調執政走向", "日本大選決戰　高市衝刺選情"),
+    # 林宅血案
+    ("「世紀血案」倖存者林奐均走出陰影 22年前曾「勇奪金曲獎」", "林宅血案倖存者林奐均奪金曲 22年前往事"),
 
-        # 火災新聞
-        ("一家7口鐵棺火…焦屍身份曝！母斷腸指路", "火災釀7死慘劇 母親悲痛認屍"),
+    # 豆腐媽媽替身
+    ("獨／豆腐媽媽替身命危　楊銘威揭劇組黑幕", "豆腐媽媽替身危急 楊銘威爆料劇組問題"),
+]
 
-        # NONO 性侵案
-        ("NONO捲性侵案2年失業！愛妻朱海君近況曝", "NONO性侵案失業2年 妻子朱海君現況"),
+# 應該被識別為不同新聞的案例
+DIFFERENT_NEWS_PAIRS = [
+    ("台積電股價創新高", "NONO捲性侵案2年失業"),
+    ("黃國昌政見遭打臉", "回宿舍見「6張毛臉貼窗凝視」女大生嚇呆"),
+    ("日本大選登場", "台南過年「住2晚4.5萬」　業者：合理漲價"),
+    ("勞保＋勞退可月領6萬", "獨／豆腐媽媽替身命危　楊銘威揭劇組黑幕"),
+]
 
-        # 勞保勞退
-        ("勞保＋勞退可月領6萬？40歲開始做對「這2件事」就夠了", "勞保勞退月領6萬 40歲要做這2件事"),
 
-        # 林宅血案
-        ("「世紀血案」倖存者林奐均走出陰影 22年前曾「勇奪金曲獎」", "林宅血案倖存者林奐均奪金曲 22年前往事"),
+def test_manual_cases():
+    """測試手動準備的案例"""
+
+    print("\n" + "="*80)
+    print("手動測試案例")
+    print("="*80)
 
-        # 豆腐媽媽替身
-        ("獨／豆腐媽媽替身命危　楊銘威揭劇組黑幕", "豆腐媽媽替身危急 楊銘威爆料劇組問題"),
-    ]
+    same_news_pairs = SAME_NEWS_PAIRS
 
     print("\n應該被識別為【同一新聞】:")
     total_same = len(same_news_pairs)
@@ -152,13 +163,7 @@ def test_manual_cases():
         print(f"  1. {t1}")
         print(f"  2. {t2}")
 
-    # 應該被識別為不同新聞的案例
-    different_news_pairs = [
-        ("台積電股價創新高", "NONO捲性侵案2年失業"),
-        ("黃國昌政見遭打臉", "回宿舍見「6張毛臉貼窗凝視」女大生嚇呆"),
-        ("日本大選登場", "台南過年「住2晚4.5萬」　業者：合理漲價"),
-        ("勞保＋勞退可月領6萬", "獨／豆腐媽媽替身命危　楊銘威揭劇組黑幕"),
-    ]
+    different_news_pairs = DIFFERENT_NEWS_PAIRS
 
     print("\n" + "="*80)
     print("應該被識別為【不同新聞】:")
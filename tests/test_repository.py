@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+測試 Repository 儲存模型（articles + sightings）與舊版 signals 資料表遷移
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Event, MonitorApp, Repository, Signal, load_config, now_iso
+from tests.test_background_writer import SOURCE, FakeCrawler
+
+LEGACY_SCHEMA = """
+CREATE TABLE runs (run_id TEXT PRIMARY KEY, started_at TEXT NOT NULL, finished_at TEXT, status TEXT NOT NULL, note TEXT);
+CREATE TABLE signals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, source_id TEXT NOT NULL, source_name TEXT NOT NULL,
+    section_id TEXT NOT NULL, title TEXT NOT NULL, url TEXT NOT NULL, normalized_title TEXT NOT NULL,
+    weight INTEGER NOT NULL, crawled_at TEXT NOT NULL
+);
+CREATE TABLE event_signals (event_key TEXT NOT NULL, signal_id INTEGER NOT NULL, PRIMARY KEY (event_key, signal_id));
+"""
+
+
+def make_signals(crawled_at):
+    return [
+        Signal("udn", "UDN", "homepage", "台積電股價創新高 外資大買", "https://udn.com/1", 5, crawled_at),
+        Signal("udn", "UDN", "realtime", "台積電股價創新高 外資大買", "https://udn.com/1", 6, crawled_at),
+        Signal("tvbs", "TVBS", "hot", "颱風海上警報發布 北部風雨增強", "https://tvbs.com/2", 4, crawled_at),
+    ]
+
+
+def temp_db_path():
+    return os.path.join(tempfile.mkdtemp(), "newsfollow.db")
+
+
+def test_repeated_runs_reuse_article_rows():
+    repo = Repository(":memory:")
+    first = repo.save_signals(repo.start_run(), make_signals(now_iso()))
+    second = repo.save_signals(repo.start_run(), make_signals(now_iso()))
+
+    assert first == second
+    assert first[0] == first[1]  # 同一篇文章出現在兩個版位
+    assert repo.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 2
+    assert repo.conn.execute("SELECT COUNT(*) FROM sightings").fetchone()[0] == 6
+    rows = repo.conn.execute("SELECT section_id, title, weight FROM signals ORDER BY section_id").fetchall()
+    assert [r["section_id"] for r in rows] == ["homepage", "homepage", "hot", "hot", "realtime", "realtime"]
+
+
+def test_legacy_signals_table_is_migrated():
+    path = temp_db_path()
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    ts = now_iso()
+    for run_id in ("run_20260101T000000Z", "run_20260101T000300Z"):
+        conn.execute("INSERT INTO runs VALUES (?, ?, ?, 'ok', '')", (run_id, ts, ts))
+        for s in make_signals(ts):
+            conn.execute(
+                "INSERT INTO signals (run_id, source_id, source_name, section_id, title, url, normalized_title, weight, crawled_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, s.source_id, s.source_name, s.section_id, s.title, s.url, s.normalized_title, s.weight, s.crawled_at),
+            )
+    conn.execute("INSERT INTO event_signals VALUES ('evt_a', 1), ('evt_a', 4)")
+    conn.commit()
+    conn.close()
+
+    repo = Repository(path)
+
+    tables = {r[0] for r in repo.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "event_signals" not in tables and "signals" not in tables
+    assert repo.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 2
+    assert repo.conn.execute("SELECT COUNT(*) FROM sightings").fetchone()[0] == 6
+    # 兩個 legacy signal 指向同一篇文章，遷移後合併為一列
+    assert repo.conn.execute("SELECT COUNT(*) FROM event_articles").fetchone()[0] == 1
+    assert repo.latest_section_urls("tvbs", "hot") == ["https://tvbs.com/2"]
+
+    # 再次開啟不應重跑遷移
+    Repository(path)
+
+
+def hold_write_lock(path):
+    """另一個連線持有寫入鎖（模擬監控程式正在寫入）"""
+    holder = sqlite3.connect(path)
+    holder.execute("BEGIN IMMEDIATE")
+    return holder
+
+
+def test_run_seq_check_does_not_write_when_assigned():
+    path = temp_db_path()
+    repo = Repository(path)
+    repo.finish_run(repo.start_run(), "ok")
+    holder = hold_write_lock(path)
+    repo.conn.execute("PRAGMA busy_timeout = 0")
+    repo._ensure_run_seq()  # 沒有缺 seq 的 run，不需要寫入鎖
+    holder.rollback()
+
+    repo.conn.execute("UPDATE runs SET seq = NULL")
+    repo.conn.commit()
+    repo._ensure_run_seq()
+    assert repo.conn.execute("SELECT COUNT(*) FROM runs WHERE seq IS NULL").fetchone()[0] == 0
+
+
+def test_transaction_commits_once_and_rolls_back():
+    path = temp_db_path()
+    repo = Repository(path)
+    reader = sqlite3.connect(path)
+
+    with repo.transaction():
+        run_id = repo.start_run()
+        with repo.transaction():  # 巢狀區塊併入外層交易
+            repo.save_signals(run_id, make_signals(now_iso()))
+        # 外層尚未結束前，其他連線看不到任何寫入
+        assert reader.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 0
+    assert reader.execute("SELECT COUNT(*) FROM sightings").fetchone()[0] == 3
+
+    try:
+        with repo.transaction():
+            failed_run = repo.start_run()
+            repo.save_signals(failed_run, make_signals(now_iso()))
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert reader.execute("SELECT COUNT(*) FROM sightings").fetchone()[0] == 3
+
+    # 回滾後仍可記錄失敗的 run
+    repo.finish_run(failed_run, "failed", "boom")
+    row = reader.execute("SELECT status, note FROM runs WHERE run_id = ?", (failed_run,)).fetchone()
+    assert row == ("failed", "boom")
+
+
+def test_run_once_leaves_database_unlocked_while_crawling_and_drafting():
+    path = temp_db_path()
+    cfg = load_config("/nonexistent.yaml")
+    cfg.update(database_path=path, sources=[SOURCE], event_threshold=5)
+    cfg["llm"]["enabled"] = False
+    app = MonitorApp(cfg)
+    locked_at = []
+
+    def check_lock(stage):
+        other = sqlite3.connect(path, timeout=0)
+        try:
+            other.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            locked_at.append(stage)
+        finally:
+            other.close()
+
+    class CheckingCrawler(FakeCrawler):
+        def fetch_html(self, url, timeout=15):
+            check_lock("crawl")
+            return super().fetch_html(url, timeout)
+
+    generate = app.generator.generate
+
+    def checking_generate(event):
+        check_lock("draft")
+        return generate(event)
+
+    app.crawler = CheckingCrawler()
+    app.generator.generate = checking_generate
+    result = app.run_once()
+    app.close()
+    assert locked_at == []
+    assert result["events"] == 2
+    reader = sqlite3.connect(path)
+    assert reader.execute("SELECT COUNT(*) FROM drafts").fetchone()[0] == 2
+    assert reader.execute("SELECT status FROM runs").fetchone()[0] == "ok"
+
+
+def test_upsert_events_preserves_first_seen():
+    repo = Repository(":memory:")
+    article_ids = repo.save_signals(repo.start_run(), make_signals(now_iso()))
+    first = Event("evt_a", "台積電股價創新高", 12.0, 1, 2, [], [])
+    repo.upsert_events([first])
+    repo.conn.execute("UPDATE events SET first_seen = '2026-01-01T00:00:00+00:00', status = 'published'")
+
+    repo.upsert_events([
+        Event("evt_a", "台積電股價創新高 外資大買", 18.0, 2, 3, [], []),
+        Event("evt_b", "颱風海上警報發布", 9.0, 1, 1, [], []),
+    ])
+    repo.bind_events_signals({"evt_a": article_ids[:2], "evt_b": article_ids[2:]})
+
+    rows = {r["event_key"]: r for r in repo.conn.execute("SELECT * FROM events")}
+    assert rows["evt_a"]["first_seen"] == "2026-01-01T00:00:00+00:00"
+    assert rows["evt_a"]["status"] == "published"
+    assert rows["evt_a"]["canonical_title"] == "台積電股價創新高 外資大買" and rows["evt_a"]["score"] == 18.0
+    assert rows["evt_b"]["status"] == "new"
+    # 同一篇文章出現在兩個版位，只綁定一次
+    assert repo.conn.execute("SELECT COUNT(*) FROM event_articles").fetchone()[0] == 2
+
+
+if __name__ == "__main__":
+    test_repeated_runs_reuse_article_rows()
+    test_legacy_signals_table_is_migrated()
+    test_run_seq_check_does_not_write_when_assigned()
+    test_transaction_commits_once_and_rolls_back()
+    test_run_once_leaves_database_unlocked_while_crawling_and_drafting()
+    test_upsert_events_preserves_first_seen()
+    print("✅ Repository 測試通過")
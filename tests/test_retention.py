@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+測試資料保留政策：舊 sightings 歸檔為 gzip JSONL、彙總為每日統計、刪除後增量 vacuum
+"""
+
+import sys
+import os
+import dataclasses
+import gzip
+import json
+import sqlite3
+import tempfile
+import datetime as dt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Repository, Signal, now_iso
+
+
+def days_ago(n):
+    return (dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=n)).isoformat()
+
+
+def save_run(repo, started_at, signals):
+    run_id = repo.start_run()
+    repo.save_signals(run_id, signals)
+    repo.finish_run(run_id, "ok")
+    repo.conn.execute("UPDATE runs SET started_at = ? WHERE run_id = ?", (started_at, run_id))
+    repo.conn.execute(
+        "UPDATE articles SET last_seen = ? WHERE url IN (%s)" % ",".join("?" * len(signals)),
+        [started_at] + [s.url for s in signals],
+    )
+    repo.conn.commit()
+    return run_id
+
+
+def test_old_runs_archived_rolled_up_and_deleted():
+    tmp = tempfile.mkdtemp()
+    repo = Repository(os.path.join(tmp, "newsfollow.db"))
+    old_ts, new_ts = days_ago(30), now_iso()
+    old_only = Signal("udn", "UDN", "hot", "三十天前的舊新聞標題", "https://udn.com/old", 5, old_ts)
+    shared = Signal("udn", "UDN", "homepage", "仍在首頁的長青新聞", "https://udn.com/shared", 4, old_ts)
+    # 大量舊資料，刪除後才有可回收的頁面
+    bulk = [Signal("tvbs", "TVBS", "hot", f"舊新聞第{i}則 " + "內容" * 40, f"https://tvbs.com/{i}", 3, old_ts)
+            for i in range(2000)]
+    save_run(repo, old_ts, [old_only, shared] + bulk)
+    save_run(repo, new_ts, [dataclasses.replace(shared, crawled_at=new_ts)])
+    repo.conn.execute("INSERT INTO event_articles SELECT 'evt_old', article_id FROM articles WHERE url = 'https://udn.com/old'")
+    repo.conn.commit()
+
+    summary = repo.apply_retention(keep_days=7, archive_dir=os.path.join(tmp, "archive"), vacuum_pages=100000)
+
+    assert summary["runs"] == 1 and summary["sightings"] == 2002 and summary["archived"] == 2002
+    assert summary["articles"] == 2001  # 長青新聞仍被新的 run 引用，保留
+    assert repo.conn.execute("SELECT url FROM articles").fetchall()[0]["url"] == "https://udn.com/shared"
+    assert repo.conn.execute("SELECT COUNT(*) FROM signals").fetchone()[0] == 1
+    assert repo.conn.execute("SELECT COUNT(*) FROM event_articles").fetchone()[0] == 0
+
+    daily = {(r["source_id"], r["section_id"]): r for r in repo.conn.execute("SELECT * FROM signal_daily")}
+    assert daily[("tvbs", "hot")]["sightings"] == 2000 and daily[("tvbs", "hot")]["runs"] == 1
+    assert daily[("udn", "homepage")]["articles"] == 1
+
+    with gzip.open(os.path.join(tmp, "archive", f"signals-{old_ts[:10]}.jsonl.gz"), "rt", encoding="utf-8") as f:
+        archived = [json.loads(line) for line in f]
+    assert len(archived) == 2002 and archived[0]["source_id"] in ("udn", "tvbs")
+
+    # 新建的資料庫一開始就是 incremental auto_vacuum，刪除後的空頁會被釋放
+    assert repo.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert summary["vacuumed_pages"] > 0
+    assert repo.conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+    # 再跑一次不應有任何變動
+    again = repo.apply_retention(keep_days=7, archive_dir=os.path.join(tmp, "archive"))
+    assert again["sightings"] == again["runs"] == again["archived"] == 0
+
+
+def test_failed_pass_does_not_duplicate_archive():
+    tmp = tempfile.mkdtemp()
+    archive_dir = os.path.join(tmp, "archive")
+    repo = Repository(os.path.join(tmp, "newsfollow.db"))
+    old_ts = days_ago(30)
+    save_run(repo, old_ts, [Signal("udn", "UDN", "hot", "三十天前的舊新聞標題", "https://udn.com/old", 5, old_ts)])
+    path = os.path.join(archive_dir, f"signals-{old_ts[:10]}.jsonl.gz")
+    os.makedirs(archive_dir)
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"title": "先前歸檔的資料"}, ensure_ascii=False) + "\n")
+
+    # 刪除階段失敗：交易回滾，歸檔檔案維持原樣
+    repo.conn.execute("CREATE TEMP TRIGGER fail_delete BEFORE DELETE ON main.runs BEGIN SELECT RAISE(ABORT, 'boom'); END")
+    try:
+        repo.apply_retention(keep_days=7, archive_dir=archive_dir)
+        raise AssertionError("retention should fail")
+    except sqlite3.IntegrityError:
+        pass
+    repo.conn.execute("DROP TRIGGER fail_delete")
+    assert os.listdir(archive_dir) == [os.path.basename(path)]
+
+    summary = repo.apply_retention(keep_days=7, archive_dir=archive_dir)
+    assert summary["archived"] == 1
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        titles = [json.loads(line)["title"] for line in f]
+    assert titles == ["先前歸檔的資料", "三十天前的舊新聞標題"]
+
+
+def test_existing_database_converted_to_incremental_vacuum():
+    path = os.path.join(tempfile.mkdtemp(), "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE keep (x)")
+    conn.commit()
+    conn.close()
+
+    repo = Repository(path)
+    assert repo.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+    repo.apply_retention(keep_days=7, vacuum_pages=100)
+    assert repo.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+if __name__ == "__main__":
+    test_old_runs_archived_rolled_up_and_deleted()
+    test_failed_pass_does_not_duplicate_archive()
+    test_existing_database_converted_to_incremental_vacuum()
+    print("✅ 資料保留政策測試通過")
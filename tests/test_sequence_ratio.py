@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+測試序列相似度引擎：compat 模式與 difflib.SequenceMatcher 逐位元相同，LCS 與最長共同子字串與動態規劃結果相同
+"""
+
+import sys
+import os
+import random
+import re
+from difflib import SequenceMatcher
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+import sequence_ratio
+from tests.test_detect_events import recorded_signals
+
+
+def dp_lcs(a, b):
+    prev = [0] * (len(b) + 1)
+    for ch in a:
+        cur = [0]
+        for j, other in enumerate(b):
+            cur.append(prev[j] + 1 if ch == other else max(prev[j + 1], cur[j]))
+        prev = cur
+    return prev[-1]
+
+
+def dp_substring(a, b):
+    best, prev = 0, [0] * (len(b) + 1)
+    for ch in a:
+        cur = [0]
+        for j, other in enumerate(b):
+            cur.append(prev[j] + 1 if ch == other else 0)
+        best = max(best, max(cur))
+        prev = cur
+    return best
+
+
+def sample_pairs():
+    titles = sorted({re.sub(r"\s+", "", s.title) for s in recorded_signals()})
+    pairs = [(titles[i], titles[j]) for i in range(0, len(titles), 4) for j in range(i + 1, len(titles), 5)]
+    rng = random.Random(3)
+    for _ in range(300):
+        # 小字母表的隨機字串，製造大量平手的最長區塊
+        pairs.append(("".join(rng.choice("ab台積") for _ in range(rng.randint(0, 30))),
+                      "".join(rng.choice("ab台積") for _ in range(rng.randint(0, 30)))))
+    pairs += [("", ""), ("", "台積電"), ("a" * 250, "ab" * 130), ("台積電" * 70, "台積電股價" * 45)]
+    return pairs
+
+
+def test_compat_matches_sequence_matcher():
+    for a, b in sample_pairs():
+        assert sequence_ratio.ratcliff_obershelp_ratio(a, b) == SequenceMatcher(None, a, b).ratio(), (a, b)
+
+
+def test_lcs_and_substring_match_dynamic_programming():
+    for a, b in sample_pairs()[:2000]:
+        if len(a) > 100 or len(b) > 100:
+            continue
+        assert sequence_ratio.lcs_length(a, b) == dp_lcs(a, b), (a, b)
+        assert sequence_ratio.longest_common_substring(a, b) == dp_substring(a, b), (a, b)
+        assert sequence_ratio.lcs_ratio(a, b) >= sequence_ratio.ratcliff_obershelp_ratio(a, b)
+
+
+def test_mode_switch():
+    a, b = "黃國昌政見遭打臉！蘇巧慧這麼說", "蘇巧慧回應黃國昌政見爭議"
+    compat = main.title_similarity(a, b)
+    try:
+        main.set_sequence_ratio_mode("lcs")
+        assert main.title_similarity(a, b) >= compat
+    finally:
+        main.set_sequence_ratio_mode("compat")
+    assert main.title_similarity(a, b) == compat
+    try:
+        main.set_sequence_ratio_mode("fuzzy")
+        assert False, "unknown mode should raise"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_compat_matches_sequence_matcher()
+    test_lcs_and_substring_match_dynamic_programming()
+    test_mode_switch()
+    print("✅ 序列相似度引擎測試通過")
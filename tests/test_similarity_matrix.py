@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+測試批次相似度上界：上界不得低於 title_similarity，batch_check_many 與逐一 batch_check 結果及 LLM 呼叫順序相同
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import similarity_matrix
+from hybrid_similarity import HybridSimilarityChecker
+from main import compute_title_features, title_similarity
+from tests.test_detect_events import recorded_signals
+
+
+def recorded_features():
+    titles = [s.title for s in recorded_signals()]
+    return [compute_title_features(t) for t in titles]
+
+
+class RecordingChecker(HybridSimilarityChecker):
+    """以標題長度差模擬 LLM 判斷，並記錄呼叫順序"""
+
+    def __init__(self):
+        super().__init__(enable_llm=False)
+        self.enable_llm = True
+        self.client = object()
+        self.calls = []
+
+    def _llm_check_similarity(self, title1, title2):
+        self.llm_call_count += 1
+        self.calls.append((title1, title2))
+        return abs(len(title1) - len(title2)) <= 2
+
+
+def test_upper_bound_never_below_similarity():
+    if not similarity_matrix.SIMILARITY_MATRIX_AVAILABLE:
+        return
+    features = recorded_features()
+    candidates, references = features[::2], features[1::2]
+    bound = similarity_matrix.similarity_upper_bounds(candidates, references)
+    pruned = 0
+    for i, a in enumerate(candidates):
+        for j, b in enumerate(references):
+            assert bound[i, j] >= title_similarity(a, b), (a.text, b.text)
+            pruned += bound[i, j] < 0.3
+    assert pruned > len(candidates) * len(references) // 2
+
+
+def test_containment_pairs_match_brute_force():
+    if not similarity_matrix.SIMILARITY_MATRIX_AVAILABLE:
+        return
+    titles = [f.text for f in recorded_features()[:120]]
+    extra = [titles[0], titles[1][:6], titles[2] + " 最新", "快", "Typhoon Warning", "typhoon   warning issued"]
+    candidates = [compute_title_features(t) for t in titles[::2] + extra]
+    references = [compute_title_features(t) for t in titles[1::2] + extra[::-1]]
+    bound = similarity_matrix.similarity_upper_bounds(candidates, references)
+    norm = lambda f: " ".join(f.text.lower().split())
+    for i, a in enumerate(candidates):
+        for j, b in enumerate(references):
+            if norm(a) in norm(b) or norm(b) in norm(a):
+                assert bound[i, j] == 1.0, (a.text, b.text)
+
+
+def test_batch_check_many_matches_batch_check():
+    features = recorded_features()
+    candidates, references = features[::2], features[1::2][:90]
+
+    expected_checker, checker = RecordingChecker(), RecordingChecker()
+    expected = [expected_checker.batch_check(c, references) for c in candidates]
+    assert checker.batch_check_many(candidates, references) == expected
+    assert checker.calls == expected_checker.calls
+    assert any(expected) and not all(expected)
+
+
+if __name__ == "__main__":
+    test_upper_bound_never_below_similarity()
+    test_containment_pairs_match_brute_force()
+    test_batch_check_many_matches_batch_check()
+    print("✅ 批次相似度上界測試通過")
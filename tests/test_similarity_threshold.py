@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+測試 title_similarity_at_least / title_similarity_bounds：提前結束的判斷必須與完整計算
+title_similarity(a, b) >= threshold 完全一致
+"""
+
+import sys
+import os
+import math
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from main import compute_title_features, title_similarity, title_similarity_at_least, title_similarity_bounds
+from tests.test_detect_events import recorded_signals
+
+THRESHOLDS = (0.15, 0.3, 0.47, 0.5, 0.6, 0.7, 0.74, 0.85, 0.9)
+
+
+def recorded_pairs():
+    titles = sorted({s.title for s in recorded_signals()})
+    features = [compute_title_features(t) for t in titles]
+    for i in range(0, len(features), 3):
+        for j in range(i + 1, len(features), 2):
+            yield features[i], features[j]
+
+
+def count_lcs_calls(calls):
+    original = main._lcs_ratio
+
+    def counting(f1, f2):
+        calls.append(1)
+        return original(f1, f2)
+
+    main._lcs_ratio = counting
+    return original
+
+
+def test_decisions_match_full_computation():
+    scored = [(a, b, title_similarity(a, b)) for a, b in recorded_pairs()]
+    calls = []
+    checked = 0
+    original = count_lcs_calls(calls)
+    try:
+        for a, b, score in scored:
+            for threshold in THRESHOLDS + (score, math.nextafter(score, 1.0), math.nextafter(score, 0.0)):
+                assert title_similarity_at_least(a, b, threshold) == (score >= threshold), (a.text, b.text, threshold)
+                checked += 1
+    finally:
+        main._lcs_ratio = original
+    # 大多數判斷不需要 SequenceMatcher（門檻等於分數本身的三種情況幾乎都需要）
+    assert len(calls) < checked // 2
+
+
+def test_bounds_decide_several_thresholds_with_one_lcs():
+    from hybrid_similarity import HybridSimilarityChecker
+
+    checker = HybridSimilarityChecker(enable_llm=False)
+    scored = [(a, b, title_similarity(a, b)) for a, b in recorded_pairs()]
+    calls = []
+    original = count_lcs_calls(calls)
+    try:
+        for a, b, score in scored:
+            before = len(calls)
+            low, high = title_similarity_bounds(a, b, (0.6, 0.3, 0.5))
+            assert low <= score <= high
+            for threshold in (0.6, 0.3, 0.5):
+                assert (low >= threshold) == (score >= threshold), (a.text, b.text, threshold)
+            assert checker.is_same_news(a, b) == (score >= 0.5)
+            # 兩次呼叫各最多計算一次 LCS
+            assert len(calls) - before <= 2
+    finally:
+        main._lcs_ratio = original
+
+
+def test_strings_and_shortcuts():
+    a, b = "台積電股價創新高", "台積電股價創新高 外資大買"
+    assert title_similarity_at_least(a, b, 0.85) and not title_similarity_at_least(a, b, 0.86)
+    assert title_similarity_at_least(a, a, 1.0)
+    assert not title_similarity_at_least("", a, 0.1)
+    c, d = "NONO捲性侵案2年失業！愛妻朱海君近況曝", "NONO性侵案失業2年 妻子朱海君現況"
+    score = title_similarity(c, d)
+    assert title_similarity_at_least(c, d, score) and not title_similarity_at_least(c, d, math.nextafter(score, 1.0))
+
+
+if __name__ == "__main__":
+    test_decisions_match_full_computation()
+    test_bounds_decide_several_thresholds_with_one_lcs()
+    test_strings_and_shortcuts()
+    print("✅ title_similarity_at_least / title_similarity_bounds 測試通過")
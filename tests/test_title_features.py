@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+測試以詞 id 陣列儲存的 TitleFeatures：相似度與舊版字串集合實作逐位元相同，相容屬性正確、詞 id 跨行程不變
+"""
+
+import sys
+import os
+import math
+import subprocess
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from main import compute_title_features, token_id
+from tests.test_detect_events import recorded_signals
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy_similarity(f1, f2):
+    """字串集合版 _feature_similarity（TitleFeatures 改用詞 id 前的實作）"""
+    s1, s2 = f1.token_set, f2.token_set
+    c1, c2 = f1.token_counter, f2.token_counter
+    if not s1 or not s2:
+        return 0.0
+    inter_len = len(s1 & s2)
+    jaccard = inter_len / len(s1 | s2)
+    dot = sum(c1.get(t, 0) * c2.get(t, 0) for t in set(c1) | set(c2))
+    cosine = dot / (f1.vec_magnitude * f2.vec_magnitude)
+    lcs_ratio = main._lcs_ratio(f1, f2)
+    number_match = len(f1.numbers & f2.numbers) / len(f1.numbers | f2.numbers) if f1.numbers and f2.numbers else 0.0
+    combined = jaccard * 0.35 + cosine * 0.30 + lcs_ratio * 0.25 + number_match * 0.10
+    if len({t for t in s1 if len(t) >= 2} & {t for t in s2 if len(t) >= 2}) >= 2 and 0.15 <= combined < 0.7:
+        boost = 0.30 if inter_len >= 3 else 0.25 if inter_len >= 2 else 0.20
+        combined = min(combined + boost, 0.85)
+    if f1.numbers and f2.numbers and number_match >= 0.5 and inter_len >= 1:
+        combined = min(combined + 0.15, 0.9)
+    return combined
+
+
+def test_similarity_matches_string_sets():
+    titles = sorted({s.title for s in recorded_signals()})
+    features = [compute_title_features(t) for t in titles]
+    for i in range(0, len(features), 2):
+        for j in range(i + 1, len(features), 3):
+            assert main._feature_similarity(features[i], features[j]) == legacy_similarity(features[i], features[j])
+
+
+def test_compatibility_properties():
+    f = compute_title_features("外資 外資 台積電創新高！ 2026 年")
+    assert list(f.ids) == sorted(f.ids)
+    assert f.token_set == set(f.token_counter)
+    assert sorted(f.tokens) == sorted(f.token_counter.elements())
+    assert f.token_counter["外資"] == 2
+    assert f.vec_magnitude == math.sqrt(sum(n * n for n in f.counts))
+    assert f.numbers == {"2026"}
+    assert not hasattr(f, "__dict__")
+    assert not compute_title_features("！？").ids
+
+
+def test_token_ids_are_stable_across_processes():
+    words = ["台積電", "外資", "台", "adr"]
+    code = f"import main; print([main.token_id(w) for w in {words!r}])"
+    env = dict(os.environ, PYTHONHASHSEED="123")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    ids = [token_id(w) for w in words]
+    assert out.stdout.strip() == str(ids)
+    assert len(set(ids)) == len(ids)
+    assert [i & 1 for i in ids] == [1, 1, 0, 1]  # 最低位元：長度 >= 2
+
+
+if __name__ == "__main__":
+    test_similarity_matches_string_sets()
+    test_compatibility_properties()
+    test_token_ids_are_stable_across_processes()
+    print("✅ TitleFeatures 詞 id 測試通過")
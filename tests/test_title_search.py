@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+測試 FTS5 標題全文索引（jieba 分詞 + 中文雙字詞）與觸發器同步
+"""
+
+import sys
+import os
+import contextlib
+import io
+import sqlite3
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from main import Event, Repository, Signal, fts_query, now_iso, set_tokenizer_mode
+from tests.test_repository import hold_write_lock
+
+
+def make_signals(ts):
+    return [
+        Signal("udn", "UDN", "hot", "快訊／台積電股價創新高！外資大買", "https://udn.com/1", 6, ts),
+        Signal("tvbs", "TVBS", "hot", "颱風海上警報發布 北部風雨增強", "https://tvbs.com/1", 5, ts),
+        Signal("setn", "三立", "hot", "台積電宣布赴美擴廠 投資再加碼", "https://setn.com/1", 5, ts),
+    ]
+
+
+def titles(rows):
+    return sorted(r["title"] if "title" in r.keys() else r["canonical_title"] for r in rows)
+
+
+def test_search_articles_with_chinese_words():
+    repo = Repository(":memory:")
+    repo.save_signals(repo.start_run(), make_signals(now_iso()))
+
+    # jieba 在「台積電股價」中會切成「台積/電股」，仍要找得到
+    assert titles(repo.search_articles("台積電")) == ["台積電宣布赴美擴廠 投資再加碼", "快訊／台積電股價創新高！外資大買"]
+    assert titles(repo.search_articles("台積電 股價")) == ["快訊／台積電股價創新高！外資大買"]
+    assert len(repo.search_articles("颱風 台積電", any_token=True)) == 3
+    assert repo.search_articles("台積電", since="2999-01-01") == []
+    assert repo.search_articles("！？") == []
+    assert fts_query('"引號"') == '"引號"'
+
+
+def test_event_index_follows_updates_and_deletes():
+    repo = Repository(":memory:")
+    repo.upsert_events([Event("evt_a", "颱風海上警報發布", 10.0, 2, 3, [], [])])
+    assert titles(repo.search_events("颱風")) == ["颱風海上警報發布"]
+
+    repo.upsert_events([Event("evt_a", "颱風陸上警報 停班停課", 12.0, 3, 5, [], [])])
+    assert titles(repo.search_events("停班停課")) == ["颱風陸上警報 停班停課"]
+    assert repo.search_events("海上") == []
+
+    repo.conn.execute("DELETE FROM events")
+    assert repo.search_events("颱風") == []
+
+
+def test_existing_rows_backfilled_and_writer_connection_indexed():
+    path = os.path.join(tempfile.mkdtemp(), "newsfollow.db")
+    repo = Repository(path)
+    repo.save_signals(repo.start_run(), make_signals(now_iso()))
+    repo.close()
+
+    # 模擬沒有觸發器的連線（舊版程式、sqlite3 CLI）寫入
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT INTO articles (source_id, source_name, title, url, normalized_title, first_seen, last_seen) "
+        "VALUES ('cna', 'CNA', '花蓮外海規模6.5地震 全台有感', 'https://cna.com/1', 'x', ?, ?)",
+        (now_iso(), now_iso()),
+    )
+    conn.commit()
+    conn.close()
+
+    repo = Repository(path, background_writer=True)
+    assert titles(repo.search_articles("地震")) == ["花蓮外海規模6.5地震 全台有感"]
+
+    repo.save_signals(repo.start_run(), [Signal("ettoday", "ETtoday", "hot", "立法院三讀通過預算案", "https://e.com/1", 5, now_iso())])
+    repo.flush()
+    assert titles(repo.search_articles("立法院")) == ["立法院三讀通過預算案"]
+    repo.close()
+
+
+def test_open_does_not_write_when_index_is_current():
+    path = os.path.join(tempfile.mkdtemp(), "newsfollow.db")
+    repo = Repository(path)
+    repo.save_signals(repo.start_run(), make_signals(now_iso()))
+    repo.close()
+
+    holder = hold_write_lock(path)
+    original = Repository.PRAGMAS
+    Repository.PRAGMAS = ("PRAGMA busy_timeout = 0",) + original[1:]
+    try:
+        repo = Repository(path)  # 另一個行程正在寫入時仍能開啟
+        assert len(repo.search_articles("台積電")) == 2
+        repo.close()
+    finally:
+        Repository.PRAGMAS = original
+        holder.rollback()
+        holder.close()
+
+
+def test_ngram_mode_indexes_without_jieba():
+    repo = Repository(":memory:")
+    repo.save_signals(repo.start_run(), make_signals(now_iso())[:1])  # jieba 模式建立的索引
+    original = main.get_jieba_tokens
+
+    def no_jieba(text):
+        raise AssertionError("ngram mode called jieba")
+
+    main.get_jieba_tokens = no_jieba
+    try:
+        set_tokenizer_mode("ngram")
+        repo.save_signals(repo.start_run(), make_signals(now_iso())[1:])
+        assert titles(repo.search_articles("台積電")) == ["台積電宣布赴美擴廠 投資再加碼", "快訊／台積電股價創新高！外資大買"]
+        assert titles(repo.search_articles("颱風 警報")) == ["颱風海上警報發布 北部風雨增強"]
+    finally:
+        main.get_jieba_tokens = original
+        set_tokenizer_mode("jieba")
+    assert len(repo.search_articles("台積電 警報", any_token=True)) == 3  # 兩種索引混用時仍可查
+
+
+def test_fts_tokens_follows_mode_switch():
+    repo = Repository(":memory:")
+    query = "SELECT fts_tokens('颱風警報')"
+    jieba_tokens = repo.conn.execute(query).fetchone()[0]
+    try:
+        set_tokenizer_mode("ngram")
+        assert repo.conn.execute(query).fetchone()[0] == main.fts_tokens("颱風警報") != jieba_tokens
+    finally:
+        set_tokenizer_mode("jieba")
+    # 輸出隨分詞模式改變，不可宣告為 deterministic（否則可用於索引、結果可能被快取）
+    try:
+        repo.conn.execute("CREATE INDEX idx_articles_tokens ON articles(fts_tokens(title))")
+        raise AssertionError("fts_tokens was registered as deterministic")
+    except sqlite3.OperationalError:
+        pass
+
+
+def run_cli(config, *argv):
+    out = io.StringIO()
+    saved = (main.MonitorApp, sys.argv)
+    main.MonitorApp = lambda cfg: (_ for _ in ()).throw(AssertionError("read command built a MonitorApp"))
+    sys.argv = ["main.py", "--config", config, *argv]
+    try:
+        with contextlib.redirect_stdout(out):
+            code = main.main()
+    finally:
+        main.MonitorApp, sys.argv = saved
+    return code, out.getvalue()
+
+
+def test_read_commands_open_database_read_only():
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "newsfollow.db")
+    config = os.path.join(tmp, "config.yaml")
+    with open(config, "w", encoding="utf-8") as f:
+        f.write(f"database_path: {path}\n")
+
+    code, _ = run_cli(config, "list-events")
+    assert code == 1 and not os.path.exists(path)  # 不建立空資料庫
+
+    repo = Repository(path)
+    repo.save_signals(repo.start_run(), make_signals(now_iso()))
+    repo.upsert_events([Event("evt_a", "台積電股價創新高", 11.0, 2, 2, [], [])])
+    repo.close()
+
+    holder = hold_write_lock(path)  # 監控程式正在寫入
+    try:
+        code, out = run_cli(config, "search", "台積電")
+        assert code == 0 and out.count("台積電") == 2
+        code, out = run_cli(config, "recluster", "--min-sources", "1")
+        assert code == 0 and out.startswith("3 articles -> ")
+        code, out = run_cli(config, "list-events")
+        assert code == 0 and "台積電股價創新高" in out
+    finally:
+        holder.rollback()
+        holder.close()
+
+
+if __name__ == "__main__":
+    test_search_articles_with_chinese_words()
+    test_event_index_follows_updates_and_deletes()
+    test_existing_rows_backfilled_and_writer_connection_indexed()
+    test_open_does_not_write_when_index_is_current()
+    test_ngram_mode_indexes_without_jieba()
+    test_fts_tokens_follows_mode_switch()
+    test_read_commands_open_database_read_only()
+    print("✅ 標題全文搜尋測試通過")
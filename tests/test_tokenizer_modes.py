@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+測試 ngram 分詞模式：字元 n-gram 切分、模式切換時清空特徵快取、快取檔不跨模式載入、未安裝 jieba 時仍使用特徵比對
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from main import TitleFeatureCache, compute_title_features, detect_events, get_ngram_tokens, set_tokenizer_mode, title_similarity
+from tests.test_detect_events import recorded_signals
+from tests.test_real_news_similarity import DIFFERENT_NEWS_PAIRS, SAME_NEWS_PAIRS
+
+
+def test_ngram_tokens():
+    assert get_ngram_tokens("台積電ADR 漲3%") == ("台積", "積電", "台積電", "adr", "漲", "3")
+    assert get_ngram_tokens("！？") == ()
+
+
+def test_mode_switch_changes_features_and_clears_cache():
+    title = "台積電股價創新高 外資大買"
+    jieba_features = main.cached_title_features(title)
+    jieba_tokens = jieba_features.token_set  # token_set 以目前的分詞方式重新分詞
+    try:
+        set_tokenizer_mode("ngram")
+        assert len(main.TITLE_FEATURE_CACHE) == 0
+        ngram_features = main.cached_title_features(title)
+        assert "台積電" in ngram_features.token_set and "股價創" in ngram_features.token_set
+        assert ngram_features.token_set != jieba_tokens
+        assert list(ngram_features.ids) != list(jieba_features.ids)
+        # 標註配對在原本的 0.5 門檻下仍大致分得開（詳見 scripts/bench_tokenizer_modes.py）
+        assert sum(title_similarity(a, b) >= 0.5 for a, b in SAME_NEWS_PAIRS) >= 6
+        assert all(title_similarity(a, b) < 0.5 for a, b in DIFFERENT_NEWS_PAIRS)
+    finally:
+        set_tokenizer_mode("jieba")
+    assert len(main.TITLE_FEATURE_CACHE) == 0
+    assert compute_title_features(title).token_set == jieba_tokens
+
+
+def test_cache_file_is_tied_to_mode():
+    path = os.path.join(tempfile.mkdtemp(), "title_features.jsonl.gz")
+    cache = TitleFeatureCache()
+    cache.get("颱風海上警報發布 北部風雨增強")
+    cache.save(path)
+    try:
+        set_tokenizer_mode("ngram")
+        assert TitleFeatureCache().load(path) == 0
+    finally:
+        set_tokenizer_mode("jieba")
+    assert TitleFeatureCache().load(path) == 1
+
+
+def test_ngram_mode_works_without_jieba():
+    import near_duplicates
+
+    path = os.path.join(tempfile.mkdtemp(), "title_features.jsonl.gz")
+    signals = recorded_signals()[:200]
+    saved = (main.JIEBA_AVAILABLE, main.get_jieba_tokens, main.TITLE_FEATURE_CACHE)
+
+    def no_jieba(text):
+        raise AssertionError("ngram mode called jieba")
+
+    try:
+        set_tokenizer_mode("ngram")
+        expected = [e.canonical_title for e in detect_events(signals, score_threshold=0, similarity_threshold=0.5)]
+        a, b = SAME_NEWS_PAIRS[0]
+        score = title_similarity(a, b)
+        saved_count = main.TITLE_FEATURE_CACHE.save(path)
+
+        main.JIEBA_AVAILABLE, main.get_jieba_tokens = False, no_jieba
+        main.TITLE_FEATURE_CACHE = TitleFeatureCache()
+        assert main.configure_feature_cache({"feature_cache_path": path}) == path
+        assert len(main.TITLE_FEATURE_CACHE) == saved_count  # 仍載入特徵快取
+        assert title_similarity(a, b) == score
+        assert main.title_similarity_at_least(a, b, score)
+        assert isinstance(near_duplicates.title_features(a), main.TitleFeatures)
+        got = [e.canonical_title for e in detect_events(signals, score_threshold=0, similarity_threshold=0.5)]
+        assert got == expected
+    finally:
+        main.JIEBA_AVAILABLE, main.get_jieba_tokens, main.TITLE_FEATURE_CACHE = saved
+        set_tokenizer_mode("jieba")
+
+
+def test_unknown_mode_is_rejected():
+    try:
+        set_tokenizer_mode("bpe")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    test_ngram_tokens()
+    test_mode_switch_changes_features_and_clears_cache()
+    test_cache_file_is_tied_to_mode()
+    test_ngram_mode_works_without_jieba()
+    test_unknown_mode_is_rejected()
+    print("✅ 分詞模式測試通過")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+測試分詞器預載：詞典快取寫到指定目錄、下次啟動直接載入，以及 /healthz 的就緒狀態
+"""
+
+import sys
+import os
+import subprocess
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WARM_UP = "import main; print(main.warm_up_tokenizer({!r}), main.TOKENIZER_READY.is_set())"
+
+
+def run_warm_up(cache_dir):
+    out = subprocess.run(
+        [sys.executable, "-c", WARM_UP.format(cache_dir)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return float(out[0]), out[1] == "True"
+
+
+def test_dictionary_cache_is_built_once_and_reused():
+    if not main.JIEBA_AVAILABLE:
+        return
+    cache_dir = os.path.join(tempfile.mkdtemp(), "cache")
+    _, ready = run_warm_up(cache_dir)
+    assert ready
+    cache_file = os.path.join(cache_dir, "jieba.cache")
+    assert os.path.isfile(cache_file)
+    mtime = os.path.getmtime(cache_file)
+
+    _, ready = run_warm_up(cache_dir)
+    assert ready and os.path.getmtime(cache_file) == mtime  # 直接載入，不重建
+
+
+def test_healthz_reports_readiness():
+    from news_dashboard import app
+
+    assert main.TOKENIZER_READY.wait(60)
+    client = app.test_client()
+    response = client.get("/healthz")
+    assert response.status_code == 200 and response.get_json()["tokenizer_ready"]
+
+    main.TOKENIZER_READY.clear()
+    try:
+        response = client.get("/healthz")
+        assert response.status_code == 503 and response.get_json()["status"] == "starting"
+    finally:
+        main.TOKENIZER_READY.set()
+
+
+if __name__ == "__main__":
+    test_dictionary_cache_is_built_once_and_reused()
+    test_healthz_reports_readiness()
+    print("✅ 分詞器預載測試通過")